@@ -0,0 +1,297 @@
+# armazenamento_sqlite.py
+
+import json
+import os
+import sqlite3
+import threading
+
+CAMINHO_BANCO = os.environ.get("CAMINHO_BANCO", "./db_json/otimizador.sqlite3")
+DIRETORIO_JSON = "./db_json"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    zona TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    endereco TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_clientes_zona ON clientes (zona);
+
+CREATE TABLE IF NOT EXISTS pedidos (
+    id INTEGER PRIMARY KEY,
+    cliente_id INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    prioridade INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pedidos_cliente ON pedidos (cliente_id);
+CREATE INDEX IF NOT EXISTS idx_pedidos_status ON pedidos (status);
+
+CREATE TABLE IF NOT EXISTS veiculos (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    capacidade INTEGER NOT NULL,
+    disponivel INTEGER NOT NULL,
+    zonas_permitidas TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_veiculos_disponivel ON veiculos (disponivel);
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+
+-- Incrementada a cada gravação, na mesma transação (vale também entre processos)
+CREATE TABLE IF NOT EXISTS versoes (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO versoes (tabela) VALUES ('clientes'), ('pedidos'), ('veiculos');
+"""
+
+_COLUNAS = {
+    "clientes": ("id", "nome", "zona", "latitude", "longitude", "endereco"),
+    "pedidos": ("id", "cliente_id", "volume", "prioridade", "status"),
+    "veiculos": ("id", "tipo", "capacidade", "disponivel", "zonas_permitidas"),
+}
+
+# Ao substituir uma tabela, o que não pode ser apagado (clientes ainda usados por pedidos)
+_APAGAR_AO_SUBSTITUIR = {
+    "clientes": "DELETE FROM clientes WHERE id NOT IN (SELECT cliente_id FROM pedidos)",
+}
+
+_armazens = {}
+_lock_global = threading.Lock()
+
+
+class ArmazemSQLite:
+    """
+    Clientes, pedidos e veículos em SQLite (modo WAL), no formato dos modelos da
+    API (pedidos com cliente_id). Há índices para os filtros dos endpoints
+    (zona, status, cliente_id, disponível) e as gravações são upserts em lote,
+    cada lote em uma transação.
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        self.caminho = caminho
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_ESQUEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def _upsert(self, tabela, registros, substituir=False):
+        colunas = _COLUNAS[tabela]
+        sql = (
+            f"INSERT OR REPLACE INTO {tabela} ({', '.join(colunas)}) "
+            f"VALUES ({', '.join('?' for _ in colunas)})"
+        )
+        linhas = [tuple(_para_coluna(c, r.get(c)) for c in colunas) for r in registros]
+        with self._lock, self._conn:
+            if substituir:
+                self._conn.execute(_APAGAR_AO_SUBSTITUIR.get(tabela, f"DELETE FROM {tabela}"))
+            self._conn.executemany(sql, linhas)
+            self._conn.execute("UPDATE versoes SET versao = versao + 1 WHERE tabela = ?", (tabela,))
+        return len(linhas)
+
+    def _inserir_ausentes(self, tabela, registros):
+        """Insere só os registros cujo id ainda não existe; a versão só muda se algo entrou."""
+        colunas = _COLUNAS[tabela]
+        sql = (
+            f"INSERT OR IGNORE INTO {tabela} ({', '.join(colunas)}) "
+            f"VALUES ({', '.join('?' for _ in colunas)})"
+        )
+        linhas = [tuple(_para_coluna(c, r.get(c)) for c in colunas) for r in registros]
+        with self._lock, self._conn:
+            antes = self._conn.total_changes
+            self._conn.executemany(sql, linhas)
+            inseridos = self._conn.total_changes - antes
+            if inseridos:
+                self._conn.execute("UPDATE versoes SET versao = versao + 1 WHERE tabela = ?", (tabela,))
+        return inseridos
+
+    def versoes(self, *tabelas):
+        """Versão atual de cada tabela; muda sempre que a tabela é gravada."""
+        with self._lock:
+            atuais = dict(self._conn.execute("SELECT tabela, versao FROM versoes"))
+        return tuple(atuais[t] for t in tabelas)
+
+    def _consultar(self, sql, parametros, limite=None, deslocamento=0):
+        if limite is not None:
+            sql += " LIMIT ? OFFSET ?"
+            parametros = list(parametros) + [limite, deslocamento]
+        elif deslocamento:
+            sql += " LIMIT -1 OFFSET ?"
+            parametros = list(parametros) + [deslocamento]
+        with self._lock:
+            return [_de_linha(linha) for linha in self._conn.execute(sql, parametros)]
+
+    def _contar(self, sql, parametros):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM ({sql})", parametros).fetchone()[0]
+
+    # Clientes
+
+    def upsert_clientes(self, clientes, substituir=False):
+        """Com substituir, os clientes ausentes são apagados, exceto os que ainda têm pedidos."""
+        return self._upsert("clientes", clientes, substituir)
+
+    def inserir_clientes_ausentes(self, clientes):
+        """Insere os clientes que ainda não existem, sem alterar os já gravados."""
+        return self._inserir_ausentes("clientes", clientes)
+
+    def _filtro_clientes(self, zona=None):
+        sql, parametros = "SELECT * FROM clientes", []
+        if zona is not None:
+            sql += " WHERE zona = ?"
+            parametros.append(zona)
+        return sql, parametros
+
+    def listar_clientes(self, zona=None, limite=None, deslocamento=0):
+        sql, parametros = self._filtro_clientes(zona)
+        return self._consultar(sql + " ORDER BY id", parametros, limite, deslocamento)
+
+    def contar_clientes(self, zona=None):
+        return self._contar(*self._filtro_clientes(zona))
+
+    # Pedidos
+
+    def upsert_pedidos(self, pedidos, substituir=False):
+        return self._upsert("pedidos", pedidos, substituir)
+
+    def _filtro_pedidos(self, zona=None, status=None, cliente_id=None):
+        sql, condicoes, parametros = "SELECT p.* FROM pedidos p", [], []
+        if zona is not None:
+            sql += " JOIN clientes c ON c.id = p.cliente_id"
+            condicoes.append("c.zona = ?")
+            parametros.append(zona)
+        if status is not None:
+            condicoes.append("p.status = ?")
+            parametros.append(status)
+        if cliente_id is not None:
+            condicoes.append("p.cliente_id = ?")
+            parametros.append(cliente_id)
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        return sql, parametros
+
+    def listar_pedidos(self, zona=None, status=None, cliente_id=None, limite=None, deslocamento=0):
+        sql, parametros = self._filtro_pedidos(zona, status, cliente_id)
+        return self._consultar(sql + " ORDER BY p.id", parametros, limite, deslocamento)
+
+    def contar_pedidos(self, zona=None, status=None, cliente_id=None):
+        return self._contar(*self._filtro_pedidos(zona, status, cliente_id))
+
+    # Veículos
+
+    def upsert_veiculos(self, veiculos, substituir=False):
+        return self._upsert("veiculos", veiculos, substituir)
+
+    def _filtro_veiculos(self, tipo=None, disponivel=None):
+        sql, condicoes, parametros = "SELECT * FROM veiculos", [], []
+        if tipo is not None:
+            condicoes.append("tipo = ?")
+            parametros.append(tipo)
+        if disponivel is not None:
+            condicoes.append("disponivel = ?")
+            parametros.append(int(disponivel))
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        return sql, parametros
+
+    def listar_veiculos(self, tipo=None, disponivel=None, limite=None, deslocamento=0):
+        sql, parametros = self._filtro_veiculos(tipo, disponivel)
+        return self._consultar(sql + " ORDER BY id", parametros, limite, deslocamento)
+
+    def contar_veiculos(self, tipo=None, disponivel=None):
+        return self._contar(*self._filtro_veiculos(tipo, disponivel))
+
+    # Migração
+
+    def migrar_json(self, diretorio=DIRETORIO_JSON):
+        """
+        Importa clientes.json, pedidos.json e veiculos.json uma única vez (fica
+        registrado na tabela meta). Retorna quantos registros de cada tipo vieram.
+        """
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE chave = 'migracao_json'").fetchone():
+                return None
+
+        def ler(nome):
+            try:
+                with open(os.path.join(diretorio, nome), "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return []
+
+        clientes = ler("clientes.json")
+        pedidos_json = ler("pedidos.json")
+        pedidos = [
+            {**{k: v for k, v in p.items() if k != "cliente"}, "cliente_id": p["cliente"]["id"]}
+            for p in pedidos_json
+        ]
+        # Clientes que só existem embutidos em pedidos.json também são importados
+        conhecidos = {c["id"] for c in clientes}
+        for p in pedidos_json:
+            if p["cliente"]["id"] not in conhecidos:
+                conhecidos.add(p["cliente"]["id"])
+                clientes.append(p["cliente"])
+        veiculos = ler("veiculos.json")
+
+        resultado = {
+            "clientes": self.upsert_clientes(clientes),
+            "pedidos": self.upsert_pedidos(pedidos),
+            "veiculos": self.upsert_veiculos(veiculos),
+        }
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (chave, valor) VALUES ('migracao_json', ?)",
+                (json.dumps(resultado),),
+            )
+        return resultado
+
+
+def _para_coluna(coluna, valor):
+    if coluna == "zonas_permitidas":
+        return json.dumps(valor) if valor else None
+    if coluna == "disponivel":
+        return int(valor if valor is not None else True)
+    if coluna == "status" and valor is None:
+        return "PENDENTE"
+    return valor
+
+
+def _de_linha(linha):
+    registro = dict(linha)
+    if "zonas_permitidas" in registro:
+        registro["zonas_permitidas"] = json.loads(registro["zonas_permitidas"]) if registro["zonas_permitidas"] else None
+    if "disponivel" in registro:
+        registro["disponivel"] = bool(registro["disponivel"])
+    return registro
+
+
+def obter_armazem(caminho=None):
+    """
+    Armazém compartilhado do processo (um por arquivo de banco); na primeira
+    abertura migra os JSON de ./db_json, o que só acontece uma vez por banco.
+    """
+    caminho = os.path.abspath(caminho or CAMINHO_BANCO)
+    with _lock_global:
+        if caminho not in _armazens:
+            armazem = ArmazemSQLite(caminho)
+            armazem.migrar_json()
+            _armazens[caminho] = armazem
+        return _armazens[caminho]
+
+
+if __name__ == "__main__":
+    resultado = ArmazemSQLite().migrar_json()
+    if resultado is None:
+        print("Os arquivos JSON já tinham sido migrados para o banco.")
+    else:
+        print(f"✅ Migração concluída: {resultado}")
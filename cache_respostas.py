@@ -0,0 +1,74 @@
+# cache_respostas.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+MAX_ENTRADAS = 256
+
+
+@dataclass(frozen=True)
+class RespostaEmCache:
+    versao: tuple
+    corpo: bytes
+    etag: str
+    total: int
+
+
+class CacheRespostas:
+    """
+    Guarda respostas já validadas e serializadas (bytes) das listagens, por
+    chave (endpoint + parâmetros) e versão dos dados de origem. Enquanto a
+    versão não muda a resposta é servida direto da memória; quando muda, é
+    gerada de novo na próxima leitura. Mantém só as MAX_ENTRADAS chaves mais
+    recentes.
+    """
+
+    def __init__(self, max_entradas=MAX_ENTRADAS):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave, versao, gerar):
+        """
+        Resposta de chave na versão dada; gerar() -> (corpo, total) é chamada
+        só quando não há entrada para essa versão.
+        """
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada.versao == versao:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return entrada
+            self.falhas += 1
+
+        corpo, total = gerar()
+        entrada = RespostaEmCache(versao, corpo, f'"{hashlib.blake2b(corpo, digest_size=16).hexdigest()}"', total)
+        with self._lock:
+            self._entradas[chave] = entrada
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return entrada
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            return {"entradas": len(self._entradas), "acertos": self.acertos, "falhas": self.falhas}
+
+
+def etag_corresponde(if_none_match, etag):
+    """Interpreta o cabeçalho If-None-Match (lista de ETags, fracas ou não, ou *)."""
+    if not if_none_match:
+        return False
+    for candidata in if_none_match.split(","):
+        candidata = candidata.strip()
+        if candidata == "*" or candidata.removeprefix("W/") == etag:
+            return True
+    return False
@@ -40,4 +40,4 @@ if __name__ == "__main__":
     data_storage.salvar_veiculos(veiculos)
     data_storage.salvar_pedidos(pedidos)
 
-    print("Dados salvos em JSON com sucesso!")
+    print(f"Dados salvos em {data_storage.descricao_armazenamento()} com sucesso!")
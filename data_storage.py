@@ -1,10 +1,83 @@
 import json
+import os
 from models.cliente import Cliente
 from models.veiculo import Veiculo
 from models.pedido import Pedido
 from models.enums import TipoVeiculo, StatusPedido
+from armazenamento_sqlite import obter_armazem
 
-def carregar_clientes_de_json(caminho="./db_json/clientes.json"):
+# "sqlite" (padrão): clientes, pedidos e veículos ficam no banco indexado de
+# armazenamento_sqlite; "json": nos arquivos de ./db_json, como antes
+BACKEND_ARMAZENAMENTO = os.environ.get("BACKEND_ARMAZENAMENTO", "sqlite")
+
+CAMINHO_CLIENTES = "./db_json/clientes.json"
+CAMINHO_PEDIDOS = "./db_json/pedidos.json"
+CAMINHO_VEICULOS = "./db_json/veiculos.json"
+_CAMINHOS_JSON = {"clientes": CAMINHO_CLIENTES, "pedidos": CAMINHO_PEDIDOS, "veiculos": CAMINHO_VEICULOS}
+
+
+def _usar_sqlite(caminho):
+    """Um caminho explícito sempre se refere a um arquivo JSON."""
+    return caminho is None and BACKEND_ARMAZENAMENTO == "sqlite"
+
+
+def descricao_armazenamento():
+    """Onde os dados estão sendo gravados, para mensagens ao usuário."""
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        return f"SQLite ({obter_armazem().caminho})"
+    return f"JSON ({os.path.dirname(CAMINHO_CLIENTES)})"
+
+
+def origem_tabela(tabela):
+    """Arquivo JSON ou banco SQLite de onde a tabela é lida, para mensagens de erro."""
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        return f"banco {obter_armazem().caminho}"
+    return f"arquivo {_CAMINHOS_JSON[tabela]}"
+
+
+def _ler_json(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_json(dados, caminho):
+    caminho_tmp = caminho + ".tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=4)
+    os.replace(caminho_tmp, caminho)
+
+
+def _pedido_para_registro(pedido):
+    return {
+        "id": pedido.id,
+        "cliente_id": pedido.cliente.id,
+        "volume": pedido.volume,
+        "prioridade": pedido.prioridade,
+        "status": pedido.status.name,
+    }
+
+
+def _veiculo_para_registro(veiculo):
+    return {
+        "id": veiculo.id,
+        "tipo": veiculo.tipo.name,  # salva o nome do Enum, que é o que carregar_veiculos espera
+        "capacidade": veiculo.capacidade,
+        "disponivel": veiculo.disponivel,
+        "zonas_permitidas": veiculo.zonas_permitidas,
+    }
+
+
+def _veiculo_de_registro(v):
+    return Veiculo(
+        v["id"],
+        TipoVeiculo[v["tipo"]],
+        v["capacidade"],
+        v.get("disponivel", True),  # Usa True como padrão se não existir a chave
+        v.get("zonas_permitidas"),
+    )
+
+
+def carregar_clientes_de_json(caminho=CAMINHO_CLIENTES):
     with open(caminho, "r") as f:
         dados = json.load(f)
         clientes = []
@@ -20,59 +93,191 @@ def carregar_clientes_de_json(caminho="./db_json/clientes.json"):
         return clientes
 
 
-def salvar_clientes(clientes, caminho="./db_json/clientes.json"):
-    with open(caminho, "w") as f:
-        json.dump([cliente.__dict__ for cliente in clientes], f, indent=4)
+def salvar_clientes(clientes, caminho=None):
+    if _usar_sqlite(caminho):
+        obter_armazem().upsert_clientes([cliente.__dict__ for cliente in clientes], substituir=True)
+        return
+    _gravar_json([cliente.__dict__ for cliente in clientes], caminho or CAMINHO_CLIENTES)
 
-def carregar_clientes(caminho="./db_json/clientes.json"):
-    with open(caminho, "r") as f:
-        dados = json.load(f)
-        return [Cliente(**cliente) for cliente in dados]
-
-def salvar_veiculos(veiculos, caminho="./db_json/veiculos.json"):
-    with open(caminho, "w") as f:
-        json.dump([
-            {
-                "id": veiculo.id,
-                "tipo": veiculo.tipo.value,  # salva o Enum como string
-                "capacidade": veiculo.capacidade,
-                "disponivel": veiculo.disponivel
-            }
-            for veiculo in veiculos
-        ], f, indent=4)
-
-def carregar_veiculos(caminho="./db_json/veiculos.json"):
-    with open(caminho, "r") as f:
-        dados = json.load(f)
-        return [
-            Veiculo(
-                v["id"],
-                TipoVeiculo[v["tipo"]],  # Corrige para usar a chave do enum (string) no acesso
-                v["capacidade"],
-                v.get("disponivel", True)  # Usa True como padrão se não existir a chave
-            )
-            for v in dados
-        ]
+def carregar_clientes(caminho=None):
+    if _usar_sqlite(caminho):
+        return [Cliente(**cliente) for cliente in obter_armazem().listar_clientes()]
+    return [Cliente(**cliente) for cliente in _ler_json(caminho or CAMINHO_CLIENTES)]
 
+def salvar_veiculos(veiculos, caminho=None):
+    registros = [_veiculo_para_registro(veiculo) for veiculo in veiculos]
+    if _usar_sqlite(caminho):
+        obter_armazem().upsert_veiculos(registros, substituir=True)
+        return
+    _gravar_json(registros, caminho or CAMINHO_VEICULOS)
 
-def salvar_pedidos(pedidos, caminho="./db_json/pedidos.json"):
-    with open(caminho, "w") as f:
-        json.dump([{
-            "id": pedido.id,
-            "cliente": pedido.cliente.__dict__,
-            "volume": pedido.volume,
-            "prioridade": pedido.prioridade,
-            "status": pedido.status.name
-        } for pedido in pedidos], f, indent=4)
+def carregar_veiculos(caminho=None):
+    if _usar_sqlite(caminho):
+        return [_veiculo_de_registro(v) for v in obter_armazem().listar_veiculos()]
+    return [_veiculo_de_registro(v) for v in _ler_json(caminho or CAMINHO_VEICULOS)]
 
-def carregar_pedidos(caminho="./db_json/pedidos.json"):
-    with open(caminho, "r") as f:
-        dados = json.load(f)
-        pedidos = []
-        for p in dados:
-            cliente = Cliente(**p["cliente"])
-            status = StatusPedido[p["status"]]
-            pedido = Pedido(p["id"], cliente, p["volume"], p["prioridade"])
-            pedido.status = status
-            pedidos.append(pedido)
-        return pedidos
+
+def salvar_pedidos(pedidos, caminho=None):
+    if _usar_sqlite(caminho):
+        armazem = obter_armazem()
+        # Os clientes dos pedidos entram junto, para que cliente_id sempre resolva
+        armazem.upsert_clientes({p.cliente.id: p.cliente.__dict__ for p in pedidos}.values())
+        armazem.upsert_pedidos([_pedido_para_registro(p) for p in pedidos], substituir=True)
+        return
+    _gravar_json([{
+        "id": pedido.id,
+        "cliente": pedido.cliente.__dict__,
+        "volume": pedido.volume,
+        "prioridade": pedido.prioridade,
+        "status": pedido.status.name
+    } for pedido in pedidos], caminho or CAMINHO_PEDIDOS)
+
+def carregar_pedidos(caminho=None):
+    if _usar_sqlite(caminho):
+        armazem = obter_armazem()
+        clientes = {c["id"]: Cliente(**c) for c in armazem.listar_clientes()}
+        dados = [{**p, "cliente": clientes[p["cliente_id"]]} for p in armazem.listar_pedidos()]
+    else:
+        dados = [{**p, "cliente": Cliente(**p["cliente"])} for p in _ler_json(caminho or CAMINHO_PEDIDOS)]
+    pedidos = []
+    for p in dados:
+        pedido = Pedido(p["id"], p["cliente"], p["volume"], p["prioridade"])
+        pedido.status = StatusPedido[p["status"]]
+        pedidos.append(pedido)
+    return pedidos
+
+
+# Consultas com filtro e paginação (formato dos modelos da API: pedidos com cliente_id).
+# Cada uma retorna (registros da página, total de registros que passam nos filtros).
+
+def _paginar(registros, limite, deslocamento):
+    fim = None if limite is None else deslocamento + limite
+    return registros[deslocamento:fim], len(registros)
+
+
+def listar_clientes(zona=None, limite=None, deslocamento=0):
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        armazem = obter_armazem()
+        return armazem.listar_clientes(zona, limite, deslocamento), armazem.contar_clientes(zona)
+    clientes = [c for c in _ler_json(CAMINHO_CLIENTES) if zona is None or c["zona"] == zona]
+    return _paginar(clientes, limite, deslocamento)
+
+
+def listar_pedidos(zona=None, status=None, cliente_id=None, limite=None, deslocamento=0):
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        armazem = obter_armazem()
+        return (
+            armazem.listar_pedidos(zona, status, cliente_id, limite, deslocamento),
+            armazem.contar_pedidos(zona, status, cliente_id),
+        )
+    pedidos = []
+    for p in _ler_json(CAMINHO_PEDIDOS):
+        cliente = p.get("cliente") or {}
+        if cliente.get("id") is None:
+            raise ValueError(f"Pedido com ID {p.get('id')} não possui um 'cliente.id' válido.")
+        if zona is not None and cliente.get("zona") != zona:
+            continue
+        if status is not None and p.get("status") != status:
+            continue
+        if cliente_id is not None and cliente["id"] != cliente_id:
+            continue
+        pedidos.append({**{k: v for k, v in p.items() if k != "cliente"}, "cliente_id": cliente["id"]})
+    return _paginar(pedidos, limite, deslocamento)
+
+
+def listar_veiculos(tipo=None, disponivel=None, limite=None, deslocamento=0):
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        armazem = obter_armazem()
+        return (
+            armazem.listar_veiculos(tipo, disponivel, limite, deslocamento),
+            armazem.contar_veiculos(tipo, disponivel),
+        )
+    veiculos = [
+        v for v in _ler_json(CAMINHO_VEICULOS)
+        if (tipo is None or v["tipo"] == tipo)
+        and (disponivel is None or v.get("disponivel", True) == disponivel)
+    ]
+    return _paginar(veiculos, limite, deslocamento)
+
+
+def versao_dados(*tabelas):
+    """
+    Identifica o estado atual das tabelas dadas ("clientes", "pedidos", "veiculos"):
+    o contador de versões do banco ou (mtime, tamanho) de cada arquivo JSON.
+    Muda sempre que os dados mudam, então serve de chave para caches de leitura.
+    """
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        return ("sqlite", obter_armazem().caminho) + obter_armazem().versoes(*tabelas)
+    versao = ["json"]
+    for tabela in tabelas:
+        caminho = os.path.abspath(_CAMINHOS_JSON[tabela])
+        estado = os.stat(caminho)
+        versao += [caminho, estado.st_mtime_ns, estado.st_size]
+    return tuple(versao)
+
+
+def clientes_por_id():
+    """{id: cliente} de todos os clientes, no formato de ClienteModel."""
+    clientes, _ = listar_clientes()
+    return {c["id"]: c for c in clientes}
+
+
+def obter_gravador_pedidos():
+    """Gravador em lote de pedidos (dicts no formato de pedidos.json) do backend configurado."""
+    if BACKEND_ARMAZENAMENTO == "sqlite":
+        return GravadorPedidosSQLite()
+    return GravadorPedidosJSON()
+
+
+class GravadorPedidosSQLite:
+    """Upsert de pedidos em lote no banco; cada lote é gravado em uma transação."""
+
+    def __init__(self, armazem=None):
+        self.armazem = armazem or obter_armazem()
+        self._clientes_vistos = set()
+
+    def gravar(self, lote):
+        # Para que cliente_id sempre resolva, cada cliente visto pela primeira vez é
+        # inserido se ainda não existir; os já gravados (e editados durante a
+        # importação) ficam como estão, e a versão de clientes não muda à toa
+        novos = {p["cliente"]["id"]: p["cliente"] for p in lote if p["cliente"]["id"] not in self._clientes_vistos}
+        if novos:
+            self.armazem.inserir_clientes_ausentes(novos.values())
+            self._clientes_vistos.update(novos)
+        self.armazem.upsert_pedidos([
+            {**{k: v for k, v in p.items() if k != "cliente"}, "cliente_id": p["cliente"]["id"]}
+            for p in lote
+        ])
+
+    def concluir(self):
+        pass
+
+
+class GravadorPedidosJSON:
+    """
+    Upsert de pedidos em lote no pedidos.json (dicts no mesmo formato do arquivo,
+    com o cliente embutido). O arquivo é lido uma vez, cada lote é aplicado por id
+    e o resultado é regravado de forma atômica (temporário + os.replace) em concluir().
+    """
+
+    def __init__(self, caminho=CAMINHO_PEDIDOS):
+        self.caminho = caminho
+        self._pedidos = None
+
+    def gravar(self, lote):
+        if self._pedidos is None:
+            try:
+                with open(self.caminho, "r", encoding="utf-8") as f:
+                    self._pedidos = {p["id"]: p for p in json.load(f)}
+            except FileNotFoundError:
+                self._pedidos = {}
+        for pedido in lote:
+            self._pedidos[pedido["id"]] = pedido
+
+    def concluir(self):
+        if self._pedidos is None:
+            return
+        caminho_tmp = self.caminho + ".tmp"
+        with open(caminho_tmp, "w", encoding="utf-8") as f:
+            json.dump(list(self._pedidos.values()), f, indent=4)
+        os.replace(caminho_tmp, self.caminho)
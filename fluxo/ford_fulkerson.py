@@ -1,4 +1,7 @@
+import time
+from array import array
 from collections import deque
+import numpy as np
 class Edge:
     def __init__(self, to, rev, capacity):
         self.to = to    #Nó destino
@@ -76,4 +79,245 @@ class ExtendedMaxFlow(MaxFlow):
             self.add_edge(t, self.super_sink, cap)
     
     def multi_max_flow(self):
-        return super().max_flow(self.super_source, self.super_sink)
\ No newline at end of file
+        return super().max_flow(self.super_source, self.super_sink)
+
+class Dinic:
+    """
+    Fluxo máximo (Dinic) com o grafo residual em arrays planos. As arestas
+    ficam em arrays paralelos (fr/to/original_cap) na ordem de inserção, e a
+    aresta reversa de e é e ^ 1. Antes de resolver, o grafo é organizado em CSR
+    (offsets por nó, montados com NumPy), de modo que percorrer as arestas de um
+    nó é uma faixa contígua. BFS de níveis e DFS de fluxo bloqueante são
+    iterativos, com ponteiro de aresta corrente: sem limite de recursão e sem
+    um objeto Python por aresta.
+
+    O fluxo é incremental: set_capacity/remove_edge alteram o grafo residual no
+    lugar (cancelando só o fluxo excedente) e max_flow continua do estado atual.
+    """
+
+    def __init__(self, n):
+        self.size = n
+        self.fr = array('q')
+        self.to = array('q')
+        self.original_cap = array('d')
+        self.total_flow = 0
+        self._cap = array('d')  # Residual na ordem de inserção (enquanto não há CSR)
+        self._csr = None
+        self._terminais = None  # (s, t) do último max_flow
+        self.interrompido = False  # True se o último max_flow parou no prazo
+
+    def add_edge(self, fr, to, cap):
+        """Adiciona a aresta fr -> to (e sua reversa) e retorna o índice da aresta direta."""
+        self._desmontar_csr()
+        e = len(self.to)
+        self.fr.extend((fr, to))
+        self.to.extend((to, fr))
+        self._cap.extend((cap, 0))
+        self.original_cap.extend((cap, 0))
+        return e
+
+    def add_edges(self, frs, tos, caps):
+        """Versão em lote de add_edge; retorna o índice da primeira aresta direta."""
+        self._desmontar_csr()
+        frs = np.asarray(frs, dtype=np.int64)
+        tos = np.asarray(tos, dtype=np.int64)
+        caps = np.asarray(caps, dtype=np.float64)
+        e = len(self.to)
+        pares_fr = np.empty(2 * len(frs), dtype=np.int64)
+        pares_fr[0::2], pares_fr[1::2] = frs, tos
+        pares_cap = np.zeros(2 * len(frs), dtype=np.float64)
+        pares_cap[0::2] = caps
+        self.fr.frombytes(pares_fr.tobytes())
+        self.to.frombytes(pares_fr.reshape(-1, 2)[:, ::-1].tobytes())
+        self._cap.frombytes(pares_cap.tobytes())
+        self.original_cap.frombytes(pares_cap.tobytes())
+        return e
+
+    def _obter_csr(self):
+        if self._csr is None:
+            fr = np.asarray(self.fr, dtype=np.int64)
+            ordem = np.argsort(fr, kind='stable')
+            inicio = np.zeros(self.size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(fr, minlength=self.size), out=inicio[1:])
+            posicao = np.empty_like(ordem)
+            posicao[ordem] = np.arange(len(ordem))
+            self._csr = (
+                inicio.tolist(),
+                ordem,
+                np.asarray(self.to, dtype=np.int64)[ordem].tolist(),
+                posicao[ordem ^ 1].tolist(),  # posição CSR da aresta reversa
+                posicao.tolist(),  # posição CSR de cada aresta
+                np.asarray(self._cap, dtype=np.float64)[ordem].tolist(),  # residual
+            )
+            self._cap = None
+        return self._csr
+
+    def _desmontar_csr(self):
+        """Volta o residual para a ordem de inserção (antes de mudar a estrutura)."""
+        if self._csr is not None:
+            ordem, cap = self._csr[1], self._csr[5]
+            caps = np.empty(len(ordem), dtype=np.float64)
+            caps[ordem] = cap
+            self._cap = array('d', caps.tobytes())
+            self._csr = None
+
+    def edges(self, v):
+        """Índices das arestas que saem de v (diretas e reversas)."""
+        inicio, ordem = self._obter_csr()[:2]
+        return ordem[inicio[v]:inicio[v + 1]].tolist()
+
+    def residual(self, e):
+        if self._csr is None:
+            return self._cap[e]
+        return self._csr[5][self._csr[4][e]]
+
+    def flow(self, e):
+        """Fluxo que passa pela aresta direta e."""
+        return self.original_cap[e] - self.residual(e)
+
+    def _bfs_level(self, s, t, level, inicio, to, cap):
+        """Níveis a partir de s no grafo residual; retorna True se t for alcançável."""
+        level[:] = [-1] * self.size
+        level[s] = 0
+        fila = [s]
+        for v in fila:
+            proximo_nivel = level[v] + 1
+            for p in range(inicio[v], inicio[v + 1]):
+                w = to[p]
+                if level[w] < 0 and cap[p] > 0:
+                    level[w] = proximo_nivel
+                    if w == t:
+                        # Nós em níveis >= level[t] não estão em caminhos mínimos até t
+                        return True
+                    fila.append(w)
+        return False
+
+    def _blocking_flow(self, s, t, level, inicio, to, rev, cap, limite, prazo=None):
+        """Fluxo bloqueante (até limite) no grafo de níveis, com DFS iterativa e aresta corrente."""
+        it = inicio[:-1]
+        path = []
+        total = 0
+        v = s
+        while True:
+            if v == t:
+                f = min(limite - total, min(cap[p] for p in path))
+                for p in path:
+                    cap[p] -= f
+                    cap[rev[p]] += f
+                total += f
+                if total >= limite or (prazo is not None and time.monotonic() >= prazo):
+                    return total
+                # Volta até o início da primeira aresta saturada
+                k = next(k for k, p in enumerate(path) if cap[p] <= 0)
+                del path[k:]
+                v = to[path[-1]] if path else s
+                continue
+
+            p, fim = it[v], inicio[v + 1]
+            proximo_nivel = level[v] + 1
+            while p < fim and not (cap[p] > 0 and level[to[p]] == proximo_nivel):
+                p += 1
+            it[v] = p
+            if p < fim:
+                path.append(p)
+                v = to[p]
+                continue
+
+            # Beco sem saída: remove v do grafo de níveis e recua
+            if v == s:
+                return total
+            level[v] = -1
+            p = path.pop()
+            v = to[rev[p]]
+            it[v] += 1
+
+    def _augment(self, s, t, limite=float('inf'), prazo=None):
+        """Empurra até limite unidades de s para t no grafo residual atual."""
+        if s == t:
+            return 0
+        inicio, _, to, rev, _, cap = self._obter_csr()
+        flow = 0
+        level = [-1] * self.size
+        while flow < limite and self._bfs_level(s, t, level, inicio, to, cap):
+            if prazo is not None and time.monotonic() >= prazo:
+                self.interrompido = True
+                break
+            flow += self._blocking_flow(s, t, level, inicio, to, rev, cap, limite - flow, prazo)
+        return flow
+
+    def max_flow(self, s, t, prazo=None):
+        """
+        Aumenta o fluxo de s para t a partir do estado atual e retorna o acréscimo.
+        prazo: instante (time.monotonic) para parar; o fluxo parcial é válido e
+        uma nova chamada continua de onde parou (veja interrompido).
+        """
+        self._terminais = (s, t)
+        self.interrompido = False
+        flow = self._augment(s, t, prazo=prazo)
+        self.total_flow += flow
+        return flow
+
+    def set_capacity(self, e, cap):
+        """
+        Muda a capacidade da aresta direta e no grafo residual, sem reconstruir.
+        Se o fluxo atual passar da nova capacidade, o excesso primeiro é desviado
+        por outro caminho de fr[e] até to[e]; o que sobrar é cancelado (de volta
+        para a fonte e a partir do destino). Depois o fluxo é reaumentado a partir
+        do estado atual. Retorna o novo fluxo total.
+        """
+        _, _, _, rev, posicao, residual = self._obter_csr()
+        p = posicao[e]
+        fluxo = self.original_cap[e] - residual[p]
+        self.original_cap[e] = cap
+        if cap >= fluxo:
+            residual[p] = cap - fluxo
+        else:
+            excesso = fluxo - cap
+            residual[p] = 0
+            residual[rev[p]] -= excesso
+            u, v = self.fr[e], self.to[e]
+            excesso -= self._augment(u, v, excesso)
+            if excesso > 0:
+                s, t = self._terminais
+                self._augment(u, s, excesso)
+                self._augment(t, v, excesso)
+                self.total_flow -= excesso
+        if self._terminais is not None:
+            self.max_flow(*self._terminais)
+        return self.total_flow
+
+    def remove_edge(self, e):
+        """Remove a aresta direta e (capacidade 0, cancelando o fluxo que passava por ela)."""
+        return self.set_capacity(e, 0)
+
+
+class ExtendedDinic(Dinic):
+    def __init__(self, n):
+        super().__init__(n + 2)  # +2 para super fonte e super destino
+        self.super_source = n
+        self.super_sink = n + 1
+        self.source_edge = {}  # nó -> aresta vinda da super fonte
+        self.sink_edge = {}  # nó -> aresta para o super destino
+
+    def add_multi_sources(self, sources, caps):
+        sources = list(sources)
+        e = self.add_edges([self.super_source] * len(sources), sources, list(caps))
+        for k, s in enumerate(sources):
+            self.source_edge[s] = e + 2 * k
+
+    def add_multi_sinks(self, sinks, caps):
+        sinks = list(sinks)
+        e = self.add_edges(sinks, [self.super_sink] * len(sinks), list(caps))
+        for k, t in enumerate(sinks):
+            self.sink_edge[t] = e + 2 * k
+
+    def multi_max_flow(self, prazo=None):
+        return self.max_flow(self.super_source, self.super_sink, prazo)
+
+    def set_source_capacity(self, node, cap):
+        """Muda a oferta de uma fonte (ex.: pedido cancelado) e reotimiza incrementalmente."""
+        return self.set_capacity(self.source_edge[node], cap)
+
+    def set_sink_capacity(self, node, cap):
+        """Muda a capacidade de um destino (ex.: veículo indisponível) e reotimiza incrementalmente."""
+        return self.set_capacity(self.sink_edge[node], cap)
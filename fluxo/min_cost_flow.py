@@ -0,0 +1,128 @@
+from ortools.graph.python import min_cost_flow as ortools_mcf
+
+# Custo por unidade de volume de cada tipo de veículo (tipos desconhecidos custam 1)
+CUSTO_POR_TIPO = {
+    'MOTO': 1,
+    'CARRO': 2,
+    'VAN': 3,
+    'CARRO_MEDIO': 3,
+    'CAMINHAO': 5,
+}
+
+# O solver do OR-Tools é inteiro: volumes fracionários entram em milésimos
+ESCALA_VOLUME = 1000
+
+
+class MinCostFlow:
+    """
+    Fluxo de custo mínimo sobre o SimpleMinCostFlow do OR-Tools (C++), que já é
+    dependência do VRP. A interface segue ford_fulkerson.Dinic: add_edge devolve
+    o índice do arco e flow(e) o fluxo que passou por ele.
+    """
+
+    def __init__(self, n):
+        self.size = n
+        self.rede = ortools_mcf.SimpleMinCostFlow()
+        self.capacidade_saida = [0] * n
+
+    def add_edge(self, fr, to, cap, cost):
+        """Adiciona fr -> to com custo por unidade e retorna o índice do arco."""
+        self.capacidade_saida[fr] += cap
+        return self.rede.add_arc_with_capacity_and_unit_cost(fr, to, cap, cost)
+
+    def flow(self, e):
+        return self.rede.flow(e)
+
+    def min_cost_flow(self, s, t, limite=float('inf')):
+        """
+        Envia até limite unidades de s para t com custo mínimo (sem limite: o
+        fluxo máximo de menor custo). Retorna (fluxo, custo).
+        """
+        oferta = min(limite, self.capacidade_saida[s])
+        if oferta <= 0:
+            return 0, 0
+        self.rede.set_node_supply(s, oferta)
+        self.rede.set_node_supply(t, -oferta)
+        status = self.rede.solve_max_flow_with_min_cost()
+        if status != self.rede.OPTIMAL:
+            raise ValueError(f"Fluxo de custo mínimo não resolvido (status {status}).")
+        return self.rede.maximum_flow(), self.rede.optimal_cost()
+
+
+def custo_do_veiculo(veiculo):
+    tipo = getattr(veiculo.tipo, 'name', veiculo.tipo)
+    return CUSTO_POR_TIPO.get(str(tipo).upper(), 1)
+
+
+def min_cost_allocations(pedidos, veiculos, vehicle_costs=None):
+    """
+    Alocação pedido -> veículo por fluxo de custo mínimo, respeitando as zonas.
+
+    Os pedidos são agregados em classes (zona, prioridade); a rede é
+    fonte -> classe -> veículo -> destino. O fluxo é máximo (o mesmo volume de
+    build_flow_network) e, entre as alocações máximas:
+      - os pedidos de menor prioridade ficam de fora primeiro;
+      - pedidos de maior prioridade vão para os veículos mais baratos
+        (custo do arco classe -> veículo = custo do veículo x prioridade).
+
+    vehicle_costs: custo por unidade de cada veículo; padrão pelo tipo (CUSTO_POR_TIPO).
+    Com volumes ou capacidades fracionários a rede é resolvida em 1/ESCALA_VOLUME.
+    Retorna {'pedidos': {índice do pedido: {índice do veículo: volume}},
+    'veiculos': {índice do veículo: volume}, 'fluxo': ..., 'custo': ...}.
+    """
+    if vehicle_costs is None:
+        vehicle_costs = [custo_do_veiculo(v) for v in veiculos]
+
+    classes = {}
+    for i, pedido in enumerate(pedidos):
+        classes.setdefault((pedido.cliente.zona, pedido.prioridade), []).append(i)
+    chaves = sorted(classes, key=lambda c: (str(c[0]), -c[1]))
+    prioridade_max = max((c[1] for c in chaves), default=0)
+    # O custo de deixar uma prioridade de fora precisa dominar qualquer diferença de custo de veículo
+    peso_prioridade = max((c * max(p, 1) for c in vehicle_costs for _, p in chaves), default=0) + 1
+
+    valores = [p.volume for p in pedidos] + [v.capacidade for v in veiculos]
+    escala = 1 if all(float(x).is_integer() for x in valores) else ESCALA_VOLUME
+
+    k, m = len(chaves), len(veiculos)
+    fonte, destino = k + m, k + m + 1
+    rede = MinCostFlow(k + m + 2)
+    arcos = []
+    for c, (zona, prioridade) in enumerate(chaves):
+        volume = sum(round(pedidos[i].volume * escala) for i in classes[(zona, prioridade)])
+        rede.add_edge(fonte, c, volume, (prioridade_max - prioridade) * peso_prioridade)
+        for j, veiculo in enumerate(veiculos):
+            if not veiculo.zonas_permitidas or zona in veiculo.zonas_permitidas:
+                arcos.append((c, j, rede.add_edge(c, k + j, volume, vehicle_costs[j] * max(prioridade, 1))))
+    for j, veiculo in enumerate(veiculos):
+        rede.add_edge(k + j, destino, round(veiculo.capacidade * escala), 0)
+
+    fluxo, custo = rede.min_cost_flow(fonte, destino)
+
+    # Distribui o fluxo de cada classe entre os seus pedidos (ordem de índice)
+    fluxo_classe = [[] for _ in range(k)]
+    for c, j, e in arcos:
+        if rede.flow(e) > 0:
+            fluxo_classe[c].append([j, rede.flow(e)])
+    por_pedido = {}
+    por_veiculo = {}
+    for c, chave in enumerate(chaves):
+        pendentes = fluxo_classe[c]
+        for i in classes[chave]:
+            restante = round(pedidos[i].volume * escala)
+            while restante > 0 and pendentes:
+                j, disponivel = pendentes[-1]
+                parte = min(restante, disponivel)
+                alocado = por_pedido.setdefault(i, {})
+                alocado[j] = alocado.get(j, 0) + parte
+                por_veiculo[j] = por_veiculo.get(j, 0) + parte
+                restante -= parte
+                pendentes[-1][1] -= parte
+                if pendentes[-1][1] <= 0:
+                    pendentes.pop()
+
+    if escala != 1:
+        por_pedido = {i: {j: v / escala for j, v in d.items()} for i, d in por_pedido.items()}
+        por_veiculo = {j: v / escala for j, v in por_veiculo.items()}
+        fluxo, custo = fluxo / escala, custo / escala
+    return {'pedidos': por_pedido, 'veiculos': por_veiculo, 'fluxo': fluxo, 'custo': custo}
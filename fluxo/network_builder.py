@@ -1,18 +1,27 @@
-import datetime
-from .ford_fulkerson import ExtendedMaxFlow
+from datetime import datetime
+
+import numpy as np
+
+from models.lote import OrderBatch, capacidades_e_elegibilidade, zonas_e_volumes
+from .ford_fulkerson import ExtendedDinic
 
 def build_flow_network(pedidos, veiculos):
     # Nós: 0 a n-1 são pedidos, n a n+m-1 são veículos
     n = len(pedidos)
     m = len(veiculos)
-    flow = ExtendedMaxFlow(n + m)
+    flow = ExtendedDinic(n + m)
+    flow.vehicle_offset = n
     
-    # Conexões pedidos-veículos
+    # Conexões pedidos-veículos (inseridas em lote nos arrays da rede)
+    origens, destinos, capacidades = [], [], []
     for i, pedido in enumerate(pedidos):
         for j, veiculo in enumerate(veiculos):
             if (not veiculo.zonas_permitidas or 
                 pedido.cliente.zona in veiculo.zonas_permitidas):
-                flow.add_edge(i, n + j, pedido.volume)
+                origens.append(i)
+                destinos.append(n + j)
+                capacidades.append(pedido.volume)
+    flow.add_edges(origens, destinos, capacidades)
     
     # Múltiplas fontes (pedidos)
     flow.add_multi_sources(
@@ -28,19 +37,144 @@ def build_flow_network(pedidos, veiculos):
     
     return flow
 
+def build_zone_flow_network(pedidos, veiculos):
+    """
+    Versão agregada por zona: fonte -> zona (volume somado) -> veículo -> destino.
+    A elegibilidade só depende da zona, então o grafo tem O(zonas * veículos)
+    arcos em vez de O(pedidos * veículos), com o mesmo fluxo máximo.
+    Aceita listas de objetos ou os lotes em colunas de models.lote.
+    """
+    zona_pedido, zonas, volumes = zonas_e_volumes(pedidos)
+    volume_zona = np.bincount(zona_pedido, weights=volumes, minlength=len(zonas))
+    return build_zone_flow_network_from_totals(volume_zona, zonas, veiculos)
+
+def build_zone_flow_network_from_totals(volume_zona, zonas, veiculos):
+    """Rede por zona a partir do volume total de cada zona (na ordem de zonas), sem os pedidos."""
+    capacidades, atende = capacidades_e_elegibilidade(veiculos, zonas)  # atende: veículo x zona
+    volume_zona = np.asarray(volume_zona, dtype=np.float64)
+
+    # Nós: 0 a k-1 são zonas, k a k+m-1 são veículos
+    k = len(zonas)
+    m = len(capacidades)
+    flow = ExtendedDinic(k + m)
+    flow.vehicle_offset = k
+    flow.zonas = zonas
+
+    veiculos_arco, zonas_arco = np.nonzero(atende)
+    ordem = np.lexsort((veiculos_arco, zonas_arco))  # arcos agrupados por zona
+    zonas_arco, veiculos_arco = zonas_arco[ordem], veiculos_arco[ordem]
+    flow.add_edges(zonas_arco.tolist(), (k + veiculos_arco).tolist(), volume_zona[zonas_arco].tolist())
+
+    flow.add_multi_sources(sources=range(k), caps=volume_zona.tolist())
+    flow.add_multi_sinks(
+        sinks=[k + j for j in range(m)],
+        caps=capacidades.tolist()
+    )
+    return flow
+
+def _zona_na_rede(flow_network, pedidos):
+    """Índice, nas zonas da rede, da zona de cada pedido."""
+    zona_pedido, zonas, _ = zonas_e_volumes(pedidos)
+    indice_zona = {zona: z for z, zona in enumerate(flow_network.zonas)}
+    return np.array([indice_zona[zona] for zona in zonas], dtype=np.int64)[zona_pedido]
+
+def _fluxo_por_zona(flow_network):
+    """[[índice do veículo, fluxo], ...] que sai de cada zona da rede."""
+    k = flow_network.vehicle_offset
+    fluxo_zona = [[] for _ in range(k)]
+    for z in range(k):
+        for e in flow_network.edges(z):
+            destino = flow_network.to[e]
+            if k <= destino < flow_network.super_source and flow_network.flow(e) > 0:
+                fluxo_zona[z].append([destino - k, flow_network.flow(e)])
+    return fluxo_zona
+
+def get_order_allocations(flow_network, pedidos):
+    """
+    Distribui o fluxo de cada zona (rede de build_zone_flow_network) entre os
+    pedidos da zona, dos mais prioritários para os menos.
+    Retorna {índice do pedido: {índice do veículo: volume}}; pedidos sem
+    fluxo não aparecem.
+    """
+    fluxo_zona = _fluxo_por_zona(flow_network)
+    zona_pedido = _zona_na_rede(flow_network, pedidos).tolist()
+    if isinstance(pedidos, OrderBatch):
+        volumes, prioridades = pedidos.volume.tolist(), pedidos.prioridade
+    else:
+        volumes, prioridades = [p.volume for p in pedidos], np.array([p.prioridade for p in pedidos])
+    ordem = np.lexsort((np.arange(len(volumes)), -prioridades)).tolist()
+    allocations = {}
+    for i in ordem:
+        restante = volumes[i]
+        pendentes = fluxo_zona[zona_pedido[i]]
+        while restante > 0 and pendentes:
+            j, disponivel = pendentes[-1]
+            parte = min(restante, disponivel)
+            por_veiculo = allocations.setdefault(i, {})
+            por_veiculo[j] = por_veiculo.get(j, 0) + parte
+            restante -= parte
+            pendentes[-1][1] -= parte
+            if pendentes[-1][1] <= 0:
+                pendentes.pop()
+    return allocations
+
+def get_vehicle_hints(flow_network, pedidos, veiculos):
+    """
+    Veículos sugeridos para cada pedido a partir da rede por zona já resolvida:
+    os que receberam fluxo da zona do pedido. Se a zona não recebeu fluxo (ou o
+    cálculo foi interrompido no prazo), sugere todos os veículos que atendem a zona.
+    Retorna uma lista (por pedido) de índices de veículos; pedidos da mesma
+    zona compartilham a mesma lista.
+    """
+    k = flow_network.vehicle_offset
+    usados = [[] for _ in range(k)]
+    if not flow_network.interrompido:
+        usados = [sorted(j for j, _ in fluxo) for fluxo in _fluxo_por_zona(flow_network)]
+
+    _, atende = capacidades_e_elegibilidade(veiculos, flow_network.zonas)
+    for z in range(k):
+        if not usados[z]:
+            usados[z] = np.flatnonzero(atende[:, z]).tolist()
+    return [usados[z] for z in _zona_na_rede(flow_network, pedidos).tolist()]
+
+def cancel_order(flow_network, pedidos, i):
+    """
+    Cancela o pedido i na rede já resolvida, sem reconstruí-la: zera o arco da
+    fonte (rede por pedido) ou desconta o volume da zona (rede por zona).
+    Retorna o novo fluxo máximo.
+    """
+    if hasattr(flow_network, 'zonas'):
+        if isinstance(pedidos, OrderBatch):
+            zona, volume = pedidos.zonas[pedidos.zona[i]], pedidos.volume[i].item()
+        else:
+            zona, volume = pedidos[i].cliente.zona, pedidos[i].volume
+        z = flow_network.zonas.index(zona)
+        e = flow_network.source_edge[z]
+        return flow_network.set_capacity(e, max(0, flow_network.original_cap[e] - volume))
+    return flow_network.set_source_capacity(i, 0)
+
+def set_vehicle_availability(flow_network, j, disponivel, capacidade):
+    """Liga/desliga o veículo j (capacidade 0 quando indisponível). Retorna o novo fluxo máximo."""
+    return flow_network.set_sink_capacity(
+        flow_network.vehicle_offset + j, capacidade if disponivel else 0
+    )
+
 def get_allocations(flow_network, num_pedidos, num_veiculos):
     allocations = {}
+    # Nas redes deste módulo os veículos começam em vehicle_offset (pedidos ou zonas)
+    offset = getattr(flow_network, 'vehicle_offset', num_pedidos)
     for j in range(num_veiculos):
-        veic_node = num_pedidos + j
-        for edge in flow_network.graph[veic_node]:
-            if edge.to != flow_network.super_sink:
+        veic_node = offset + j
+        for e in flow_network.edges(veic_node):
+            if flow_network.to[e] != flow_network.super_sink:
                 continue
-            if edge.capacity < edge.original_capacity:
-                allocations[j] = edge.original_capacity - edge.capacity
+            if flow_network.flow(e) > 0:
+                allocations[j] = flow_network.flow(e)
     return allocations
 
 def get_network_visualization_data(flow_network, pedidos, veiculos):
     """Retorna dados estruturados para visualização"""
+    flow_network.multi_max_flow()  # Só aumenta o que faltar; no-op se o fluxo já foi calculado
     nodes = []
     edges = []
     
@@ -66,20 +200,22 @@ def get_network_visualization_data(flow_network, pedidos, veiculos):
     
     # Arestas (conexões)
     for i in range(len(pedidos)):
-        for edge in flow_network.graph[i]:
-            if edge.to >= len(pedidos):  # Conexões para veículos
+        for e in flow_network.edges(i):
+            destino = flow_network.to[e]
+            # Conexões para veículos (arestas diretas; as reversas têm capacidade 0)
+            if len(pedidos) <= destino < len(pedidos) + len(veiculos) and flow_network.original_cap[e] > 0:
                 edges.append({
                     'from': f'pedido_{i}',
-                    'to': f'veiculo_{edge.to - len(pedidos)}',
-                    'flow': edge.original_capacity - edge.capacity,
-                    'capacity': edge.original_capacity
+                    'to': f'veiculo_{destino - len(pedidos)}',
+                    'flow': flow_network.flow(e),
+                    'capacity': flow_network.original_cap[e]
                 })
     
     return {
         'nodes': nodes,
         'edges': edges,
         'metadata': {
-            'total_flow': flow_network.multi_max_flow(),
+            'total_flow': flow_network.total_flow,
             'timestamp': datetime.now().isoformat()
         }
     }
\ No newline at end of file
@@ -0,0 +1,143 @@
+# gerenciador_jobs.py
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+MAX_SOLVES_CONCORRENTES = int(os.environ.get("MAX_SOLVES_CONCORRENTES", os.cpu_count() or 2))
+# Processos que um job pode abrir para subproblemas (decompor_por_zona, clusterizar);
+# sem a variável, a parte do job nas CPUs do nó, mas nunca menos que 2
+PROCESSOS_POR_JOB = os.environ.get("PROCESSOS_POR_JOB")
+MAX_JOBS_GUARDADOS = 1000
+
+
+class ErroJob(Exception):
+    """Erro de negócio de um job, com o status HTTP correspondente (serializável entre processos)."""
+
+    def __init__(self, status_code, detail):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class GerenciadorJobs:
+    """
+    Executa otimizações em um pool de processos, sem bloquear o event loop.
+    O número de processos limita quantos solves rodam ao mesmo tempo neste nó;
+    os demais jobs aguardam na fila do pool.
+    """
+
+    def __init__(self, max_concorrentes=MAX_SOLVES_CONCORRENTES, inicializador=None,
+                 processos_por_job=PROCESSOS_POR_JOB):
+        self.max_concorrentes = max_concorrentes
+        self._processos_por_job = int(processos_por_job) if processos_por_job else None
+        self._inicializador = inicializador
+        self._pool = None
+        self._jobs = OrderedDict()
+        self._futuros = {}
+        self._lock = threading.Lock()
+
+    @property
+    def processos_por_job(self):
+        """
+        Processos que cada job pode abrir para resolver subproblemas em paralelo.
+        Por padrão, a parte do job nas CPUs do nó (cpu_count // max_concorrentes),
+        com um mínimo de 2 para que a decomposição não fique sempre em sequência:
+        com todos os jobs decompondo ao mesmo tempo, o nó fica no máximo com o
+        dobro de processos por CPU. PROCESSOS_POR_JOB fixa o valor.
+        """
+        if self._processos_por_job:
+            return max(1, self._processos_por_job)
+        cpus = os.cpu_count() or 1
+        return max(1, min(cpus, max(2, cpus // self.max_concorrentes)))
+
+    def _obter_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_concorrentes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._inicializador,
+                )
+            return self._pool
+
+    def submeter(self, funcao, *args):
+        """Enfileira o job e retorna seu id imediatamente."""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "PENDENTE",
+            "criado_em": datetime.now().isoformat(),
+            "concluido_em": None,
+            "resultado": None,
+            "erro": None,
+            "status_code": None,
+        }
+        futuro = self._obter_pool().submit(funcao, *args)
+        with self._lock:
+            self._jobs[job_id] = job
+            self._futuros[job_id] = futuro
+            while len(self._jobs) > MAX_JOBS_GUARDADOS:
+                antigo, _ = self._jobs.popitem(last=False)
+                self._futuros.pop(antigo, None)
+        futuro.add_done_callback(lambda f, job_id=job_id: self._finalizar(job_id, f))
+        return job_id
+
+    def _finalizar(self, job_id, futuro):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["concluido_em"] = datetime.now().isoformat()
+            erro = futuro.exception()
+            if erro is None:
+                job["status"] = "CONCLUIDO"
+                job["resultado"] = futuro.result()
+            elif isinstance(erro, ErroJob):
+                job["status"] = "ERRO"
+                job["erro"] = erro.detail
+                job["status_code"] = erro.status_code
+            else:
+                job["status"] = "ERRO"
+                job["erro"] = str(erro)
+                job["status_code"] = 500
+
+    def consultar(self, job_id):
+        """Retorna uma cópia do estado do job, ou None se não existir."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            futuro = self._futuros.get(job_id)
+            if job["status"] == "PENDENTE" and futuro is not None and futuro.running():
+                job["status"] = "EXECUTANDO"
+            return dict(job)
+
+    async def executar(self, funcao, *args):
+        """Executa no pool e aguarda o resultado sem bloquear o event loop."""
+        return await asyncio.wrap_future(self._obter_pool().submit(funcao, *args))
+
+    async def acompanhar(self, job_id, intervalo=0.5):
+        """Gera o estado do job a cada mudança de status, até terminar."""
+        ultimo_status = None
+        while True:
+            job = self.consultar(job_id)
+            if job is None:
+                return
+            if job["status"] != ultimo_status:
+                ultimo_status = job["status"]
+                yield job
+            if job["status"] in ("CONCLUIDO", "ERRO"):
+                return
+            await asyncio.sleep(intervalo)
+
+    def encerrar(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
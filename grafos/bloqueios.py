@@ -0,0 +1,184 @@
+# grafos/bloqueios.py
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from grafos.matriz_distancias import grafo_para_csr, SEM_CAMINHO
+
+TAMANHO_BLOCO = 64  # Origens por bloco ao montar as dependências (limita a memória)
+
+
+def arestas_da_via(G, nome):
+    """Arestas (u, v) da rede de ruas cujo atributo name é (ou inclui) nome."""
+    arestas = set()
+    for u, v, dados in G.edges(data=True):
+        nomes = dados.get("name")
+        if nomes == nome or (isinstance(nomes, list) and nome in nomes):
+            arestas.add((u, v))
+    return sorted(arestas)
+
+
+def _dependencias(predecessores, destinos, origens):
+    """
+    Árvore reversa de caminhos mínimos restrita aos destinos: para cada origem
+    (linha de predecessores), as arestas (pai -> filho) que estão no caminho
+    até algum destino. Retorna (origem, filho, pai) ordenados por filho.
+    """
+    n = predecessores.shape[1]
+    partes = []
+    for inicio in range(0, len(predecessores), TAMANHO_BLOCO):
+        pred = predecessores[inicio:inicio + TAMANHO_BLOCO]
+        linhas = np.arange(len(pred))
+        marcado = np.zeros(pred.shape, dtype=bool)
+        o = np.repeat(linhas, len(destinos))
+        v = np.tile(destinos, len(pred))
+        fora = v != origens[inicio + o]
+        o, v = o[fora], v[fora]
+        chave = np.unique(o * n + v)
+        o, v = chave // n, chave % n
+        marcado[o, v] = True
+        while len(o):
+            p = pred[o, v]
+            tem_pai = p >= 0
+            o, v, p = o[tem_pai], v[tem_pai], p[tem_pai]
+            partes.append((o + inicio, v, p))
+            novos = ~marcado[o, p]
+            chave = np.unique(o[novos] * n + p[novos])
+            o, v = chave // n, chave % n
+            marcado[o, v] = True
+
+    if not partes:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio, vazio
+    origem, filho, pai = (np.concatenate(x).astype(np.int64) for x in zip(*partes))
+    ordem = np.argsort(filho, kind="stable")
+    return origem[ordem], filho[ordem], pai[ordem]
+
+
+class MatrizComBloqueios:
+    """
+    Matriz de distâncias entre nós OSM que aceita trechos de rua bloqueados.
+
+    A matriz base e as árvores de caminhos mínimos de cada origem são
+    calculadas uma vez. Ao bloquear arestas, só as origens cujo caminho até
+    algum destino passa por elas são recalculadas (um Dijkstra por origem
+    afetada, no grafo sem as arestas). O resultado é uma nova MatrizComBloqueios
+    que compartilha a base e guarda só as linhas alteradas (copy-on-write);
+    a base nunca é modificada.
+    """
+
+    def __init__(self, G, nodos, weight="length", sem_caminho=SEM_CAMINHO):
+        csr, indice = grafo_para_csr(G, weight)
+        self._csr_base = csr
+        self._indice = indice
+        self.sem_caminho = sem_caminho
+        posicoes = np.array([indice[no] for no in nodos], dtype=np.int64)
+        # Nós repetidos (clientes no mesmo nó) compartilham a mesma origem
+        self._origens, self._linha_da_posicao = np.unique(posicoes, return_inverse=True)
+        self._posicoes = posicoes
+
+        dist, pred = dijkstra(csr, directed=True, indices=self._origens, return_predecessors=True)
+        self._base = self._para_inteiros(dist[:, posicoes])
+        self._base.flags.writeable = False
+        self._deps = _dependencias(pred, self._origens, self._origens)
+
+        self._linhas = {}  # origem -> linha recalculada
+        self._deps_refeitas = {}  # origem -> (filho, pai) da nova árvore
+        self.bloqueadas = frozenset()
+        self._csr = csr
+
+    def _para_inteiros(self, dist):
+        dist = dist.copy()
+        dist[np.isinf(dist)] = self.sem_caminho
+        return dist.astype(np.int64)
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def _afetadas(self, u, v):
+        """Origens cujo caminho mínimo até algum destino usa a aresta u -> v."""
+        origem, filho, pai = self._deps
+        ini, fim = np.searchsorted(filho, [v, v + 1])
+        afetadas = {
+            o for o, p in zip(origem[ini:fim].tolist(), pai[ini:fim].tolist())
+            if p == u and o not in self._deps_refeitas
+        }
+        for o, (filhos, pais) in self._deps_refeitas.items():
+            if np.any((filhos == v) & (pais == u)):
+                afetadas.add(o)
+        return afetadas
+
+    def com_bloqueios(self, arestas):
+        """
+        Nova matriz com as arestas (u, v) dadas (ids de nós OSM, dirigidas)
+        também bloqueadas. Arestas que não existem no grafo são ignoradas.
+        """
+        posicoes = set()
+        for u, v in arestas:
+            pu, pv = self._indice.get(u), self._indice.get(v)
+            if pu is not None and pv is not None:
+                posicoes.add((pu, pv))
+        posicoes -= self.bloqueadas
+
+        nova = object.__new__(MatrizComBloqueios)
+        nova.__dict__.update(self.__dict__)
+        nova._linhas = dict(self._linhas)
+        nova._deps_refeitas = dict(self._deps_refeitas)
+        nova.bloqueadas = self.bloqueadas | posicoes
+        if not posicoes:
+            return nova
+
+        afetadas = set()
+        for pu, pv in posicoes:
+            afetadas |= self._afetadas(pu, pv)
+        nova._csr = self._sem_arestas(nova.bloqueadas)
+        if afetadas:
+            afetadas = np.array(sorted(afetadas), dtype=np.int64)
+            dist, pred = dijkstra(nova._csr, directed=True, indices=self._origens[afetadas],
+                                  return_predecessors=True)
+            linhas = self._para_inteiros(dist[:, self._posicoes])
+            origem, filho, pai = _dependencias(pred, self._origens, self._origens[afetadas])
+            for k, o in enumerate(afetadas.tolist()):
+                nova._linhas[o] = linhas[k]
+                da_origem = origem == k
+                nova._deps_refeitas[o] = (filho[da_origem], pai[da_origem])
+        return nova
+
+    def _sem_arestas(self, bloqueadas):
+        csr = self._csr_base
+        manter = np.ones(csr.nnz, dtype=bool)
+        for pu, pv in bloqueadas:
+            ini, fim = csr.indptr[pu], csr.indptr[pu + 1]
+            manter[ini:fim] &= csr.indices[ini:fim] != pv
+        linhas = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+        por_linha = np.bincount(linhas[manter], minlength=csr.shape[0])
+        return csr_matrix(
+            (csr.data[manter], csr.indices[manter], np.concatenate([[0], np.cumsum(por_linha)])),
+            shape=csr.shape,
+        )
+
+    @property
+    def linhas_alteradas(self):
+        """Índices (na ordem de nodos) das linhas que diferem da base."""
+        origens = set(self._linhas)
+        return [i for i, o in enumerate(self._linha_da_posicao.tolist()) if o in origens]
+
+    def linha(self, i):
+        o = self._linha_da_posicao[i]
+        linha = self._linhas.get(o)
+        linha = self._base[o] if linha is None else linha
+        linha = linha.copy()
+        linha[i] = 0
+        return linha
+
+    def valor(self, i, j):
+        return 0 if i == j else int(self.linha(i)[j])
+
+    def matriz(self):
+        """Matriz NxN (int64) com os bloqueios; cópia da base só com as linhas alteradas trocadas."""
+        matriz = self._base[self._linha_da_posicao].copy()
+        for o, linha in self._linhas.items():
+            matriz[self._linha_da_posicao == o] = linha
+        np.fill_diagonal(matriz, 0)
+        return matriz
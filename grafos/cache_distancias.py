@@ -0,0 +1,209 @@
+# grafos/cache_distancias.py
+
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from grafos.matriz_distancias import distancias_entre
+
+CAMINHO_PADRAO = "./cache/distancias.sqlite3"
+CAPACIDADE_MEMORIA = 200_000  # Pares mantidos no nível em memória (LRU)
+
+_cache = None
+_lock_global = threading.Lock()
+
+
+class CacheDistancias:
+    """
+    Cache de distâncias entre pares de nós OSM, chaveado por (u, v, versao_grafo).
+    Nível 1: LRU em memória, limitado. Nível 2: SQLite em disco.
+    Ao receber uma versão de grafo diferente, os dados da versão antiga são descartados.
+
+    Cada instância (uma por processo do pool) grava seus contadores em uma
+    linha da tabela estatisticas do mesmo banco; estatisticas() soma as linhas
+    de todos os processos que usam o arquivo.
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO, capacidade_memoria=CAPACIDADE_MEMORIA):
+        self.caminho = caminho
+        self.capacidade_memoria = capacidade_memoria
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._versao = None
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self._instancia = uuid.uuid4().hex
+
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS distancias (
+                u INTEGER NOT NULL,
+                v INTEGER NOT NULL,
+                versao TEXT NOT NULL,
+                distancia INTEGER NOT NULL,
+                PRIMARY KEY (versao, u, v)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS estatisticas (
+                instancia TEXT PRIMARY KEY,
+                versao TEXT,
+                pares_em_memoria INTEGER NOT NULL,
+                hits_memoria INTEGER NOT NULL,
+                hits_disco INTEGER NOT NULL,
+                misses INTEGER NOT NULL,
+                atualizado_em REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def _garantir_versao(self, versao):
+        # Chamado com o lock adquirido
+        if versao == self._versao:
+            return
+        self._memoria.clear()
+        self._conn.execute("DELETE FROM distancias WHERE versao != ?", (versao,))
+        self._conn.commit()
+        self._versao = versao
+
+    def _registrar_estatisticas(self):
+        # Chamado com o lock adquirido; o commit fica com quem chama
+        self._conn.execute(
+            "INSERT OR REPLACE INTO estatisticas VALUES (?, ?, ?, ?, ?, ?, julianday('now'))",
+            (self._instancia, self._versao, len(self._memoria), self.hits_memoria, self.hits_disco, self.misses),
+        )
+
+    def _lembrar(self, chave, distancia):
+        self._memoria[chave] = distancia
+        self._memoria.move_to_end(chave)
+        if len(self._memoria) > self.capacidade_memoria:
+            self._memoria.popitem(last=False)
+
+    def obter(self, pares, versao):
+        """Retorna {(u, v): distancia} para os pares encontrados em memória ou disco."""
+        encontrados = {}
+        with self._lock:
+            self._garantir_versao(versao)
+            faltando = []
+            for u, v in pares:
+                chave = (u, v, versao)
+                if chave in self._memoria:
+                    self._memoria.move_to_end(chave)
+                    encontrados[(u, v)] = self._memoria[chave]
+                    self.hits_memoria += 1
+                else:
+                    faltando.append((u, v))
+
+            if faltando:
+                procurados = set(faltando)
+                origens = sorted({u for u, _ in faltando})
+                for inicio in range(0, len(origens), 500):
+                    bloco = origens[inicio:inicio + 500]
+                    marcadores = ",".join("?" * len(bloco))
+                    linhas = self._conn.execute(
+                        f"SELECT u, v, distancia FROM distancias WHERE versao = ? AND u IN ({marcadores})",
+                        (versao, *bloco),
+                    )
+                    for u, v, distancia in linhas:
+                        if (u, v) in procurados:
+                            encontrados[(u, v)] = distancia
+                            self._lembrar((u, v, versao), distancia)
+                            self.hits_disco += 1
+                self.misses += len(procurados) - sum(1 for par in procurados if par in encontrados)
+            self._registrar_estatisticas()
+            self._conn.commit()
+        return encontrados
+
+    def gravar(self, distancias, versao):
+        """Grava {(u, v): distancia} nos dois níveis."""
+        with self._lock:
+            self._garantir_versao(versao)
+            for (u, v), distancia in distancias.items():
+                self._lembrar((u, v, versao), distancia)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO distancias (u, v, versao, distancia) VALUES (?, ?, ?, ?)",
+                ((u, v, versao, distancia) for (u, v), distancia in distancias.items()),
+            )
+            self._registrar_estatisticas()
+            self._conn.commit()
+
+    def limpar(self):
+        with self._lock:
+            self._memoria.clear()
+            self._conn.execute("DELETE FROM distancias")
+            self._conn.execute("DELETE FROM estatisticas")
+            self._conn.commit()
+            self._versao = None
+            self.hits_memoria = self.hits_disco = self.misses = 0
+
+    def estatisticas(self):
+        """
+        Contadores somados de todos os processos que usam este banco (os solves
+        rodam nos workers do pool, não no processo da API). versao_grafo é a do
+        processo que usou o cache por último.
+        """
+        with self._lock:
+            versao, processos, pares, hits_memoria, hits_disco, misses = self._conn.execute(
+                """SELECT (SELECT versao FROM estatisticas ORDER BY atualizado_em DESC LIMIT 1),
+                          COUNT(*), COALESCE(SUM(pares_em_memoria), 0), COALESCE(SUM(hits_memoria), 0),
+                          COALESCE(SUM(hits_disco), 0), COALESCE(SUM(misses), 0)
+                   FROM estatisticas"""
+            ).fetchone()
+        consultas = hits_memoria + hits_disco + misses
+        return {
+            "versao_grafo": versao,
+            "processos": processos,
+            "pares_em_memoria": pares,
+            "capacidade_memoria": self.capacidade_memoria,
+            "hits_memoria": hits_memoria,
+            "hits_disco": hits_disco,
+            "misses": misses,
+            "taxa_acerto": (hits_memoria + hits_disco) / consultas if consultas else 0.0,
+        }
+
+
+def matriz_com_cache(cache, G, nodos, versao, weight="length"):
+    """
+    Matriz NxN usando o cache: só as origens com algum par faltando passam pelo
+    Dijkstra, e os resultados calculados são gravados no cache.
+    """
+    unicos = list(dict.fromkeys(int(no) for no in nodos))
+    pares = [(u, v) for u in unicos for v in unicos if u != v]
+    conhecidas = cache.obter(pares, versao)
+
+    origens_faltando = list(dict.fromkeys(u for u, v in pares if (u, v) not in conhecidas))
+    if origens_faltando:
+        calculadas = distancias_entre(G, origens_faltando, unicos, weight)
+        novas = {
+            (u, v): int(calculadas[i, j])
+            for i, u in enumerate(origens_faltando)
+            for j, v in enumerate(unicos)
+            if u != v
+        }
+        cache.gravar(novas, versao)
+        conhecidas.update(novas)
+
+    n = len(nodos)
+    matriz = np.zeros((n, n), dtype=np.int64)
+    for i, u in enumerate(nodos):
+        for j, v in enumerate(nodos):
+            if u != v:
+                matriz[i, j] = conhecidas[(int(u), int(v))]
+    return matriz
+
+
+def obter_cache_distancias():
+    """Instância compartilhada do cache (criada na primeira utilização)."""
+    global _cache
+    with _lock_global:
+        if _cache is None:
+            _cache = CacheDistancias()
+        return _cache
@@ -2,6 +2,8 @@ import osmnx as ox
 import json
 import matplotlib.pyplot as plt
 from grafos.carregador import carregar_rede
+from grafos.grafo_osm import inicializar_grafo, versao_grafo
+from grafos.snapping import obter_snapper
 
 def atualizar_coordenadas_no_json(caminho_json):
     """
@@ -10,15 +12,22 @@ def atualizar_coordenadas_no_json(caminho_json):
     """
     nodos, rotas = carregar_rede(caminho_json)
 
-    print("📍 Buscando rede de ruas de Maceió, Brazil via OSMnx...")
-    G = ox.graph_from_place('Maceió, Brazil', network_type='drive')
+    print("📍 Carregando rede de ruas de Maceió, Brazil (snapshot local)...")
+    G = inicializar_grafo()
 
+    com_coordenadas = []
     for nodo in nodos:
         if nodo.latitude is None or nodo.longitude is None:
             print(f"⚠️ Nodo {nodo.id} não possui coordenadas, pulando associação.")
             continue
+        com_coordenadas.append(nodo)
 
-        nodo_nearest = ox.distance.nearest_nodes(G, nodo.longitude, nodo.latitude)
+    # Uma única consulta vetorizada para todos os nodos
+    mais_proximos = obter_snapper(G, versao_grafo()).nos_mais_proximos(
+        [nodo.latitude for nodo in com_coordenadas],
+        [nodo.longitude for nodo in com_coordenadas],
+    )
+    for nodo, nodo_nearest in zip(com_coordenadas, mais_proximos.tolist()):
         nodo.id_nodo_osm = nodo_nearest
         nodo.latitude = G.nodes[nodo_nearest]['y']
         nodo.longitude = G.nodes[nodo_nearest]['x']
@@ -58,7 +67,7 @@ def visualizar_nodos_com_osm(caminho_json):
     Útil para validar se os nodos foram corretamente associados a pontos reais.
     """
     print("🗺️ Carregando rede de Maceió e nodos do JSON para visualização...")
-    G = ox.graph_from_place('Maceió, Brazil', network_type='drive')
+    G = inicializar_grafo()
     
     with open(caminho_json, encoding='utf-8') as f:
         dados = json.load(f)
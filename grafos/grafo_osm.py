@@ -0,0 +1,124 @@
+# grafos/grafo_osm.py
+
+import json
+import os
+import threading
+from datetime import datetime
+
+import osmnx as ox
+
+LUGAR_PADRAO = "Maceió, Brazil"
+TIPO_REDE = "drive"
+DIRETORIO_SNAPSHOTS = "./cache/grafos"
+ARQUIVO_MANIFESTO = "atual.json"
+
+_lock = threading.Lock()
+_grafo = None
+_versao = None
+
+
+def _caminho_manifesto(diretorio):
+    return os.path.join(diretorio, ARQUIVO_MANIFESTO)
+
+
+def _ler_manifesto(diretorio):
+    try:
+        with open(_caminho_manifesto(diretorio), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def baixar_snapshot(lugar=LUGAR_PADRAO, diretorio=DIRETORIO_SNAPSHOTS):
+    """
+    Baixa a rede de ruas via OSMnx e grava um novo snapshot GraphML versionado.
+    O manifesto 'atual.json' passa a apontar para a nova versão.
+    Retorna (grafo, versao).
+    """
+    print(f"📍 Baixando rede de ruas de {lugar} via OSMnx para novo snapshot...")
+    G = ox.graph_from_place(lugar, network_type=TIPO_REDE)
+
+    os.makedirs(diretorio, exist_ok=True)
+    versao = datetime.now().strftime("%Y%m%dT%H%M%S")
+    arquivo = f"rede_{TIPO_REDE}_{versao}.graphml"
+    ox.save_graphml(G, os.path.join(diretorio, arquivo))
+
+    manifesto = {"versao": versao, "arquivo": arquivo, "lugar": lugar}
+    caminho_tmp = _caminho_manifesto(diretorio) + ".tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, indent=4, ensure_ascii=False)
+    os.replace(caminho_tmp, _caminho_manifesto(diretorio))
+
+    print(f"✅ Snapshot {versao} salvo em {diretorio}/{arquivo}")
+    return G, versao
+
+
+def carregar_snapshot(diretorio=DIRETORIO_SNAPSHOTS):
+    """
+    Carrega o snapshot indicado pelo manifesto. Retorna (grafo, versao) ou
+    (None, None) se ainda não existir nenhum snapshot local.
+    """
+    manifesto = _ler_manifesto(diretorio)
+    if not manifesto:
+        return None, None
+    caminho = os.path.join(diretorio, manifesto["arquivo"])
+    if not os.path.exists(caminho):
+        return None, None
+    print(f"📦 Carregando snapshot da rede de ruas ({manifesto['versao']})...")
+    return ox.load_graphml(caminho), manifesto["versao"]
+
+
+def inicializar_grafo(diretorio=DIRETORIO_SNAPSHOTS, lugar=LUGAR_PADRAO):
+    """
+    Carrega o grafo compartilhado na memória uma única vez (startup).
+    Se não houver snapshot local, baixa o primeiro.
+    """
+    global _grafo, _versao
+    with _lock:
+        if _grafo is not None:
+            return _grafo
+        G, versao = carregar_snapshot(diretorio)
+        if G is None:
+            G, versao = baixar_snapshot(lugar, diretorio)
+        _grafo, _versao = G, versao
+        return _grafo
+
+
+def atualizar_grafo(diretorio=DIRETORIO_SNAPSHOTS, lugar=LUGAR_PADRAO):
+    """
+    Ação administrativa: baixa um novo snapshot e troca o grafo em memória.
+    Requisições em andamento continuam usando a referência antiga.
+    """
+    global _grafo, _versao
+    G, versao = baixar_snapshot(lugar, diretorio)
+    with _lock:
+        _grafo, _versao = G, versao
+    return versao
+
+
+def sincronizar_grafo(versao, diretorio=DIRETORIO_SNAPSHOTS):
+    """
+    Garante que este processo usa a versão indicada do snapshot (ex.: processos
+    do pool de otimização após uma atualização feita pelo processo da API).
+    """
+    global _grafo, _versao
+    if versao is None or versao == _versao:
+        return _grafo
+    with _lock:
+        G, versao_disco = carregar_snapshot(diretorio)
+        if G is not None:
+            _grafo, _versao = G, versao_disco
+        return _grafo
+
+
+def obter_grafo():
+    """Retorna o grafo em memória. Nunca constrói a rede no caminho da requisição."""
+    if _grafo is None:
+        raise RuntimeError(
+            "Grafo de ruas não carregado. Inicialize com inicializar_grafo() ou atualize o snapshot."
+        )
+    return _grafo
+
+
+def versao_grafo():
+    return _versao
@@ -0,0 +1,172 @@
+# grafos/indice_rotas.py
+
+import json
+import os
+import threading
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from grafos.matriz_distancias import grafo_para_csr, SEM_CAMINHO
+from grafos.snapping import obter_snapper
+
+DIRETORIO_INDICES = "./cache/grafos"
+
+_lock = threading.Lock()
+_indice = None
+_origem_indice = None  # (caminho, mtime_ns, tamanho) do arquivo de onde _indice veio
+
+
+class IndiceRotas:
+    """
+    Índice pré-calculado de distâncias entre os nós OSM dos clientes conhecidos.
+    A tabela muitos-para-muitos é calculada uma vez (pré-processamento) e as
+    consultas viram acessos diretos a um array NumPy.
+    """
+
+    def __init__(self, nos, distancias, versao_grafo=None):
+        self.nos = np.asarray(nos, dtype=np.int64)
+        self.distancias = distancias
+        self.versao_grafo = versao_grafo
+        self._posicao = {int(no): i for i, no in enumerate(self.nos)}
+
+    @classmethod
+    def construir(cls, G, nos, weight="length", versao_grafo=None, tamanho_bloco=256):
+        """Roda o Dijkstra multi-origem em blocos para limitar o uso de memória."""
+        nos = list(dict.fromkeys(int(no) for no in nos))
+        csr, indice = grafo_para_csr(G, weight)
+        posicoes = np.array([indice[no] for no in nos], dtype=np.int64)
+
+        distancias = np.empty((len(nos), len(nos)), dtype=np.int32)
+        for inicio in range(0, len(nos), tamanho_bloco):
+            bloco = posicoes[inicio:inicio + tamanho_bloco]
+            dist = dijkstra(csr, directed=True, indices=bloco)[:, posicoes]
+            dist[np.isinf(dist)] = SEM_CAMINHO
+            distancias[inicio:inicio + len(bloco)] = dist.astype(np.int32)
+        return cls(nos, distancias, versao_grafo)
+
+    def salvar(self, caminho):
+        # Temporário + os.replace: os workers podem recarregar o arquivo a qualquer momento
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho + ".tmp", "wb") as f:
+            np.savez(
+                f,
+                nos=self.nos,
+                distancias=self.distancias,
+                versao_grafo=np.array(self.versao_grafo or ""),
+            )
+        os.replace(caminho + ".tmp", caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as dados:
+            versao = str(dados["versao_grafo"]) or None
+            return cls(dados["nos"], dados["distancias"], versao)
+
+    def contem(self, nos):
+        return all(int(no) in self._posicao for no in nos)
+
+    def distancia(self, u, v):
+        return int(self.distancias[self._posicao[int(u)], self._posicao[int(v)]])
+
+    def matriz(self, nos):
+        """Submatriz NxN (int64) para os nós pedidos, na ordem recebida."""
+        posicoes = np.array([self._posicao[int(no)] for no in nos], dtype=np.int64)
+        return self.distancias[np.ix_(posicoes, posicoes)].astype(np.int64)
+
+
+def caminho_indice(versao_grafo, diretorio=DIRETORIO_INDICES):
+    return os.path.join(diretorio, f"indice_rotas_{versao_grafo}.npz")
+
+
+def nos_dos_clientes(G, versao_grafo, caminho_clientes=None):
+    """
+    Nós OSM mais próximos de todos os clientes com coordenadas, lidos do
+    armazenamento configurado em data_storage ou do JSON em caminho_clientes.
+    """
+    if caminho_clientes is None:
+        import data_storage
+
+        clientes, _ = data_storage.listar_clientes()
+    else:
+        with open(caminho_clientes, "r", encoding="utf-8") as f:
+            clientes = json.load(f)
+    com_coordenadas = [
+        c for c in clientes
+        if c.get("latitude") is not None and c.get("longitude") is not None
+    ]
+    return obter_snapper(G, versao_grafo).nos_dos_clientes(
+        [c["id"] for c in com_coordenadas],
+        [c["latitude"] for c in com_coordenadas],
+        [c["longitude"] for c in com_coordenadas],
+    )
+
+
+def construir_indice_clientes(G, versao_grafo, caminho_clientes=None,
+                              diretorio=DIRETORIO_INDICES):
+    """
+    Pré-processamento: constrói o índice para os clientes cadastrados, salva em
+    disco e passa a usá-lo nas consultas.
+    """
+    print("🧭 Construindo índice de rotas para os clientes cadastrados...")
+    indice = IndiceRotas.construir(G, nos_dos_clientes(G, versao_grafo, caminho_clientes), versao_grafo=versao_grafo)
+    caminho = caminho_indice(versao_grafo, diretorio)
+    indice.salvar(caminho)
+    definir_indice(indice, _origem(caminho))
+    print(f"✅ Índice com {len(indice.nos)} nós salvo para o grafo {versao_grafo}.")
+    return indice
+
+
+def _origem(caminho):
+    estado = os.stat(caminho)
+    return caminho, estado.st_mtime_ns, estado.st_size
+
+
+def carregar_indice(versao_grafo, diretorio=DIRETORIO_INDICES):
+    """Carrega o índice salvo para a versão do grafo, se existir."""
+    caminho = caminho_indice(versao_grafo, diretorio)
+    try:
+        origem = _origem(caminho)
+    except FileNotFoundError:
+        return None
+    indice = IndiceRotas.carregar(caminho)
+    definir_indice(indice, origem)
+    return indice
+
+
+def sincronizar_indice(versao_grafo, diretorio=DIRETORIO_INDICES):
+    """
+    Índice da versão do grafo, recarregado do disco se o arquivo mudou desde a
+    última leitura (outro processo o reconstruiu). Usado pelos workers do pool
+    antes de cada solve; sem arquivo salvo, fica o que já estiver em memória.
+    """
+    caminho = caminho_indice(versao_grafo, diretorio)
+    try:
+        origem = _origem(caminho)
+    except FileNotFoundError:
+        return obter_indice(versao_grafo)
+    if origem == _origem_indice and obter_indice(versao_grafo) is not None:
+        return _indice
+    return carregar_indice(versao_grafo, diretorio)
+
+
+def definir_indice(indice, origem=None):
+    global _indice, _origem_indice
+    with _lock:
+        _indice = indice
+        _origem_indice = origem
+
+
+def obter_indice(versao_grafo):
+    """Índice em memória, somente se foi construído para a versão atual do grafo."""
+    indice = _indice
+    if indice is None or indice.versao_grafo != versao_grafo:
+        return None
+    return indice
+
+
+if __name__ == "__main__":
+    from grafos.grafo_osm import inicializar_grafo, versao_grafo
+
+    grafo = inicializar_grafo()
+    construir_indice_clientes(grafo, versao_grafo())
@@ -0,0 +1,231 @@
+# grafos/matriz_distancias.py
+
+import weakref
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+SEM_CAMINHO = 999999999  # Valor usado quando não existe caminho entre dois nós
+VELOCIDADE_PADRAO_KMH = 30  # Vias sem maxspeed nem travel_time
+TAMANHO_BLOCO = 32  # Origens por bloco ao somar os tempos nos caminhos (limita a memória)
+
+_cache_csr = weakref.WeakKeyDictionary()
+
+
+def grafo_para_csr(G, weight="length"):
+    """
+    Converte um grafo networkx em matriz de adjacência CSR (scipy).
+    Arestas paralelas ficam com o menor peso, como no networkx.
+    Retorna (csr, indice) onde indice mapeia nó -> posição na matriz.
+    """
+    csr, _, indice = _csr_do_grafo(G, weight, com_tempos=False)
+    return csr, indice
+
+
+def grafo_para_csr_com_tempos(G, weight="length"):
+    """
+    Como grafo_para_csr, mais uma CSR com a mesma estrutura cujo valor é o
+    tempo de viagem (s) da aresta escolhida para cada par (ver tempo_da_aresta).
+    Retorna (csr, tempos, indice).
+    """
+    return _csr_do_grafo(G, weight, com_tempos=True)
+
+
+def _velocidade_kmh(maxspeed):
+    """Velocidade (km/h) a partir do maxspeed do OSM ("60", "40 mph", listas); None se não der para ler."""
+    if isinstance(maxspeed, (list, tuple)):
+        velocidades = [v for v in (_velocidade_kmh(m) for m in maxspeed) if v]
+        return min(velocidades) if velocidades else None
+    if isinstance(maxspeed, (int, float)):
+        return float(maxspeed) if maxspeed > 0 else None
+    if not isinstance(maxspeed, str):
+        return None
+    partes = maxspeed.strip().split()
+    try:
+        velocidade = float(partes[0])
+    except (IndexError, ValueError):
+        return None
+    if len(partes) > 1 and partes[1].lower() == "mph":
+        velocidade *= 1.609344
+    return velocidade if velocidade > 0 else None
+
+
+def tempo_da_aresta(dados):
+    """
+    Tempo de viagem (s) de uma aresta do OSM: travel_time, se o grafo já tem
+    (osmnx.add_edge_travel_times), ou length / maxspeed, com VELOCIDADE_PADRAO_KMH
+    quando a via não informa a velocidade.
+    """
+    if dados.get("travel_time") is not None:
+        return float(dados["travel_time"])
+    velocidade = _velocidade_kmh(dados.get("maxspeed")) or VELOCIDADE_PADRAO_KMH
+    return float(dados.get("length", 0)) * 3.6 / velocidade
+
+
+def _csr_do_grafo(G, weight, com_tempos):
+    assinatura = (G.number_of_nodes(), G.number_of_edges())
+    por_peso = _cache_csr.get(G)
+    if por_peso and weight in por_peso and por_peso[weight][0] == assinatura:
+        _, csr, tempos, indice = por_peso[weight]
+        if tempos is not None or not com_tempos:
+            return csr, tempos, indice
+
+    nos = list(G.nodes)
+    indice = {no: i for i, no in enumerate(nos)}
+    n = len(nos)
+
+    arestas = [
+        (indice[u], indice[v], dados.get(weight, 1), tempo_da_aresta(dados) if com_tempos else 0.0)
+        for u, v, dados in G.edges(data=True)
+        if u != v
+    ]
+    if arestas:
+        linhas, colunas, pesos, segundos = (np.array(x) for x in zip(*arestas))
+        pesos = pesos.astype(np.float64)
+        segundos = segundos.astype(np.float64)
+    else:
+        linhas = colunas = np.empty(0, dtype=np.int64)
+        pesos = segundos = np.empty(0, dtype=np.float64)
+
+    if not G.is_directed():
+        linhas, colunas = np.concatenate([linhas, colunas]), np.concatenate([colunas, linhas])
+        pesos = np.concatenate([pesos, pesos])
+        segundos = np.concatenate([segundos, segundos])
+
+    # Mantém somente a aresta de menor peso para cada par (u, v)
+    ordem = np.lexsort((pesos, colunas, linhas))
+    linhas, colunas, pesos, segundos = linhas[ordem], colunas[ordem], pesos[ordem], segundos[ordem]
+    primeiro = np.ones(len(linhas), dtype=bool)
+    primeiro[1:] = (linhas[1:] != linhas[:-1]) | (colunas[1:] != colunas[:-1])
+
+    csr = csr_matrix(
+        (pesos[primeiro], (linhas[primeiro], colunas[primeiro])), shape=(n, n)
+    )
+    tempos = None
+    if com_tempos:
+        # Pares (u, v) únicos e já ordenados: csr.data segue a mesma ordem
+        tempos = csr.copy()
+        tempos.data = segundos[primeiro]
+    _cache_csr.setdefault(G, {})[weight] = (assinatura, csr, tempos, indice)
+    return csr, tempos, indice
+
+
+def distancias_entre(G, origens, destinos, weight="length", sem_caminho=SEM_CAMINHO):
+    """
+    Matriz len(origens) x len(destinos) de menores distâncias, truncadas para
+    inteiro. Roda um único Dijkstra (scipy csgraph) com todas as origens
+    distintas, em vez de um shortest_path_length por par.
+    Se sem_caminho for None, a ausência de caminho levanta nx.NetworkXNoPath.
+    """
+    if len(origens) == 0 or len(destinos) == 0:
+        return np.zeros((len(origens), len(destinos)), dtype=np.int64)
+
+    csr, indice = grafo_para_csr(G, weight)
+    for no in list(origens) + list(destinos):
+        if no not in indice:
+            raise nx.NodeNotFound(f"Nó {no} não está no grafo")
+
+    pos_origens = np.array([indice[no] for no in origens], dtype=np.int64)
+    pos_destinos = np.array([indice[no] for no in destinos], dtype=np.int64)
+    unicas, inversa = np.unique(pos_origens, return_inverse=True)
+    dist = dijkstra(csr, directed=True, indices=unicas)
+    bruta = dist[inversa][:, pos_destinos]
+
+    sem_rota = np.isinf(bruta)
+    if sem_rota.any():
+        if sem_caminho is None:
+            i, j = np.argwhere(sem_rota)[0]
+            raise nx.NetworkXNoPath(f"Sem caminho entre {origens[i]} e {destinos[j]}")
+        bruta[sem_rota] = sem_caminho
+    return bruta.astype(np.int64)
+
+
+def matriz_distancias(G, nodos, weight="length", sem_caminho=SEM_CAMINHO):
+    """Matriz NxN de menores distâncias entre os nodos (diagonal zero)."""
+    matriz = distancias_entre(G, nodos, nodos, weight, sem_caminho)
+    np.fill_diagonal(matriz, 0)
+    return matriz
+
+
+def _arestas_de_entrada(tempos):
+    """
+    Para cada nó, os pais possíveis (origens das arestas que chegam nele) e o
+    tempo de cada aresta, em colunas completadas com -1 / 0 até o maior grau.
+    """
+    entrada = tempos.T.tocsr()
+    n = entrada.shape[0]
+    grau = np.diff(entrada.indptr)
+    linha = np.repeat(np.arange(n), grau)
+    coluna = np.arange(entrada.nnz) - np.repeat(entrada.indptr[:-1], grau)
+    largura = int(grau.max()) if n and entrada.nnz else 0
+    pais = np.full((n, largura), -1, dtype=np.int64)
+    segundos = np.zeros((n, largura), dtype=np.float64)
+    pais[linha, coluna] = entrada.indices
+    segundos[linha, coluna] = entrada.data
+    return pais, segundos
+
+
+def _tempos_nos_caminhos(predecessores, tempos, pos_destinos):
+    """
+    Tempo (s) de cada origem (linha de predecessores) até cada destino, somado
+    ao longo do mesmo caminho mínimo que deu a distância (árvore do Dijkstra).
+    Por bloco de origens: o tempo da aresta que chega em cada nó da árvore sai
+    de uma comparação vetorizada com os pais possíveis, e depois todos os
+    destinos sobem juntos até a origem, uma aresta por iteração.
+    """
+    n = tempos.shape[0]
+    pais, segundos = _arestas_de_entrada(tempos)
+    resultado = np.zeros((len(predecessores), len(pos_destinos)), dtype=np.float64)
+    for inicio in range(0, len(predecessores), TAMANHO_BLOCO):
+        pred = predecessores[inicio:inicio + TAMANHO_BLOCO]
+        entrada = np.zeros(pred.shape, dtype=np.float64)
+        for k in range(pais.shape[1]):
+            entrada += np.where(pais[:, k] == pred, segundos[:, k], 0.0)
+        pred, entrada = pred.ravel(), entrada.ravel()
+
+        base = np.repeat(np.arange(len(pred) // n, dtype=np.int64) * n, len(pos_destinos))
+        total = np.zeros(len(base), dtype=np.float64)
+        ativos = np.arange(len(base))
+        posicao = base + np.tile(pos_destinos, len(pred) // n)
+        while len(ativos):
+            total[ativos] += entrada[posicao]
+            pai = pred[posicao]
+            vivos = pai >= 0
+            ativos = ativos[vivos]
+            posicao = base[ativos] + pai[vivos]
+        resultado[inicio:inicio + TAMANHO_BLOCO] = total.reshape(-1, len(pos_destinos))
+    return resultado
+
+
+def matriz_distancias_e_tempos(G, nodos, weight="length", sem_caminho=SEM_CAMINHO):
+    """
+    Matrizes NxN de distância (weight) e de tempo de viagem (s, inteiros) entre
+    os nodos, no mesmo Dijkstra: o tempo é o do caminho de menor distância,
+    somado pela árvore de predecessores, sem um segundo cálculo de rotas.
+    Pares sem caminho ficam com sem_caminho nas duas matrizes.
+    """
+    n = len(nodos)
+    if n == 0:
+        vazia = np.zeros((0, 0), dtype=np.int64)
+        return vazia, vazia.copy()
+
+    csr, tempos, indice = grafo_para_csr_com_tempos(G, weight)
+    for no in nodos:
+        if no not in indice:
+            raise nx.NodeNotFound(f"Nó {no} não está no grafo")
+
+    posicoes = np.array([indice[no] for no in nodos], dtype=np.int64)
+    unicas, inversa = np.unique(posicoes, return_inverse=True)
+    dist, pred = dijkstra(csr, directed=True, indices=unicas, return_predecessors=True)
+    distancias = dist[inversa][:, posicoes]
+    segundos = _tempos_nos_caminhos(pred, tempos, posicoes)[inversa]
+
+    sem_rota = np.isinf(distancias)
+    distancias[sem_rota] = sem_caminho
+    segundos[sem_rota] = sem_caminho
+    distancias, segundos = distancias.astype(np.int64), np.rint(segundos).astype(np.int64)
+    np.fill_diagonal(distancias, 0)
+    np.fill_diagonal(segundos, 0)
+    return distancias, segundos
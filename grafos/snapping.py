@@ -0,0 +1,74 @@
+# grafos/snapping.py
+
+import threading
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+_lock = threading.Lock()
+_snapper = None
+
+
+def _para_esfera(latitudes, longitudes):
+    """
+    Converte lat/lon (graus) em pontos 3D na esfera unitária. A distância
+    euclidiana (corda) cresce junto com a distância haversine, então o vizinho
+    mais próximo na KD-tree é o mesmo do cálculo geodésico.
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+class SnapperNos:
+    """
+    Associa coordenadas ao nó OSM mais próximo usando uma cKDTree construída
+    uma vez sobre todos os nós do grafo. Consultas são feitas em lote e o nó de
+    cada cliente fica memorizado pelo id (enquanto as coordenadas não mudarem).
+    """
+
+    def __init__(self, G, versao_grafo=None):
+        nos = list(G.nodes)
+        self.versao_grafo = versao_grafo
+        self.nos = np.array(nos)
+        self._arvore = cKDTree(
+            _para_esfera([G.nodes[n]["y"] for n in nos], [G.nodes[n]["x"] for n in nos])
+        )
+        self._por_cliente = {}
+
+    def nos_mais_proximos(self, latitudes, longitudes):
+        """Nós mais próximos para arrays inteiros de lat/lon, em uma única consulta."""
+        if len(latitudes) == 0:
+            return self.nos[:0]
+        _, posicoes = self._arvore.query(_para_esfera(latitudes, longitudes))
+        return self.nos[posicoes]
+
+    def nos_dos_clientes(self, ids, latitudes, longitudes):
+        """Como nos_mais_proximos, reaproveitando o nó já calculado para cada cliente."""
+        resultado = [None] * len(ids)
+        pendentes = []
+        for i, (cliente_id, lat, lon) in enumerate(zip(ids, latitudes, longitudes)):
+            memorizado = self._por_cliente.get(cliente_id)
+            if memorizado is not None and memorizado[0] == lat and memorizado[1] == lon:
+                resultado[i] = memorizado[2]
+            else:
+                pendentes.append(i)
+
+        if pendentes:
+            novos = self.nos_mais_proximos(
+                [latitudes[i] for i in pendentes], [longitudes[i] for i in pendentes]
+            )
+            for i, no in zip(pendentes, novos.tolist()):
+                self._por_cliente[ids[i]] = (latitudes[i], longitudes[i], no)
+                resultado[i] = no
+        return resultado
+
+
+def obter_snapper(G, versao_grafo):
+    """Snapper compartilhado; é reconstruído quando o snapshot do grafo muda."""
+    global _snapper
+    with _lock:
+        if _snapper is None or _snapper.versao_grafo != versao_grafo:
+            _snapper = SnapperNos(G, versao_grafo)
+        return _snapper
@@ -4,6 +4,7 @@ from ortools.constraint_solver import pywrapcp
 import networkx as nx
 import osmnx as ox
 from grafos.coordenadas_osm import atualizar_coordenadas_no_json
+from grafos.matriz_distancias import matriz_distancias
 
 from simulador.simulador import simular_bloqueio_rotas, simular_aumento_demanda, criar_modelo_vrp
 from simulador.relatorio import gerar_relatorio
@@ -66,16 +67,8 @@ def gerar_matriz_distancias(pedidos, penalidade_zona=10):
                 distancia = base_distancia + penalidade
                 G.add_edge(i, j, weight=distancia)
 
-    matriz = []
-    for i in range(n):
-        linha = []
-        for j in range(n):
-            if i == j:
-                linha.append(0)
-            else:
-                linha.append(nx.shortest_path_length(G, i, j, weight='weight'))
-        matriz.append(linha)
-    return matriz
+    G.add_nodes_from(range(n))
+    return matriz_distancias(G, list(range(n)), weight='weight').tolist()
 
 def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, zonas_pedidos, veiculos, deposito=0, max_zonas_por_veiculo=2):
     data = {
@@ -91,21 +84,12 @@ def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, zon
 
     routing = pywrapcp.RoutingModel(manager)
 
-    # Distância
-    def distancia_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        return data['distance_matrix'][from_node][to_node]
-
-    transit_callback_index = routing.RegisterTransitCallback(distancia_callback)
+    # Distância (matriz registrada no OR-Tools, avaliada em C++)
+    transit_callback_index = routing.RegisterTransitMatrix(data['distance_matrix'])
     routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
     # Demandas
-    def demanda_callback(from_index):
-        from_node = manager.IndexToNode(from_index)
-        return data['demands'][from_node]
-
-    demanda_callback_index = routing.RegisterUnaryTransitCallback(demanda_callback)
+    demanda_callback_index = routing.RegisterUnaryTransitVector(data['demands'])
     routing.AddDimensionWithVehicleCapacity(
         demanda_callback_index,
         0,
@@ -114,10 +98,7 @@ def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, zon
         'Capacity')
 
     # Limitar número máximo de entregas para 10 pedidos por veículo
-    def entrega_callback(from_index):
-        return 1
-
-    entrega_callback_index = routing.RegisterUnaryTransitCallback(entrega_callback)
+    entrega_callback_index = routing.RegisterUnaryTransitVector([1] * len(data['distance_matrix']))
     routing.AddDimension(
         entrega_callback_index,
         0,
@@ -129,12 +110,7 @@ def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, zon
     # Atribuir para cada nó o índice da zona como "custo"
     zonas_indices = {zona: idx for idx, zona in enumerate(sorted(set(zonas_pedidos)))}
 
-    def zona_callback(from_index):
-        from_node = manager.IndexToNode(from_index)
-        zona = zonas_pedidos[from_node]
-        return zonas_indices[zona]
-
-    zona_callback_index = routing.RegisterUnaryTransitCallback(zona_callback)
+    zona_callback_index = routing.RegisterUnaryTransitVector([zonas_indices[z] for z in zonas_pedidos])
 
     routing.AddDimension(
         zona_callback_index,
@@ -154,16 +130,9 @@ def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, zon
         if veiculos[vehicle_id].zonas_permitidas:
             allowed_zonas_indices = [zonas_indices[z] for z in veiculos[vehicle_id].zonas_permitidas if z in zonas_indices]
 
-            # Criar uma callback para verificar se o nó está em zona permitida
-            def zona_veiculo_callback(from_index, v_id=vehicle_id):
-                from_node = manager.IndexToNode(from_index)
-                zona = zonas_pedidos[from_node]
-                if zonas_indices[zona] in allowed_zonas_indices:
-                    return 0  # custo zero para zonas permitidas
-                else:
-                    return 1000000  # penalidade alta para zona proibida
-
-            callback_index = routing.RegisterUnaryTransitCallback(zona_veiculo_callback)
+            # Custo por nó: zero para zonas permitidas, penalidade alta para zona proibida
+            custos_zona = [0 if zonas_indices[z] in allowed_zonas_indices else 1000000 for z in zonas_pedidos]
+            callback_index = routing.RegisterUnaryTransitVector(custos_zona)
             routing.SetFixedCostOfVehicle(0, vehicle_id)
             routing.AddDisjunction([manager.NodeToIndex(i) for i in range(len(zonas_pedidos))], 0)
             routing.SetArcCostEvaluatorOfVehicle(callback_index, vehicle_id)
@@ -1,66 +1,53 @@
 # main_api.py
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator, model_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum as PyEnum
 
-# Importando suas dependências existentes
-from ortools.constraint_solver import routing_enums_pb2
-from ortools.constraint_solver import pywrapcp
-import networkx as nx
-import osmnx as ox
+from contextlib import asynccontextmanager
 
 # Importar o módulo json para ler arquivos JSON
 import json
+import time
+from types import SimpleNamespace
 
-#  Importando suas classes originais e enums da pasta 'models'
-from models.enums import (
-    StatusPedido as OriginalStatusPedido,
-    TipoVeiculo as OriginalTipoVeiculo,
-)
-from models.cliente import Cliente as OriginalCliente
-from models.pedido import Pedido as OriginalPedido
-from models.veiculo import Veiculo as OriginalVeiculo
-
-
-#  Placeholder para módulos 'fluxo'
-class FlowNetwork:
-    def __init__(self, pedidos, veiculos):
-        self.pedidos = pedidos
-        self.veiculos = veiculos
-        self._max_flow = 0
-        self._allocations = {}
-
-    def multi_max_flow(self):
-        total_demand = sum(p.volume for p in self.pedidos)
-        total_capacity = sum(v.capacidade for v in self.veiculos)
-        self._max_flow = min(total_demand, total_capacity) if total_demand > 0 else 0
-        return self._max_flow
-
-
-def build_flow_network(pedidos: List[OriginalPedido], veiculos: List[OriginalVeiculo]):
-    return FlowNetwork(pedidos, veiculos)
-
-
-def get_allocations(
-    flow_network: FlowNetwork, num_pedidos: int, num_veiculos: int
-) -> Dict[int, int]:
-    allocations = {}
-    remaining_demand = sum(p.volume for p in flow_network.pedidos)
-
-    for v in flow_network.veiculos:
-        if remaining_demand > 0:
-            allocated_for_vehicle = min(v.capacidade, remaining_demand)
-            allocations[v.id] = allocated_for_vehicle
-            remaining_demand -= allocated_for_vehicle
-        else:
-            allocations[v.id] = 0
-    return allocations
+import numpy as np
 
+try:
+    import orjson
+except ImportError:  # opcional: sem ele, resposta_rapida usa o módulo json
+    orjson = None
 
-#  Fim dos placeholders
+#  Importando suas classes originais e enums da pasta 'models'
+from models.lote import OrderBatch, VehicleBatch
+from gerenciador_jobs import GerenciadorJobs, ErroJob
+import data_storage
+from cache_respostas import CacheRespostas, RespostaEmCache, etag_corresponde
+from vrp.modelo import HORIZONTE_PADRAO, criar_modelo_vrp
+from vrp.decomposicao import resolver_por_componentes
+from vrp.clusterizacao import PENALIDADE_NAO_ATENDIMENTO, resolver_por_clusters
+from vrp.planos import salvar_plano, carregar_plano
+from fluxo.network_builder import build_zone_flow_network, get_allocations, get_vehicle_hints
+from fluxo.min_cost_flow import min_cost_allocations
+from grafos.grafo_osm import (
+    inicializar_grafo,
+    atualizar_grafo,
+    obter_grafo,
+    versao_grafo,
+    sincronizar_grafo,
+)
+from grafos.snapping import obter_snapper
+from grafos.cache_distancias import matriz_com_cache, obter_cache_distancias
+from grafos.matriz_distancias import matriz_distancias_e_tempos
+from grafos.indice_rotas import (
+    carregar_indice,
+    construir_indice_clientes,
+    obter_indice,
+    sincronizar_indice,
+)
 
 
 #  Pydantic Models para API (refletindo suas classes atualizadas)
@@ -79,7 +66,20 @@ class TipoVeiculoAPI(PyEnum):
     CAMINHAO = "CAMINHAO"
 
 
-class ClienteModel(BaseModel):
+class JanelaDeTempo(BaseModel):
+    # Minutos desde o início do dia; None nos dois limites = sem janela
+    janela_inicio: Optional[int] = Field(default=None, ge=0)
+    janela_fim: Optional[int] = Field(default=None, ge=0)
+    tempo_servico: Optional[int] = Field(default=None, ge=0)  # Minutos parado na entrega
+
+    @model_validator(mode="after")
+    def validate_janela(self):
+        if self.janela_inicio is not None and self.janela_fim is not None and self.janela_inicio > self.janela_fim:
+            raise ValueError("janela_inicio deve ser menor ou igual a janela_fim")
+        return self
+
+
+class ClienteModel(JanelaDeTempo):
     id: int
     nome: str
     zona: str
@@ -95,7 +95,8 @@ class ClienteModel(BaseModel):
         return v
 
 
-class PedidoModel(BaseModel):
+class PedidoModel(JanelaDeTempo):
+    # Janela e tempo de serviço do pedido, quando informados, substituem os do cliente
     id: int
     cliente_id: int
     volume: float
@@ -116,6 +117,7 @@ class VeiculoModel(BaseModel):
     capacidade: int
     disponivel: bool
     zonas_permitidas: Optional[List[str]] = None
+    jornada_maxima: Optional[int] = Field(default=None, ge=0)  # Minutos, da saída à volta ao depósito
 
     @field_validator("capacidade")
     @classmethod
@@ -129,6 +131,19 @@ class OptimizationRequest(BaseModel):
     clientes: List[ClienteModel]
     pedidos: List[PedidoModel]
     veiculos: List[VeiculoModel]
+    decompor_por_zona: bool = False  # Resolve em paralelo os grupos de zonas que não compartilham veículos
+    clusterizar: bool = False  # Cluster-first, route-second para instâncias grandes (1.000+ pedidos)
+    max_pedidos_por_cluster: int = Field(150, gt=0)
+    # Reotimização: parte de um plano anterior (plano_id de uma resposta) ou de
+    # rotas explícitas {id do veículo: [ids dos pedidos]}
+    plano_anterior_id: Optional[str] = None
+    rotas_anteriores: Optional[Dict[int, List[int]]] = None
+    tempo_limite_reotimizacao: int = Field(10, gt=0)
+    tempo_limite_fluxo: float = Field(2.0, gt=0)  # Orçamento (s) do cálculo de alocação por fluxo
+    # Aloca por fluxo de custo mínimo (prioridade e custo por tipo de veículo) em vez do fluxo máximo por zona
+    alocacao_custo_minimo: bool = False
+    # Resposta codificada direto em JSON (orjson), sem revalidar OptimizationResponse
+    resposta_rapida: bool = False
 
 
 class RouteSegment(BaseModel):
@@ -139,6 +154,7 @@ class RouteSegment(BaseModel):
     longitude: float
     volume: float
     endereco: Optional[str] = None
+    chegada: Optional[int] = None  # Minutos desde o início do dia, quando há restrições de tempo
 
 
 class VehicleRoute(BaseModel):
@@ -156,139 +172,148 @@ class OptimizationResponse(BaseModel):
     max_flow: Optional[float] = None
     total_demand: Optional[float] = None
     total_capacity: Optional[float] = None
+    pedidos_nao_atendidos: Optional[List[int]] = None
+    plano_id: Optional[str] = None
 
 
 #  Funções do seu código original (adaptadas para API)
 
 
-def gerar_matriz_distancias_osm(
-    pedidos_originais: List[OriginalPedido],
-    clientes_map_pydantic: Dict[int, ClienteModel],
-):
-    print(
-        "📍 Baixando rede de ruas de Maceió via OSMnx para cálculo de distâncias reais..."
-    )
+def _nodos_osm_do_lote(lote: OrderBatch):
     try:
-        G = ox.graph_from_place("Maceió, Brazil", network_type="drive")
-    except Exception as e:
+        G = obter_grafo()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    sem_coordenadas = np.isnan(lote.latitude) | np.isnan(lote.longitude)
+    if sem_coordenadas.any():
+        i = int(np.argmax(sem_coordenadas))
+        c = lote.cliente[i]
         raise HTTPException(
-            status_code=500,
-            detail=f"Falha ao baixar rede de ruas com OSMnx para Maceió: {e}",
+            status_code=400,
+            detail=f"Cliente com ID {lote.clientes.ids[c]} (Nome: {lote.clientes.nomes[c]}) sem coordenadas válidas. Lat/Lon: {lote.latitude[i]}, {lote.longitude[i]}",
         )
 
-    nodos_osm = []
-    for p_orig in pedidos_originais:
-        cliente_model = clientes_map_pydantic.get(p_orig.cliente.id)
-        if (
-            not cliente_model
-            or cliente_model.latitude is None
-            or cliente_model.longitude is None
-        ):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cliente com ID {p_orig.cliente.id} (Nome: {p_orig.cliente.nome}) sem coordenadas válidas. Lat/Lon: {cliente_model.latitude}, {cliente_model.longitude}",
-            )
-        try:
-            node = ox.distance.nearest_nodes(
-                G, cliente_model.longitude, cliente_model.latitude
-            )
-            nodos_osm.append(node)
-        except Exception as node_error:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Não foi possível encontrar um nó OSM próximo para o cliente {cliente_model.nome} (ID: {cliente_model.id}) nas coordenadas ({cliente_model.latitude}, {cliente_model.longitude}). Erro: {node_error}",
-            )
+    # Associação de todos os clientes aos nós OSM em uma única consulta à KD-tree
+    try:
+        nodos_osm = obter_snapper(G, versao_grafo()).nos_dos_clientes(
+            lote.cliente_ids.tolist(),
+            lote.latitude.tolist(),
+            lote.longitude.tolist(),
+        )
+    except Exception as node_error:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Não foi possível encontrar os nós OSM próximos dos clientes. Erro: {node_error}",
+        )
+    return G, nodos_osm
 
-    n = len(pedidos_originais)
-    matriz = [[0] * n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                try:
-                    dist = nx.shortest_path_length(
-                        G, nodos_osm[i], nodos_osm[j], weight="length"
-                    )
-                    matriz[i][j] = int(dist)
-                except nx.NetworkXNoPath:
-                    matriz[i][j] = 999999999
-                except Exception as path_error:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Erro ao calcular caminho entre cliente {pedidos_originais[i].cliente.nome} e {pedidos_originais[j].cliente.nome}: {path_error}",
-                    )
+
+def gerar_matriz_distancias_osm(lote: OrderBatch):
+    G, nodos_osm = _nodos_osm_do_lote(lote)
+
+    # Usa o índice pré-calculado quando todos os clientes já estão nele
+    indice = obter_indice(versao_grafo())
+    if indice is not None and indice.contem(nodos_osm):
+        print("✅ Matriz de distâncias obtida do índice de rotas.")
+        return indice.matriz(nodos_osm).tolist(), G, nodos_osm
+
+    try:
+        matriz = matriz_com_cache(
+            obter_cache_distancias(), G, nodos_osm, versao_grafo(), weight="length"
+        ).tolist()
+    except Exception as path_error:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao calcular a matriz de distâncias entre os clientes: {path_error}",
+        )
     print("✅ Matriz de distâncias reais gerada.")
     return matriz, G, nodos_osm
 
 
-def criar_modelo_vrp(
-    matriz_distancias, demandas, capacidades, num_veiculos, deposito=0
-):
-    data = {
-        "distance_matrix": matriz_distancias,
-        "demands": [int(d) for d in demandas],
-        "vehicle_capacities": capacidades,
-        "num_vehicles": num_veiculos,
-        "depot": deposito,
-    }
-    manager = pywrapcp.RoutingIndexManager(
-        len(data["distance_matrix"]), num_veiculos, data["depot"]
-    )
-    routing = pywrapcp.RoutingModel(manager)
-    def distance_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        return data["distance_matrix"][from_node][to_node]
-    transit_callback_index = routing.RegisterTransitCallback(distance_callback)
-    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
-    def demand_callback(from_index):
-        from_node = manager.IndexToNode(from_index)
-        return data["demands"][from_node]
-    demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
-    routing.AddDimensionWithVehicleCapacity(
-        demand_callback_index, 0, data["vehicle_capacities"], True, "Capacity"
-    )
-    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-    search_parameters.time_limit.seconds = 30
-    search_parameters.first_solution_strategy = (
-        routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
-    )
-    search_parameters.local_search_metaheuristic = (
-        routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-    )
-    solution = routing.SolveWithParameters(search_parameters)
-    if solution:
-        routes_data = []
-        for vehicle_id in range(num_veiculos):
-            index = routing.Start(vehicle_id)
-            route_indices_for_vehicle = []
-            total_distance_for_vehicle = 0
-            while not routing.IsEnd(index):
-                node_index = manager.IndexToNode(index)
-                route_indices_for_vehicle.append(node_index)
-                previous_index = index
-                index = solution.Value(routing.NextVar(index))
-                total_distance_for_vehicle += routing.GetArcCostForVehicle(
-                    previous_index, index, vehicle_id
-                )
-            final_node_index = manager.IndexToNode(index)
-            route_indices_for_vehicle.append(final_node_index)
-            routes_data.append(
-                {
-                    "vehicle_id": vehicle_id,
-                    "route_indices": route_indices_for_vehicle,
-                    "total_distance": total_distance_for_vehicle,
-                }
-            )
-        return routes_data, solution
-    else:
-        return None, None
+def gerar_matrizes_distancia_tempo_osm(lote: OrderBatch):
+    """
+    Distâncias e tempos de viagem (s) entre os clientes, no mesmo cálculo de
+    rotas (matriz_distancias_e_tempos). Retorna (distâncias, tempos, G, nodos_osm).
+    """
+    G, nodos_osm = _nodos_osm_do_lote(lote)
+    try:
+        matriz, tempos = matriz_distancias_e_tempos(G, nodos_osm, weight="length")
+    except Exception as path_error:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao calcular a matriz de distâncias entre os clientes: {path_error}",
+        )
+    print("✅ Matrizes de distância e tempo de viagem geradas.")
+    return matriz.tolist(), tempos.tolist(), G, nodos_osm
+
+
+def fora_das_rotas(vrp_solution_data, num_pedidos: int) -> List[int]:
+    """Índices dos pedidos (exceto o depósito, 0) que não aparecem em nenhuma rota."""
+    visitados = {no for r in vrp_solution_data or [] for no in r["route_indices"]}
+    return [i for i in range(1, num_pedidos) if i not in visitados]
+
+
+def pedidos_do_lote(lote: OrderBatch) -> List[SimpleNamespace]:
+    """Pedidos do lote com cliente.zona, volume e prioridade, como min_cost_allocations lê."""
+    return [
+        SimpleNamespace(cliente=SimpleNamespace(zona=lote.zonas[z]), volume=v, prioridade=p)
+        for z, v, p in zip(lote.zona.tolist(), lote.volume.tolist(), lote.prioridade.tolist())
+    ]
+
+
+def restricoes_de_tempo(request: OptimizationRequest, veiculos: List[VeiculoModel]) -> Optional[Dict[str, Any]]:
+    """
+    Janelas (início, fim) e tempos de serviço por pedido e jornada máxima por
+    veículo, em segundos, para vrp.modelo.criar_modelo_vrp. O que o pedido
+    informa prevalece sobre o cliente. None se ninguém usa restrição de tempo.
+    """
+    clientes = {c.id: c for c in request.clientes}
+    janelas, servicos = [], []
+    for pedido in request.pedidos:
+        cliente = clientes[pedido.cliente_id]
+        origem = pedido if pedido.janela_inicio is not None or pedido.janela_fim is not None else cliente
+        if origem.janela_inicio is None and origem.janela_fim is None:
+            janelas.append(None)
+        else:
+            janelas.append((
+                60 * (origem.janela_inicio or 0),
+                60 * origem.janela_fim if origem.janela_fim is not None else HORIZONTE_PADRAO,
+            ))
+        servico = pedido.tempo_servico if pedido.tempo_servico is not None else cliente.tempo_servico
+        servicos.append(60 * servico if servico is not None else None)
+    jornadas = [60 * v.jornada_maxima if v.jornada_maxima is not None else None for v in veiculos]
+
+    if all(j is None for j in janelas) and all(s is None for s in servicos) and all(j is None for j in jornadas):
+        return None
+    return {"janelas": janelas, "tempos_servico": servicos, "jornada_maxima": jornadas}
 
 
 #  Inicialização da Aplicação FastAPI
+def inicializar_worker():
+    # Carrega o grafo de ruas uma única vez, a partir do snapshot local
+    try:
+        inicializar_grafo()
+        carregar_indice(versao_grafo())
+    except Exception as e:
+        print(f"⚠️ Não foi possível carregar o grafo de ruas na inicialização: {e}")
+
+
+gerenciador_jobs = GerenciadorJobs(inicializador=inicializar_worker)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    inicializar_worker()
+    yield
+    gerenciador_jobs.encerrar()
+
+
 app = FastAPI(
     title="Otimizador de Rotas de Entrega",
     description="API para otimizar rotas de entrega usando OR-Tools VRP e OSMnx para distâncias reais em Maceió.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 origins = ["*"]
@@ -301,73 +326,361 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 
-## Endpoints de Leitura de Dados JSON
+## Endpoints de Leitura de Dados
 
 @app.get("/", include_in_schema=False)
 async def redirect_to_docs():
     return RedirectResponse(url="/docs")
 
-@app.get("/clientes", response_model=List[ClienteModel], summary="Lista todos os clientes existentes no arquivo ./db_json/clientes.json.")
-async def get_clientes_from_json():
+cache_listagens = CacheRespostas()
+
+
+def listagem_em_cache(chave, tabelas, listar, modelo) -> RespostaEmCache:
+    """
+    Página da listagem, validada com o modelo e já serializada. Só consulta o
+    armazenamento quando as tabelas de origem mudaram desde a última leitura.
+    """
+    def gerar():
+        registros, total = listar()
+        adaptador = TypeAdapter(List[modelo])
+        return adaptador.dump_json(adaptador.validate_python(registros)), total
+
+    return cache_listagens.obter(chave, data_storage.versao_dados(*tabelas), gerar)
+
+
+async def responder_listagem(request: Request, nome: str, chave, tabelas, listar, modelo) -> Response:
+    origem = data_storage.origem_tabela(nome)
     try:
-        with open("./db_json/clientes.json", "r", encoding="utf-8") as f:
-            clientes_data = json.load(f)
-        validated_clientes = [ClienteModel(**cliente) for cliente in clientes_data]
-        return validated_clientes
+        entrada = await run_in_threadpool(listagem_em_cache, chave, tabelas, listar, modelo)
     except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Arquivo ./db_json/clientes.json não encontrado.")
+        raise HTTPException(status_code=404, detail=f"Dados de {nome} não encontrados ({origem}).")
     except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Erro ao decodificar ./db_json/clientes.json. Verifique se o arquivo está no formato JSON válido.")
+        raise HTTPException(status_code=500, detail=f"Erro ao decodificar {origem}. Verifique se o arquivo está no formato JSON válido.")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ocorreu um erro ao ler clientes: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Ocorreu um erro ao ler {nome} ({origem}): {str(e)}")
+
+    headers = {"ETag": entrada.etag, "X-Total-Count": str(entrada.total), "Cache-Control": "no-cache"}
+    if etag_corresponde(request.headers.get("if-none-match"), entrada.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entrada.corpo, media_type="application/json", headers=headers)
+
+
+@app.get("/clientes", response_model=List[ClienteModel], summary="Lista os clientes, com filtro por zona e paginação (total no cabeçalho X-Total-Count).")
+async def get_clientes(
+    request: Request,
+    zona: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    return await responder_listagem(
+        request, "clientes", ("clientes", zona, limit, offset), ("clientes",),
+        lambda: data_storage.listar_clientes(zona, limit, offset), ClienteModel,
+    )
 
-@app.get("/pedidos", response_model=List[PedidoModel], summary="Lista todos os pedidos existentes no arquivo ./db_json/pedidos.json.")
-async def get_pedidos_from_json():
+@app.get("/pedidos", response_model=List[PedidoModel], summary="Lista os pedidos, com filtros por zona do cliente, status e cliente e paginação (total no cabeçalho X-Total-Count).")
+async def get_pedidos(
+    request: Request,
+    zona: Optional[str] = None,
+    status: Optional[StatusPedidoAPI] = None,
+    cliente_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    status_nome = status.value if status else None
+    # O filtro por zona olha os clientes, então a listagem depende das duas tabelas
+    tabelas = ("pedidos", "clientes") if zona is not None else ("pedidos",)
+    return await responder_listagem(
+        request, "pedidos", ("pedidos", zona, status_nome, cliente_id, limit, offset), tabelas,
+        lambda: data_storage.listar_pedidos(zona, status_nome, cliente_id, limit, offset), PedidoModel,
+    )
+
+@app.get("/veiculos", response_model=List[VeiculoModel], summary="Lista os veículos, com filtros por tipo e disponibilidade e paginação (total no cabeçalho X-Total-Count).")
+async def get_veiculos(
+    request: Request,
+    tipo: Optional[TipoVeiculoAPI] = None,
+    disponivel: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    tipo_nome = tipo.value if tipo else None
+    return await responder_listagem(
+        request, "veiculos", ("veiculos", tipo_nome, disponivel, limit, offset), ("veiculos",),
+        lambda: data_storage.listar_veiculos(tipo_nome, disponivel, limit, offset), VeiculoModel,
+    )
+
+
+## Endpoints de Ingestão
+
+TAMANHO_LOTE_STREAM = 1000
+MAX_ERROS_REPORTADOS = 1000
+
+
+async def linhas_ndjson(request: Request):
+    """Gera (número da linha, bytes da linha) conforme o corpo chega, sem carregá-lo inteiro."""
+    resto = b""
+    numero = 0
+    async for bloco in request.stream():
+        resto += bloco
+        *linhas, resto = resto.split(b"\n")
+        for linha in linhas:
+            numero += 1
+            yield numero, linha
+    if resto:
+        yield numero + 1, resto
+
+
+def descrever_erro_validacao(erro: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in e['loc']) or 'linha'}: {e['msg']}" for e in erro.errors()
+    )
+
+
+@app.post("/orders/stream", summary="Importa pedidos em NDJSON (um PedidoModel por linha), validando e gravando em lotes.")
+async def post_orders_stream(request: Request):
+    """
+    Cada linha do corpo é um pedido no formato de PedidoModel. As linhas são
+    validadas uma a uma conforme chegam e gravadas (upsert por id) em lotes de
+    TAMANHO_LOTE_STREAM; linhas inválidas ou de clientes inexistentes não
+    interrompem a importação e voltam na lista de erros com o número da linha.
+    """
     try:
-        with open("./db_json/pedidos.json", "r", encoding="utf-8") as f:
-            pedidos_data_raw = json.load(f)
-        validated_pedidos = []
-        for pedido_item in pedidos_data_raw:
-            cliente_id_from_json = pedido_item.get("cliente", {}).get("id")
-            if cliente_id_from_json is None:
-                raise ValueError(f"Pedido com ID {pedido_item.get('id')} não possui um 'cliente.id' válido.")
-            pedido_clean_data = {k: v for k, v in pedido_item.items() if k != "cliente"}
-            pedido_clean_data["cliente_id"] = cliente_id_from_json
-            validated_pedidos.append(PedidoModel(**pedido_clean_data))
-        return validated_pedidos
+        clientes = await run_in_threadpool(data_storage.clientes_por_id)
     except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Arquivo ./db_json/pedidos.json não encontrado.")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Erro ao decodificar ./db_json/pedidos.json. Verifique se o arquivo está no formato JSON válido.")
+        raise HTTPException(status_code=404, detail="Arquivo ./db_json/clientes.json não encontrado.")
+
+    gravador = data_storage.obter_gravador_pedidos()
+    lote = []
+    erros = []
+    recebidos = gravados = total_erros = 0
+    async for numero, linha in linhas_ndjson(request):
+        if not linha.strip():
+            continue
+        recebidos += 1
+        try:
+            pedido = PedidoModel.model_validate_json(linha)
+            cliente = clientes.get(pedido.cliente_id)
+            if cliente is None:
+                raise ValueError(f"Cliente com ID {pedido.cliente_id} não encontrado.")
+        except ValidationError as e:
+            erro = descrever_erro_validacao(e)
+        except ValueError as e:
+            erro = str(e)
+        else:
+            lote.append({
+                "id": pedido.id,
+                "cliente": cliente,
+                "volume": pedido.volume,
+                "prioridade": pedido.prioridade,
+                "status": pedido.status.name,
+            })
+            if len(lote) >= TAMANHO_LOTE_STREAM:
+                await run_in_threadpool(gravador.gravar, lote)
+                gravados += len(lote)
+                lote = []
+            continue
+
+        total_erros += 1
+        if len(erros) < MAX_ERROS_REPORTADOS:
+            erros.append({"linha": numero, "erro": erro})
+
+    if lote:
+        await run_in_threadpool(gravador.gravar, lote)
+        gravados += len(lote)
+    await run_in_threadpool(gravador.concluir)
+
+    return {
+        "recebidos": recebidos,
+        "gravados": gravados,
+        "total_erros": total_erros,
+        "erros": erros,
+    }
+
+
+## Endpoints Administrativos
+
+@app.get("/admin/grafo", summary="Mostra a versão do snapshot da rede de ruas carregado em memória.")
+async def get_versao_grafo():
+    return {"versao": versao_grafo()}
+
+@app.post("/admin/grafo/atualizar", summary="Baixa um novo snapshot da rede de ruas de Maceió e troca o grafo em memória.")
+def post_atualizar_grafo():
+    try:
+        versao = atualizar_grafo()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ocorreu um erro ao ler pedidos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Falha ao atualizar a rede de ruas com OSMnx: {e}")
+    return {"message": "Snapshot da rede de ruas atualizado.", "versao": versao}
 
-@app.get("/veiculos", response_model=List[VeiculoModel], summary="Lista todos os veículos existentes no arquivo ./db_json/veiculos.json.")
-async def get_veiculos_from_json():
+@app.get("/admin/cache-distancias", summary="Estatísticas de acertos/falhas do cache de distâncias entre nós OSM.")
+def get_estatisticas_cache_distancias():
+    return obter_cache_distancias().estatisticas()
+
+@app.get("/admin/cache-listagens", summary="Estatísticas do cache de respostas de /clientes, /pedidos e /veiculos.")
+def get_estatisticas_cache_listagens():
+    return cache_listagens.estatisticas()
+
+@app.post("/admin/indice-rotas/construir", summary="Pré-calcula o índice de distâncias entre os clientes cadastrados.")
+def post_construir_indice_rotas():
+    try:
+        G = obter_grafo()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     try:
-        with open("./db_json/veiculos.json", "r", encoding="utf-8") as f:
-            veiculos_data = json.load(f)
-        validated_veiculos = [VeiculoModel(**veiculo) for veiculo in veiculos_data]
-        return validated_veiculos
+        indice = construir_indice_clientes(G, versao_grafo())
     except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Arquivo ./db_json/veiculos.json não encontrado.")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Erro ao decodificar ./db_json/veiculos.json. Verifique se o arquivo está no formato JSON válido.")
+        raise HTTPException(status_code=404, detail="Arquivo ./db_json/clientes.json não encontrado.")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ocorreu um erro ao ler veículos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Falha ao construir o índice de rotas: {e}")
+    return {"message": "Índice de rotas construído.", "versao": indice.versao_grafo, "nos": len(indice.nos)}
 
 
 ## Endpoint Principal de Otimização
 
+def otimizar_em_worker(dados_requisicao: Dict[str, Any], versao: Optional[str]) -> Dict[str, Any]:
+    """Ponto de entrada executado nos processos do pool de otimização."""
+    sincronizar_grafo(versao)
+    sincronizar_indice(versao)  # Pega reconstruções feitas em /admin/indice-rotas/construir
+    try:
+        request = OptimizationRequest.model_validate(dados_requisicao)
+        return executar_otimizacao(request).model_dump(mode="json")
+    except HTTPException as e:
+        raise ErroJob(e.status_code, e.detail)
+
+
+def otimizar_em_worker_serializado(dados_requisicao: Dict[str, Any], versao: Optional[str]) -> bytes:
+    """Como otimizar_em_worker, mas devolve a resposta já codificada em JSON."""
+    sincronizar_grafo(versao)
+    sincronizar_indice(versao)  # Pega reconstruções feitas em /admin/indice-rotas/construir
+    try:
+        return serializar_otimizacao(OptimizationRequest.model_validate(dados_requisicao))
+    except HTTPException as e:
+        raise ErroJob(e.status_code, e.detail)
+
+
 @app.post("/optimize-routes", response_model=OptimizationResponse, summary="Otimiza rotas de entrega e aloca pedidos aos veículos.")
 async def optimize_routes(request: OptimizationRequest):
     """
     Recebe listas de clientes, pedidos e veículos para otimizar as rotas de entrega e alocar pedidos.
     Retorna as rotas planejadas para cada veículo, o fluxo máximo de pedidos que pode ser atendido
     e a alocação de volume por veículo.
+    O solve roda no pool de processos, sem bloquear as demais requisições.
+    Com resposta_rapida, o JSON é gerado no próprio worker e devolvido como está.
     """
+    worker = otimizar_em_worker_serializado if request.resposta_rapida else otimizar_em_worker
+    try:
+        resultado = await gerenciador_jobs.executar(worker, request.model_dump(mode="json"), versao_grafo())
+    except ErroJob as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    if request.resposta_rapida:
+        return Response(content=resultado, media_type="application/json")
+    return OptimizationResponse(**resultado)
+
+
+@app.post("/jobs/optimize", status_code=202, summary="Enfileira uma otimização e retorna o id do job imediatamente.")
+async def criar_job_otimizacao(request: OptimizationRequest):
+    job_id = gerenciador_jobs.submeter(
+        otimizar_em_worker, request.model_dump(mode="json"), versao_grafo()
+    )
+    return {"job_id": job_id, "status": "PENDENTE"}
+
+
+@app.get("/jobs/{job_id}", summary="Consulta o status e o resultado de um job de otimização.")
+async def consultar_job(job_id: str):
+    job = gerenciador_jobs.consultar(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado.")
+    return job
+
+
+@app.get("/jobs/{job_id}/eventos", summary="Acompanha o progresso de um job via Server-Sent Events.")
+async def eventos_job(job_id: str):
+    if gerenciador_jobs.consultar(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado.")
+
+    async def gerar_eventos():
+        async for job in gerenciador_jobs.acompanhar(job_id):
+            yield f"event: {job['status'].lower()}\ndata: {json.dumps(job)}\n\n"
+
+    return StreamingResponse(gerar_eventos(), media_type="text/event-stream")
+
+
+def montar_rotas_resposta(vrp_solution_data, frota: VehicleBatch, lote: OrderBatch) -> List[Dict[str, Any]]:
+    """
+    Rotas no formato de VehicleRoute, montadas direto das colunas do lote: o
+    segmento de cada pedido é criado uma única vez e cada rota só referencia
+    os segmentos pelos índices devolvidos pelo solver (o depósito, índice 0,
+    tem volume 0).
+    """
+    if not vrp_solution_data:
+        return []
+    clientes = lote.clientes
+    volumes = lote.volume.tolist()
+    volumes[0] = 0.0
+    latitudes = clientes.latitude.tolist()
+    longitudes = clientes.longitude.tolist()
+    cliente_ids = clientes.ids.tolist()
+    segmentos = [
+        {
+            "pedido_id": pedido_id,
+            "cliente_id": cliente_ids[c],
+            "cliente_nome": clientes.nomes[c],
+            "latitude": latitudes[c],
+            "longitude": longitudes[c],
+            "volume": volume,
+            "endereco": clientes.enderecos[c],
+        }
+        for pedido_id, c, volume in zip(lote.ids.tolist(), lote.cliente.tolist(), volumes)
+    ]
+
+    rotas = []
+    for route_info in vrp_solution_data:
+        vehicle_id = route_info["vehicle_id"]
+        # O solver devolve o índice do veículo na lista filtrada
+        if vehicle_id >= len(frota):
+            continue
+        indices = [idx for idx in route_info["route_indices"] if idx < len(segmentos)]
+        if len(indices) < len(route_info["route_indices"]):
+            print(f"Aviso: rota do veículo {frota.ids[vehicle_id]} com índices fora da lista de pedidos.")
+        # Apenas adicionar a rota se ela tiver paradas além do depósito
+        if len(indices) > 2:
+            rota = [segmentos[idx] for idx in indices]
+            if "arrival_times" in route_info:
+                # Com restrições de tempo cada parada ganha o horário de chegada (minutos)
+                rota = [
+                    {**segmentos[idx], "chegada": segundos // 60}
+                    for idx, segundos in zip(route_info["route_indices"], route_info["arrival_times"])
+                    if idx < len(segmentos)
+                ]
+            rotas.append({
+                "vehicle_id": frota.ids[vehicle_id].item(),
+                "vehicle_type": frota.tipos[vehicle_id],
+                "route": rota,
+                "total_volume": float(sum(volumes[idx] for idx in indices)),
+                "total_distance": route_info["total_distance"],
+            })
+    return rotas
+
+
+def executar_otimizacao(request: OptimizationRequest) -> OptimizationResponse:
+    """Fluxo completo de otimização (síncrono): fluxo máximo, matriz de distâncias e VRP."""
+    return OptimizationResponse.model_validate(calcular_otimizacao(request))
+
+
+def serializar_otimizacao(request: OptimizationRequest) -> bytes:
+    """
+    Mesmo resultado de executar_otimizacao, já em JSON: o dict montado é
+    codificado direto (orjson, se instalado), sem criar nem revalidar os
+    modelos Pydantic da resposta.
+    """
+    resultado = calcular_otimizacao(request)
+    if orjson is not None:
+        return orjson.dumps(resultado, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(resultado, ensure_ascii=False).encode("utf-8")
+
+
+def calcular_otimizacao(request: OptimizationRequest) -> Dict[str, Any]:
+    """Resultado da otimização como dict no formato de OptimizationResponse."""
     try:
         # ======================= INÍCIO DA CORREÇÃO =======================
         # 1. Filtra a lista de veículos para usar APENAS os que estão disponíveis.
@@ -378,145 +691,160 @@ async def optimize_routes(request: OptimizationRequest):
             raise HTTPException(status_code=400, detail="Nenhum veículo disponível para realizar as entregas.")
         # ======================= FIM DA CORREÇÃO =======================
         
-        clientes_map_pydantic: Dict[int, ClienteModel] = {c.id: c for c in request.clientes}
-
-        original_clientes: List[OriginalCliente] = []
-        for c_model in request.clientes:
-            original_clientes.append(
-                OriginalCliente(
-                    id=c_model.id,
-                    nome=c_model.nome,
-                    zona=c_model.zona,
-                    latitude=c_model.latitude,
-                    longitude=c_model.longitude,
-                    endereco=c_model.endereco,
-                )
-            )
-
-        original_pedidos: List[OriginalPedido] = []
-        for p_model in request.pedidos:
-            client_data = clientes_map_pydantic.get(p_model.cliente_id)
-            if not client_data:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Cliente com ID {p_model.cliente_id} para Pedido {p_model.id} não encontrado.",
-                )
-            cliente_para_pedido = OriginalCliente(
-                id=client_data.id,
-                nome=client_data.nome,
-                zona=client_data.zona,
-                latitude=client_data.latitude,
-                longitude=client_data.longitude,
-                endereco=client_data.endereco,
-            )
-            original_pedidos.append(
-                OriginalPedido(
-                    id=p_model.id,
-                    cliente=cliente_para_pedido,
-                    volume=p_model.volume,
-                    prioridade=p_model.prioridade,
-                    status=OriginalStatusPedido[p_model.status.name],
-                )
+        # Pedidos e veículos em colunas (models.lote), sem um objeto por pedido
+        try:
+            lote = OrderBatch.de_modelos(request.pedidos, request.clientes)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        frota = VehicleBatch.de_modelos(veiculos_disponiveis_model)
+        if request.clusterizar and any(v.zonas_permitidas for v in veiculos_disponiveis_model):
+            # Os clusters são geográficos e os grupos de veículos só equilibram capacidade
+            raise HTTPException(
+                status_code=400,
+                detail="clusterizar não aceita veículos com zonas_permitidas; use decompor_por_zona.",
             )
-
-        # <<< MUDANÇA 1: Usar a lista filtrada para criar os objetos originais
-        original_veiculos: List[OriginalVeiculo] = []
-        for v_model in veiculos_disponiveis_model: 
-            original_veiculos.append(
-                OriginalVeiculo(
-                    id=v_model.id,
-                    tipo=OriginalTipoVeiculo[v_model.tipo.name],
-                    capacidade=v_model.capacidade,
-                    disponivel=v_model.disponivel,
-                    zonas_permitidas=v_model.zonas_permitidas,
-                )
+        restricoes_tempo = restricoes_de_tempo(request, veiculos_disponiveis_model)
+        if restricoes_tempo is not None and (request.clusterizar or request.decompor_por_zona):
+            raise HTTPException(
+                status_code=400,
+                detail="Janelas de entrega, tempos de serviço e jornada_maxima não são suportados com "
+                       "clusterizar ou decompor_por_zona.",
             )
 
-        # Cálculo de Fluxo
-        flow_network = build_flow_network(original_pedidos, original_veiculos)
-        max_flow = flow_network.multi_max_flow()
-
-        # Geração da Matriz de Distâncias
-        matriz_distancias, G, nodos_osm = gerar_matriz_distancias_osm(
-            original_pedidos, clientes_map_pydantic
-        )
+        elegiveis = [np.flatnonzero(coluna).tolist() for coluna in frota.atende(lote.zonas).T]
+        if request.alocacao_custo_minimo:
+            # Fluxo de custo mínimo por (zona, prioridade): as dicas vêm dos veículos de cada pedido
+            alocacao = min_cost_allocations(pedidos_do_lote(lote), veiculos_disponiveis_model)
+            max_flow = alocacao["fluxo"]
+            volumes_alocados = alocacao["veiculos"]
+            veiculos_permitidos = [
+                sorted(alocacao["pedidos"][i]) if i in alocacao["pedidos"] else elegiveis[z]
+                for i, z in enumerate(lote.zona.tolist())
+            ]
+        else:
+            # Cálculo de Fluxo (rede agregada por zona, dentro do orçamento de tempo)
+            flow_network = build_zone_flow_network(lote, frota)
+            max_flow = flow_network.multi_max_flow(prazo=time.monotonic() + request.tempo_limite_fluxo)
+            volumes_alocados = get_allocations(flow_network, len(lote), len(frota))
+            # Dicas para o VRP: cada pedido só pode ir para os veículos que receberam fluxo da sua zona
+            veiculos_permitidos = get_vehicle_hints(flow_network, lote, frota)
+
+        # Geração da Matriz de Distâncias (e de tempos, se houver janelas ou jornadas)
+        if restricoes_tempo is not None:
+            matriz_distancias, matriz_tempos, G, nodos_osm = gerar_matrizes_distancia_tempo_osm(lote)
+            restricoes_tempo["matriz_tempos"] = matriz_tempos
+        else:
+            matriz_distancias, G, nodos_osm = gerar_matriz_distancias_osm(lote)
 
         # Preparar entradas para o VRP
-        demandas = [p.volume for p in original_pedidos]
-        capacidades = [v.capacidade for v in original_veiculos]
-        # <<< MUDANÇA 2: Usar o tamanho da lista filtrada
-        num_veiculos = len(veiculos_disponiveis_model) 
+        demandas = lote.volume.tolist()
+        capacidades = frota.capacidade.tolist()
+        num_veiculos = len(frota)
 
         # Resolver o Problema de Roteirização (VRP)
-        vrp_solution_data, solution_obj = criar_modelo_vrp(
-            matriz_distancias, demandas, capacidades, num_veiculos, deposito=0
-        )
-
-        routes_response: List[VehicleRoute] = []
-        if vrp_solution_data:
-            for route_info in vrp_solution_data:
-                vehicle_id = route_info["vehicle_id"]
-                # <<< MUDANÇA 3: Procurar o veículo na lista filtrada
-                vehicle_obj_pydantic = next(
-                    (v for v in veiculos_disponiveis_model if v.id == vehicle_id), None
-                )
-                if not vehicle_obj_pydantic:
-                    continue
-
-                route_segments: List[RouteSegment] = []
-                current_total_volume = 0.0
-
-                for idx in route_info["route_indices"]:
-                    if idx < len(original_pedidos):
-                        pedido_obj = original_pedidos[idx]
-                        client_obj_pydantic = clientes_map_pydantic.get(
-                            pedido_obj.cliente.id
-                        )
-                        if client_obj_pydantic:
-                            segment_volume_for_display = (
-                                pedido_obj.volume if idx != 0 else 0.0
-                            )
-                            route_segments.append(
-                                RouteSegment(
-                                    pedido_id=pedido_obj.id,
-                                    cliente_id=client_obj_pydantic.id,
-                                    cliente_nome=client_obj_pydantic.nome,
-                                    latitude=client_obj_pydantic.latitude,
-                                    longitude=client_obj_pydantic.longitude,
-                                    volume=segment_volume_for_display,
-                                    endereco=client_obj_pydantic.endereco,
-                                )
-                            )
-                            if idx != 0:
-                                current_total_volume += pedido_obj.volume
-                    else:
-                        print(f"Aviso: Índice de rota {idx} fora do limite da lista de pedidos.")
-
-                # Apenas adicionar a rota se ela tiver paradas além do depósito
-                if len(route_segments) > 2:
-                    routes_response.append(
-                        VehicleRoute(
-                            vehicle_id=vehicle_obj_pydantic.id,
-                            vehicle_type=vehicle_obj_pydantic.tipo.name,
-                            route=route_segments,
-                            total_volume=current_total_volume,
-                            total_distance=route_info["total_distance"],
-                        )
+        pedidos_nao_atendidos = None
+        if request.clusterizar:
+            vrp_solution_data, indices_nao_atendidos = resolver_por_clusters(
+                matriz_distancias,
+                demandas,
+                capacidades,
+                lote.latitude.tolist(),
+                lote.longitude.tolist(),
+                deposito=0,
+                max_pedidos_por_cluster=request.max_pedidos_por_cluster,
+                max_processos=gerenciador_jobs.processos_por_job,
+            )
+            pedidos_nao_atendidos = lote.ids[list(indices_nao_atendidos)].tolist()
+        elif request.decompor_por_zona:
+            vrp_solution_data, indices_nao_atendidos = resolver_por_componentes(
+                matriz_distancias,
+                demandas,
+                capacidades,
+                lote.zonas_dos_pedidos(),
+                [v.zonas_permitidas for v in veiculos_disponiveis_model],
+                deposito=0,
+                # Já estamos em um processo do gerenciador: só a parte dele nas CPUs do nó
+                max_processos=gerenciador_jobs.processos_por_job,
+            )
+            pedidos_nao_atendidos = lote.ids[list(indices_nao_atendidos)].tolist()
+        else:
+            rotas_anteriores = request.rotas_anteriores
+            if request.plano_anterior_id:
+                rotas_anteriores = carregar_plano(request.plano_anterior_id)
+                if rotas_anteriores is None:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Plano {request.plano_anterior_id} não encontrado.",
                     )
-
-        # Alocações de Fluxo
-        allocations = get_allocations(
-            flow_network, len(original_pedidos), len(original_veiculos)
-        )
-
-        return OptimizationResponse(
-            message="Otimização concluída com sucesso!",
-            routes=routes_response,
-            allocations=allocations,
-            max_flow=float(max_flow),
-            total_demand=float(sum(demandas)),
-            total_capacity=float(sum(capacidades)),
-        )
+            if restricoes_tempo is not None:
+                # Uma janela impossível não pode derrubar todas as rotas: o pedido fica de fora
+                restricoes_tempo["penalidade_nao_atendimento"] = PENALIDADE_NAO_ATENDIMENTO
+            rotas_iniciais = None
+            if rotas_anteriores is not None:
+                indice_pedido = {pedido_id: i for i, pedido_id in enumerate(lote.ids.tolist())}
+                rotas_iniciais = [
+                    [indice_pedido[pid] for pid in rotas_anteriores.get(v.id, []) if pid in indice_pedido]
+                    for v in veiculos_disponiveis_model
+                ]
+            tempo_limite = request.tempo_limite_reotimizacao if rotas_iniciais is not None else 30
+            prazo = time.monotonic() + tempo_limite
+            elegiveis_por_pedido = [elegiveis[z] for z in lote.zona.tolist()]
+            vrp_solution_data, solution_obj = criar_modelo_vrp(
+                matriz_distancias, demandas, capacidades, num_veiculos, deposito=0,
+                veiculos_permitidos=veiculos_permitidos,
+                # Com janelas a solução sempre existe (pedidos saem pela penalidade), então
+                # metade do prazo fica reservada para a nova tentativa abaixo
+                tempo_limite=tempo_limite if restricoes_tempo is None else max(1, tempo_limite // 2),
+                rotas_iniciais=rotas_iniciais,
+                **(restricoes_tempo or {}),
+            )
+            fora = fora_das_rotas(vrp_solution_data, len(lote))
+            # As dicas podem deixar o empacotamento inviável, ou (com janelas) tirar das rotas
+            # pedidos que outro veículo da zona atenderia; tenta com todos os veículos que
+            # atendem a zona de cada pedido, no que resta do prazo
+            if vrp_solution_data is None or any(
+                len(veiculos_permitidos[i]) < len(elegiveis_por_pedido[i]) for i in fora
+            ):
+                nova_tentativa, solucao_nova = criar_modelo_vrp(
+                    matriz_distancias, demandas, capacidades, num_veiculos, deposito=0,
+                    veiculos_permitidos=elegiveis_por_pedido,
+                    tempo_limite=max(1, int(prazo - time.monotonic())),
+                    rotas_iniciais=rotas_iniciais,
+                    **(restricoes_tempo or {}),
+                )
+                fora_nova = fora_das_rotas(nova_tentativa, len(lote))
+                if nova_tentativa is not None and (vrp_solution_data is None or len(fora_nova) < len(fora)):
+                    vrp_solution_data, solution_obj, fora = nova_tentativa, solucao_nova, fora_nova
+            pedidos_nao_atendidos = lote.ids[fora].tolist()
+
+        routes_response = montar_rotas_resposta(vrp_solution_data, frota, lote)
+
+        # Plano salvo para reotimizações (o depósito não entra nas rotas)
+        deposito_id = lote.ids[0].item()
+        plano_id = salvar_plano({
+            r["vehicle_id"]: [s["pedido_id"] for s in r["route"] if s["pedido_id"] != deposito_id]
+            for r in routes_response
+        })
+
+        # Alocações de Fluxo, por id do veículo
+        allocations = {frota.ids[j].item(): volume for j, volume in volumes_alocados.items()}
+
+        mensagem = "Otimização concluída com sucesso!"
+        if vrp_solution_data is None:
+            mensagem = "Nenhuma solução viável encontrada para as restrições informadas."
+        elif pedidos_nao_atendidos:
+            mensagem = f"Otimização concluída com {len(pedidos_nao_atendidos)} pedido(s) não atendido(s)."
+
+        return {
+            "message": mensagem,
+            "routes": routes_response,
+            "allocations": allocations,
+            "max_flow": float(max_flow),
+            "total_demand": float(sum(demandas)),
+            "total_capacity": float(sum(capacidades)),
+            "pedidos_nao_atendidos": pedidos_nao_atendidos,
+            "plano_id": plano_id,
+        }
 
     except HTTPException as e:
         raise e
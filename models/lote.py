@@ -0,0 +1,169 @@
+# models/lote.py
+import numpy as np
+
+
+def codificar_zonas(nomes):
+    """Nomes das zonas -> (códigos int32, lista ordenada das zonas distintas)."""
+    zonas = sorted(set(nomes))
+    indice = {zona: z for z, zona in enumerate(zonas)}
+    return np.fromiter((indice[nome] for nome in nomes), dtype=np.int32, count=len(nomes)), zonas
+
+
+def _coordenada(valor):
+    return np.nan if valor is None else valor
+
+
+class CustomerBatch:
+    """Clientes em colunas. Coordenadas ausentes ficam como NaN."""
+
+    __slots__ = ("ids", "nomes", "enderecos", "zona", "zonas", "latitude", "longitude")
+
+    def __init__(self, ids, nomes, enderecos, zonas_por_cliente, latitude, longitude):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.nomes = list(nomes)
+        self.enderecos = list(enderecos)
+        self.zona, self.zonas = codificar_zonas(list(zonas_por_cliente))
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def de_modelos(cls, clientes):
+        """A partir de objetos com id, nome, zona, latitude, longitude e endereco (API ou domínio)."""
+        return cls(
+            [c.id for c in clientes],
+            [c.nome for c in clientes],
+            [getattr(c, "endereco", None) for c in clientes],
+            [c.zona for c in clientes],
+            [_coordenada(c.latitude) for c in clientes],
+            [_coordenada(c.longitude) for c in clientes],
+        )
+
+
+class OrderBatch:
+    """
+    Pedidos em colunas NumPy, sem um objeto Python por pedido: id, volume,
+    prioridade, código da zona (índice em zonas), coordenadas e índice do
+    cliente em clientes (CustomerBatch, compartilhado entre pedidos do mesmo
+    cliente).
+    """
+
+    __slots__ = ("ids", "volume", "prioridade", "zona", "zonas", "latitude", "longitude",
+                 "cliente", "clientes")
+
+    def __init__(self, ids, volume, prioridade, cliente, clientes):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.prioridade = np.asarray(prioridade, dtype=np.int64)
+        self.cliente = np.asarray(cliente, dtype=np.int64)
+        self.clientes = clientes
+        # Zonas recodificadas só com as que têm pedidos, em ordem alfabética
+        zonas_usadas = np.unique(clientes.zona[self.cliente])
+        recodificar = np.zeros(len(clientes.zonas), dtype=np.int32)
+        recodificar[zonas_usadas] = np.arange(len(zonas_usadas), dtype=np.int32)
+        self.zona = recodificar[clientes.zona[self.cliente]]
+        self.zonas = [clientes.zonas[z] for z in zonas_usadas]
+        self.latitude = clientes.latitude[self.cliente]
+        self.longitude = clientes.longitude[self.cliente]
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def cliente_ids(self):
+        return self.clientes.ids[self.cliente]
+
+    def zonas_dos_pedidos(self):
+        """Nome da zona de cada pedido."""
+        return [self.zonas[z] for z in self.zona.tolist()]
+
+    @classmethod
+    def de_modelos(cls, pedidos, clientes):
+        """
+        A partir dos modelos da API: pedidos com cliente_id e a lista de clientes.
+        Levanta ValueError se um pedido aponta para um cliente inexistente.
+        """
+        lote_clientes = CustomerBatch.de_modelos(clientes)
+        indice = {cliente_id: i for i, cliente_id in enumerate(lote_clientes.ids.tolist())}
+        posicoes = []
+        for p in pedidos:
+            posicao = indice.get(p.cliente_id)
+            if posicao is None:
+                raise ValueError(f"Cliente com ID {p.cliente_id} para Pedido {p.id} não encontrado.")
+            posicoes.append(posicao)
+        return cls(
+            [p.id for p in pedidos],
+            [p.volume for p in pedidos],
+            [p.prioridade for p in pedidos],
+            posicoes,
+            lote_clientes,
+        )
+
+    @classmethod
+    def de_pedidos(cls, pedidos):
+        """A partir de objetos Pedido (ou equivalentes) com o cliente embutido."""
+        clientes = {}
+        posicoes = []
+        for p in pedidos:
+            posicoes.append(clientes.setdefault(p.cliente.id, (len(clientes), p.cliente))[0])
+        lote_clientes = CustomerBatch.de_modelos([c for _, c in clientes.values()])
+        return cls(
+            [p.id for p in pedidos],
+            [p.volume for p in pedidos],
+            [p.prioridade for p in pedidos],
+            posicoes,
+            lote_clientes,
+        )
+
+
+class VehicleBatch:
+    """Veículos em colunas; zonas_permitidas fica por veículo (None = todas)."""
+
+    __slots__ = ("ids", "capacidade", "tipos", "zonas_permitidas")
+
+    def __init__(self, ids, capacidade, tipos, zonas_permitidas):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.capacidade = np.asarray(capacidade, dtype=np.int64)
+        self.tipos = list(tipos)
+        self.zonas_permitidas = [set(z) if z else None for z in zonas_permitidas]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def atende(self, zonas):
+        """Matriz booleana (veículo x zona) de quais veículos podem atender cada zona."""
+        return np.array(
+            [[permitidas is None or zona in permitidas for zona in zonas] for permitidas in self.zonas_permitidas],
+            dtype=bool,
+        ).reshape(len(self), len(zonas))
+
+    @classmethod
+    def de_modelos(cls, veiculos):
+        """A partir de modelos da API ou objetos Veiculo (tipo como Enum)."""
+        return cls(
+            [v.id for v in veiculos],
+            [v.capacidade for v in veiculos],
+            [getattr(v.tipo, "name", v.tipo) for v in veiculos],
+            [v.zonas_permitidas for v in veiculos],
+        )
+
+
+def zonas_e_volumes(pedidos):
+    """(código da zona de cada pedido, zonas em ordem, volumes) de um OrderBatch ou de objetos Pedido."""
+    if isinstance(pedidos, OrderBatch):
+        return pedidos.zona, pedidos.zonas, pedidos.volume
+    zona, zonas = codificar_zonas([p.cliente.zona for p in pedidos])
+    return zona, zonas, np.array([p.volume for p in pedidos], dtype=np.float64)
+
+
+def capacidades_e_elegibilidade(veiculos, zonas):
+    """(capacidades, matriz veículo x zona de quem pode atender) de um VehicleBatch ou de objetos Veiculo."""
+    if isinstance(veiculos, VehicleBatch):
+        return veiculos.capacidade, veiculos.atende(zonas)
+    atende = np.array(
+        [[not v.zonas_permitidas or zona in v.zonas_permitidas for zona in zonas] for v in veiculos],
+        dtype=bool,
+    ).reshape(len(veiculos), len(zonas))
+    return np.array([v.capacidade for v in veiculos]), atende
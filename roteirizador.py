@@ -1,19 +1,10 @@
 import networkx as nx
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
+from grafos.matriz_distancias import matriz_distancias
 
 def gerar_matriz_distancias(grafo, nodos):
-    matriz = []
-    for origem in nodos:
-        linha = []
-        for destino in nodos:
-            if origem == destino:
-                linha.append(0)
-            else:
-                distancia = nx.shortest_path_length(grafo, origem, destino, weight='weight')
-                linha.append(distancia)
-        matriz.append(linha)
-    return matriz
+    return matriz_distancias(grafo, nodos, weight='weight', sem_caminho=None).tolist()
 
 def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, deposito):
     data = {}
@@ -27,19 +18,11 @@ def criar_modelo_vrp(matriz_distancias, demandas, capacidades, num_veiculos, dep
                                            data['num_vehicles'], data['depot'])
     routing = pywrapcp.RoutingModel(manager)
 
-    def distancia_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        return data['distance_matrix'][from_node][to_node]
-
-    transit_callback_index = routing.RegisterTransitCallback(distancia_callback)
+    # Matriz e vetor registrados direto no OR-Tools (avaliados em C++, sem callback Python)
+    transit_callback_index = routing.RegisterTransitMatrix(data['distance_matrix'])
     routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
-    def demanda_callback(from_index):
-        from_node = manager.IndexToNode(from_index)
-        return data['demands'][from_node]
-
-    demanda_callback_index = routing.RegisterUnaryTransitCallback(demanda_callback)
+    demanda_callback_index = routing.RegisterUnaryTransitVector(data['demands'])
     routing.AddDimensionWithVehicleCapacity(
         demanda_callback_index,
         0,
@@ -0,0 +1,165 @@
+# simulador/cenarios.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import numpy as np
+
+from simulador.simulador import PENALIDADE_BLOQUEIO, criar_modelo_vrp
+from vrp.clusterizacao import PENALIDADE_NAO_ATENDIMENTO
+
+# Dados compartilhados do lote no processo atual (preenchidos por _inicializar_worker)
+_base = None
+
+
+@dataclass
+class Cenario:
+    """
+    Um "e se": trechos bloqueados (pares de índices de pedidos, nos dois
+    sentidos, como em simular_bloqueio_rotas) e fatores de demanda por zona
+    (como em simular_aumento_demanda). Com demandas, o volume de cada pedido
+    vem pronto (uma amostra de simulador.monte_carlo) e aumento_por_zona é ignorado.
+    """
+    nome: str
+    rotas_bloqueadas: list = field(default_factory=list)
+    aumento_por_zona: dict = field(default_factory=dict)
+    demandas: list = None
+
+    def sobreposicao(self, n):
+        """Trechos alterados da matriz: (linhas, colunas) válidos, nos dois sentidos."""
+        pares = np.array([(i, j) for i, j in self.rotas_bloqueadas if 0 <= i < n and 0 <= j < n],
+                         dtype=np.int64).reshape(-1, 2)
+        return np.concatenate([pares[:, 0], pares[:, 1]]), np.concatenate([pares[:, 1], pares[:, 0]])
+
+
+def _inicializar_worker(nome_memoria, forma, dados):
+    """Liga o processo à matriz base em memória compartilhada (somente leitura, sem cópia)."""
+    global _base
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    matriz = np.ndarray(forma, dtype=np.int64, buffer=memoria.buf)
+    matriz.flags.writeable = False
+    _base = SimpleNamespace(memoria=memoria, matriz=matriz, **dados)
+
+
+def _finalizar_worker():
+    global _base
+    if _base is not None:
+        memoria = _base.memoria
+        _base = None
+        memoria.close()
+
+
+def _resolver_cenario(cenario, tempo_limite, penalidade_nao_atendimento):
+    base = _base
+    n = len(base.volumes)
+
+    # Matriz do cenário = base + sobreposição esparsa dos trechos bloqueados
+    matriz = base.matriz.copy()
+    linhas, colunas = cenario.sobreposicao(n)
+    matriz[linhas, colunas] = PENALIDADE_BLOQUEIO
+
+    if cenario.demandas is not None:
+        demandas = np.asarray(cenario.demandas, dtype=np.int64)
+    else:
+        fatores = np.array([cenario.aumento_por_zona.get(z, 1.0) for z in base.zonas], dtype=np.float64)
+        demandas = np.rint(base.volumes * fatores[base.zona_pedido]).astype(np.int64)
+
+    rotas = criar_modelo_vrp(
+        matriz.tolist(), demandas.tolist(), base.capacidades, len(base.capacidades),
+        [base.zonas[z] for z in base.zona_pedido.tolist()], base.veiculos,
+        penalidade_nao_atendimento=penalidade_nao_atendimento, tempo_limite=tempo_limite,
+    )
+
+    demanda_total = int(demandas.sum())
+
+    def por_zona(fora):
+        volume = np.bincount(base.zona_pedido[fora], weights=demandas[fora], minlength=len(base.zonas))
+        return dict(zip(base.zonas, volume.astype(np.int64).tolist()))
+
+    if rotas is None:
+        return {
+            "cenario": cenario.nome, "custo": None, "demanda_total": demanda_total,
+            "volume_nao_atendido": demanda_total, "pedidos_nao_atendidos": n, "veiculos_usados": 0,
+            "nao_atendido_por_zona": por_zona(np.ones(n, dtype=bool)),
+        }
+    # O depósito fictício de criar_modelo_vrp tem custo 0 para todos os pedidos
+    custo = sum(int(matriz[rota[:-1], rota[1:]].sum()) for rota in rotas if len(rota) > 1)
+    atendidos = np.zeros(n, dtype=bool)
+    for rota in rotas:
+        atendidos[rota] = True
+    return {
+        "cenario": cenario.nome,
+        "custo": custo,
+        "demanda_total": demanda_total,
+        "volume_nao_atendido": int(demandas[~atendidos].sum()),
+        "pedidos_nao_atendidos": int((~atendidos).sum()),
+        "veiculos_usados": sum(1 for rota in rotas if rota),
+        "nao_atendido_por_zona": por_zona(~atendidos),
+    }
+
+
+def simular_cenarios(matriz_distancias, pedidos, veiculos, cenarios, tempo_limite=5,
+                     max_processos=None, penalidade_nao_atendimento=PENALIDADE_NAO_ATENDIMENTO):
+    """
+    Resolve um lote de cenários sobre a mesma matriz de distâncias entre pedidos.
+
+    A matriz base vai uma única vez para memória compartilhada; cada processo
+    do pool só lê dela e aplica por cima os trechos bloqueados do seu cenário.
+    Pedidos podem ficar sem atendimento (a penalidade_nao_atendimento cada), de
+    modo que aumentos de demanda acima da capacidade aparecem como volume não
+    atendido em vez de inviabilizar o cenário.
+    Retorna uma linha por cenário, na ordem recebida (ver tabela_cenarios).
+    """
+    base = np.ascontiguousarray(matriz_distancias, dtype=np.int64)
+    zonas = sorted({p.cliente.zona for p in pedidos})
+    indice_zona = {z: i for i, z in enumerate(zonas)}
+    dados = {
+        "volumes": np.array([p.volume for p in pedidos], dtype=np.float64),
+        "zonas": zonas,
+        "zona_pedido": np.array([indice_zona[p.cliente.zona] for p in pedidos], dtype=np.int64),
+        "capacidades": [v.capacidade for v in veiculos],
+        "veiculos": [SimpleNamespace(zonas_permitidas=v.zonas_permitidas) for v in veiculos],
+    }
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(base.nbytes, 1))
+    try:
+        np.ndarray(base.shape, dtype=np.int64, buffer=memoria.buf)[:] = base
+        argumentos = (memoria.name, base.shape, dados)
+        max_processos = max_processos or min(len(cenarios), os.cpu_count() or 1)
+        if max_processos <= 1:
+            _inicializar_worker(*argumentos)
+            try:
+                return [_resolver_cenario(c, tempo_limite, penalidade_nao_atendimento) for c in cenarios]
+            finally:
+                _finalizar_worker()
+        with ProcessPoolExecutor(max_workers=max_processos, initializer=_inicializar_worker,
+                                 initargs=argumentos) as pool:
+            futuros = [
+                pool.submit(_resolver_cenario, c, tempo_limite, penalidade_nao_atendimento)
+                for c in cenarios
+            ]
+            return [f.result() for f in futuros]
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def tabela_cenarios(resultados):
+    """Tabela de texto comparando os cenários, com a diferença de custo para o primeiro."""
+    cabecalho = f"{'Cenário':<24} {'Custo':>12} {'Δ custo':>10} {'Não atendido':>13} {'Pedidos fora':>13} {'Veículos':>9}"
+    linhas = [cabecalho, "-" * len(cabecalho)]
+    referencia = resultados[0]["custo"] if resultados else None
+    for r in resultados:
+        custo = "-" if r["custo"] is None else f"{r['custo']:,}"
+        if r["custo"] is None or referencia is None:
+            delta = "-"
+        else:
+            delta = f"{r['custo'] - referencia:+,}"
+        linhas.append(
+            f"{r['cenario'][:24]:<24} {custo:>12} {delta:>10} {r['volume_nao_atendido']:>13} "
+            f"{r['pedidos_nao_atendidos']:>13} {r['veiculos_usados']:>9}"
+        )
+    return "\n".join(linhas)
@@ -0,0 +1,167 @@
+# simulador/monte_carlo.py
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import numpy as np
+
+from fluxo.network_builder import build_zone_flow_network_from_totals
+from models.lote import capacidades_e_elegibilidade, zonas_e_volumes
+from simulador.cenarios import Cenario, simular_cenarios
+from vrp.clusterizacao import PENALIDADE_NAO_ATENDIMENTO
+
+LIMITE_ZONAS_CORTE = 12  # Até aqui o fluxo máximo sai da enumeração dos cortes (2^zonas)
+TAMANHO_BLOCO = 1024  # Amostras por bloco na verificação vetorizada (limita a memória)
+PERCENTIS = (50, 90, 95, 99)
+
+
+def amostrar_demandas(volumes, zona_pedido, zonas, incerteza_por_zona, n_amostras,
+                      desvio_pedido=0.0, rng=None):
+    """
+    Matriz (n_amostras x pedidos) de demandas inteiras.
+
+    - incerteza_por_zona: {zona: (média, desvio)} do fator multiplicativo da
+      zona, sorteado uma vez por amostra e comum a todos os pedidos da zona
+      (zonas ausentes ficam com fator 1). Fatores negativos viram 0.
+    - desvio_pedido: ruído multiplicativo adicional, independente por pedido.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    volumes = np.asarray(volumes, dtype=np.float64)
+    media = np.array([incerteza_por_zona.get(z, (1.0, 0.0))[0] for z in zonas], dtype=np.float64)
+    desvio = np.array([incerteza_por_zona.get(z, (1.0, 0.0))[1] for z in zonas], dtype=np.float64)
+
+    fatores = np.maximum(rng.normal(media, desvio, size=(n_amostras, len(zonas))), 0.0)
+    demandas = volumes * fatores[:, zona_pedido]
+    if desvio_pedido:
+        demandas *= np.maximum(rng.normal(1.0, desvio_pedido, size=demandas.shape), 0.0)
+    return np.rint(demandas).astype(np.int64)
+
+
+def _capacidade_dos_cortes(capacidades, atende):
+    """
+    Para cada subconjunto S de zonas (bit z de S = zona z): a capacidade somada
+    dos veículos que atendem alguma zona de S. Retorna (subconjuntos x zonas, capacidade).
+    """
+    k = atende.shape[1]
+    subconjuntos = ((np.arange(2 ** k)[:, None] >> np.arange(k)) & 1).astype(np.float64)
+    vizinhos = (subconjuntos @ atende.T.astype(np.float64)) > 0
+    return subconjuntos, vizinhos @ np.asarray(capacidades, dtype=np.float64)
+
+
+def _deficit_pelos_cortes(demanda_zona, capacidades, atende):
+    """
+    Volume total que não cabe na frota, para cada amostra, sem rodar fluxo:
+    pelo teorema do corte mínimo na rede por zona, o déficit é
+    max(0, max_S demanda(S) - capacidade(vizinhos de S)).
+    """
+    subconjuntos, capacidade = _capacidade_dos_cortes(capacidades, atende)
+    deficit = np.empty(len(demanda_zona), dtype=np.float64)
+    for inicio in range(0, len(demanda_zona), TAMANHO_BLOCO):
+        bloco = demanda_zona[inicio:inicio + TAMANHO_BLOCO]
+        deficit[inicio:inicio + TAMANHO_BLOCO] = np.max(bloco @ subconjuntos.T - capacidade, axis=1)
+    return np.maximum(deficit, 0.0)
+
+
+def _nao_atendido_pelo_fluxo(volume_zona, zonas, veiculos):
+    """Volume de cada zona que fica fora do fluxo máximo da rede por zona."""
+    rede = build_zone_flow_network_from_totals(volume_zona, zonas, veiculos)
+    rede.multi_max_flow()
+    atendido = np.array([rede.flow(rede.source_edge[z]) for z in range(len(zonas))])
+    return np.maximum(volume_zona - atendido, 0.0)
+
+
+@dataclass
+class ResultadoMonteCarlo:
+    """
+    Amostras de demanda e o volume não atendido por zona.
+
+    - nao_atendido_fluxo: amostras x zonas, pela rede de fluxo por zona (todas as amostras).
+    - amostras_vrp / nao_atendido_vrp: as amostras que passaram pelo VRP completo
+      e o volume que ficou fora das rotas em cada uma (amostras_vrp x zonas).
+    """
+    zonas: list
+    demandas: np.ndarray
+    nao_atendido_fluxo: np.ndarray
+    amostras_vrp: np.ndarray
+    nao_atendido_vrp: np.ndarray
+
+    @property
+    def probabilidade_deficit(self):
+        """Fração das amostras em que a frota não comporta toda a demanda."""
+        return float(np.mean(self.nao_atendido_fluxo.sum(axis=1) > 0)) if len(self.demandas) else 0.0
+
+    def percentis(self, percentis=PERCENTIS, etapa="fluxo"):
+        """{zona (e "Total"): {percentil: volume não atendido}} da etapa "fluxo" ou "vrp"."""
+        valores = self.nao_atendido_fluxo if etapa == "fluxo" else self.nao_atendido_vrp
+        if not len(valores):
+            return {}
+        valores = np.column_stack([valores, valores.sum(axis=1)])
+        tabela = np.percentile(valores, percentis, axis=0)
+        return {
+            zona: {p: float(tabela[i, z]) for i, p in enumerate(percentis)}
+            for z, zona in enumerate(self.zonas + ["Total"])
+        }
+
+
+def simular_monte_carlo(pedidos, veiculos, incerteza_por_zona, n_amostras=1000, desvio_pedido=0.0,
+                        matriz_distancias=None, n_vrp=20, tempo_limite=5, semente=None,
+                        max_processos=None, penalidade_nao_atendimento=PENALIDADE_NAO_ATENDIMENTO):
+    """
+    Incerteza de demanda por Monte Carlo, para planejamento de capacidade.
+
+    Sorteia n_amostras matrizes de demanda (ver amostrar_demandas) e verifica
+    todas de uma vez contra a frota pela rede de fluxo agregada por zona; só as
+    amostras com déficit passam pelo fluxo máximo para repartir o volume não
+    atendido entre as zonas. Com matriz_distancias, n_vrp amostras espalhadas
+    pelos quantis do déficit vão para o VRP completo (simular_cenarios).
+    Aceita pedidos como objetos (cliente.zona, volume) ou um OrderBatch.
+    """
+    rng = np.random.default_rng(semente)
+    zona_pedido, zonas, volumes = zonas_e_volumes(pedidos)
+    capacidades, atende = capacidades_e_elegibilidade(veiculos, zonas)
+    k = len(zonas)
+
+    demandas = amostrar_demandas(volumes, zona_pedido, zonas, incerteza_por_zona, n_amostras,
+                                 desvio_pedido, rng)
+    demanda_zona = demandas @ np.eye(k)[zona_pedido]  # amostras x zonas
+
+    if k <= LIMITE_ZONAS_CORTE:
+        com_deficit = np.flatnonzero(_deficit_pelos_cortes(demanda_zona, capacidades, atende) > 1e-9)
+    else:
+        com_deficit = np.arange(n_amostras)
+    nao_atendido = np.zeros((n_amostras, k), dtype=np.float64)
+    for s in com_deficit.tolist():
+        nao_atendido[s] = _nao_atendido_pelo_fluxo(demanda_zona[s], zonas, veiculos)
+
+    amostras_vrp = np.empty(0, dtype=np.int64)
+    nao_atendido_vrp = np.empty((0, k), dtype=np.float64)
+    if matriz_distancias is not None and n_vrp and n_amostras:
+        # Amostras espaçadas na ordem do déficit (e da demanda total), cobrindo dos quantis baixos aos altos
+        ordem = np.lexsort((demanda_zona.sum(axis=1), nao_atendido.sum(axis=1)))
+        amostras_vrp = ordem[np.unique(np.linspace(0, n_amostras - 1, min(n_vrp, n_amostras)).astype(np.int64))]
+        cenarios = [Cenario(f"amostra {s}", demandas=demandas[s].tolist()) for s in amostras_vrp.tolist()]
+        linhas = simular_cenarios(matriz_distancias, _pedidos_por_zona(zona_pedido, zonas, volumes), veiculos,
+                                  cenarios, tempo_limite=tempo_limite, max_processos=max_processos,
+                                  penalidade_nao_atendimento=penalidade_nao_atendimento)
+        nao_atendido_vrp = np.array(
+            [[linha["nao_atendido_por_zona"][zona] for zona in zonas] for linha in linhas], dtype=np.float64
+        ).reshape(len(linhas), k)
+
+    return ResultadoMonteCarlo(zonas, demandas, nao_atendido, amostras_vrp, nao_atendido_vrp)
+
+
+def _pedidos_por_zona(zona_pedido, zonas, volumes):
+    # simular_cenarios só lê cliente.zona e volume de cada pedido
+    return [
+        SimpleNamespace(cliente=SimpleNamespace(zona=zonas[z]), volume=v)
+        for z, v in zip(zona_pedido.tolist(), volumes.tolist())
+    ]
+
+
+def tabela_percentis(resultado, percentis=PERCENTIS, etapa="fluxo"):
+    """Tabela de texto com os percentis do volume não atendido por zona."""
+    cabecalho = f"{'Zona':<20}" + "".join(f"{'p' + str(p):>12}" for p in percentis)
+    linhas = [cabecalho, "-" * len(cabecalho)]
+    for zona, valores in resultado.percentis(percentis, etapa).items():
+        linhas.append(f"{zona[:20]:<20}" + "".join(f"{valores[p]:>12,.1f}" for p in percentis))
+    return "\n".join(linhas)
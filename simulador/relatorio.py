@@ -1,37 +1,209 @@
-def gerar_relatorio(pedidos, veiculos, alocacoes, demandas_simuladas):
-    print("\n=== Relatório de Alocação de Pedidos ===\n")
-    
-    # Se alocacoes for None ou vazio, tratamos como sem alocações
-    if not alocacoes:
-        for v_id, veiculo in enumerate(veiculos):
-            print(f"Veículo {v_id} ({veiculo.tipo}):")
-            print("  - Nenhum pedido alocado\n")
+import csv
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.lote import OrderBatch, codificar_zonas
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # opcional: sem ele, os relatórios só podem ser gravados em CSV
+    pyarrow = None
+
+
+def _coluna(valores):
+    coluna = np.asarray(valores)
+    return coluna if coluna.size else coluna.astype(np.int64)  # listas vazias somam 0, não 0.0
+
+
+@dataclass
+class RelatorioAlocacao:
+    """
+    Resultado de uma alocação em colunas, pronto para agregar em lote.
+
+    Pedidos: pedido_ids, zona_pedido (código em zonas), prioridades e demandas.
+    Veículos: tipos e capacidades. Alocação: pares (alocacao_veiculo,
+    alocacao_pedido), na ordem recebida. Carga por veículo e demanda não
+    atendida por zona são calculadas com np.bincount.
+    """
+    pedido_ids: np.ndarray
+    zona_pedido: np.ndarray
+    zonas: list
+    prioridades: np.ndarray
+    demandas: np.ndarray
+    tipos: list
+    capacidades: np.ndarray
+    alocacao_veiculo: np.ndarray
+    alocacao_pedido: np.ndarray
+    veiculos_listados: int  # Veículos que aparecem na alocação (todos, se não houve alocação)
+
+    @property
+    def carga(self):
+        """Demanda alocada a cada veículo."""
+        carga = np.bincount(self.alocacao_veiculo, weights=self.demandas[self.alocacao_pedido],
+                            minlength=len(self.capacidades))
+        return carga.astype(self.demandas.dtype) if self.demandas.dtype.kind in "iu" else carga
+
+    @property
+    def pedidos_por_veiculo(self):
+        return np.bincount(self.alocacao_veiculo, minlength=len(self.capacidades))
+
+    @property
+    def capacidade_ociosa(self):
+        """Capacidade menos carga, por veículo (negativa se o veículo foi sobrecarregado)."""
+        return self.capacidades - self.carga
+
+    @property
+    def atendidos(self):
+        atendidos = np.zeros(len(self.demandas), dtype=bool)
+        atendidos[self.alocacao_pedido] = True
+        return atendidos
+
+    @property
+    def demanda_por_zona(self):
+        return self._por_zona(np.ones(len(self.demandas), dtype=bool))
+
+    @property
+    def nao_atendido_por_zona(self):
+        """Demanda dos pedidos que não estão em nenhum veículo, por zona."""
+        return self._por_zona(~self.atendidos)
+
+    def _por_zona(self, selecionados):
+        volume = np.bincount(self.zona_pedido[selecionados], weights=self.demandas[selecionados],
+                             minlength=len(self.zonas))
+        return volume.astype(self.demandas.dtype) if self.demandas.dtype.kind in "iu" else volume
+
+    @property
+    def totais(self):
+        """Demanda total, capacidade total, demanda alocada e capacidade ociosa total."""
+        alocada = self.carga.sum() if len(self.alocacao_pedido) else 0
+        return {
+            "demanda_total": self.demandas.sum(),
+            "capacidade_total": self.capacidades.sum(),
+            "demanda_alocada": alocada,
+            "capacidade_ociosa": self.capacidades.sum() - alocada,
+        }
+
+    def tabela_veiculos(self):
+        """Colunas por veículo: veiculo, tipo, capacidade, carga, capacidade_ociosa, pedidos."""
+        return {
+            "veiculo": np.arange(len(self.capacidades)),
+            "tipo": list(self.tipos),
+            "capacidade": self.capacidades,
+            "carga": self.carga,
+            "capacidade_ociosa": self.capacidade_ociosa,
+            "pedidos": self.pedidos_por_veiculo,
+        }
+
+    def tabela_zonas(self):
+        """Colunas por zona: zona, demanda, nao_atendido."""
+        return {
+            "zona": list(self.zonas),
+            "demanda": self.demanda_por_zona,
+            "nao_atendido": self.nao_atendido_por_zona,
+        }
+
+
+def montar_relatorio(pedidos, veiculos, alocacoes, demandas_simuladas):
+    """
+    Monta o RelatorioAlocacao. alocacoes é uma lista (por veículo) de índices
+    de pedidos, como as rotas de criar_modelo_vrp; None ou vazia = sem alocação.
+    Aceita pedidos como objetos Pedido ou um OrderBatch.
+    """
+    if isinstance(pedidos, OrderBatch):
+        pedido_ids, prioridades = pedidos.ids, pedidos.prioridade
+        zona_pedido, zonas = pedidos.zona, pedidos.zonas
     else:
-        for v_id, pedidos_ids in enumerate(alocacoes):
-            print(f"Veículo {v_id} ({veiculos[v_id].tipo}):")
-            if pedidos_ids:
-                for p_id in pedidos_ids:
-                    pedido = pedidos[p_id]
-                    demanda = demandas_simuladas[p_id]
-                    print(f"  - Pedido {pedido.id} (Zona {pedido.cliente.zona}, Demanda {demanda}, Prioridade {pedido.prioridade})")
-            else:
-                print("  - Nenhum pedido alocado")
-            print()
-
-    total_demandas = sum(demandas_simuladas)
-    total_capacidades = sum([v.capacidade for v in veiculos])
-
-    # Calcula total de demandas alocadas
-    total_demandas_alocadas = 0
-    if alocacoes:
-        for pedidos_ids in alocacoes:
-            for p_id in pedidos_ids:
-                total_demandas_alocadas += demandas_simuladas[p_id]
-
-    capacidade_ociosa = total_capacidades - total_demandas_alocadas
-
-    print(f"Demanda total simulada: {total_demandas}")
-    print(f"Capacidade total dos veículos: {total_capacidades}")
-    print(f"Demanda alocada total: {total_demandas_alocadas}")
-    print(f"Capacidade ociosa total: {capacidade_ociosa}")
-    print("=== Fim do Relatório ===\n")
+        pedido_ids = np.array([p.id for p in pedidos])
+        prioridades = np.array([p.prioridade for p in pedidos])
+        zona_pedido, zonas = codificar_zonas([p.cliente.zona for p in pedidos])
+
+    alocacoes = alocacoes or []
+    tamanhos = [len(ids) for ids in alocacoes]
+    alocacao_pedido = np.array([p for ids in alocacoes for p in ids], dtype=np.int64)
+    return RelatorioAlocacao(
+        pedido_ids=pedido_ids,
+        zona_pedido=np.asarray(zona_pedido),
+        zonas=list(zonas),
+        prioridades=prioridades,
+        demandas=_coluna(demandas_simuladas).reshape(len(pedido_ids)),
+        tipos=[str(v.tipo) for v in veiculos],
+        capacidades=_coluna([v.capacidade for v in veiculos]),
+        alocacao_veiculo=np.repeat(np.arange(len(alocacoes), dtype=np.int64), tamanhos),
+        alocacao_pedido=alocacao_pedido,
+        veiculos_listados=len(alocacoes) if alocacoes else len(veiculos),
+    )
+
+
+def renderizar_relatorio(relatorio):
+    """Texto do relatório para o console (o mesmo que gerar_relatorio sempre imprimiu)."""
+    linhas = ["", "=== Relatório de Alocação de Pedidos ===", ""]
+    inicio_veiculo = np.searchsorted(relatorio.alocacao_veiculo, np.arange(relatorio.veiculos_listados + 1))
+    ids, prioridades = relatorio.pedido_ids.tolist(), relatorio.prioridades.tolist()
+    demandas, zonas = relatorio.demandas.tolist(), relatorio.zona_pedido.tolist()
+    for v_id in range(relatorio.veiculos_listados):
+        linhas.append(f"Veículo {v_id} ({relatorio.tipos[v_id]}):")
+        alocados = relatorio.alocacao_pedido[inicio_veiculo[v_id]:inicio_veiculo[v_id + 1]].tolist()
+        for p_id in alocados:
+            linhas.append(
+                f"  - Pedido {ids[p_id]} (Zona {relatorio.zonas[zonas[p_id]]}, "
+                f"Demanda {demandas[p_id]}, Prioridade {prioridades[p_id]})"
+            )
+        if not alocados:
+            linhas.append("  - Nenhum pedido alocado")
+        linhas.append("")
+
+    totais = {chave: getattr(valor, "item", lambda: valor)() for chave, valor in relatorio.totais.items()}
+    linhas += [
+        f"Demanda total simulada: {totais['demanda_total']}",
+        f"Capacidade total dos veículos: {totais['capacidade_total']}",
+        f"Demanda alocada total: {totais['demanda_alocada']}",
+        f"Capacidade ociosa total: {totais['capacidade_ociosa']}",
+        "=== Fim do Relatório ===",
+        "",
+    ]
+    return "\n".join(linhas) + "\n"
+
+
+def gerar_relatorio(pedidos, veiculos, alocacoes, demandas_simuladas):
+    """Imprime o relatório de alocação e devolve o RelatorioAlocacao correspondente."""
+    relatorio = montar_relatorio(pedidos, veiculos, alocacoes, demandas_simuladas)
+    print(renderizar_relatorio(relatorio), end="")
+    return relatorio
+
+
+def tabela_relatorios(relatorios, tabela="veiculos"):
+    """
+    Junta as tabelas ("veiculos" ou "zonas") de vários relatórios em colunas
+    únicas, com a coluna execucao indicando a posição de cada relatório na lista.
+    """
+    partes = [getattr(r, f"tabela_{tabela}")() for r in relatorios]
+    if not partes:
+        return {}
+    colunas = {"execucao": np.repeat(np.arange(len(partes)), [len(next(iter(p.values()))) for p in partes])}
+    for nome in partes[0]:
+        colunas[nome] = np.concatenate([np.asarray(p[nome]) for p in partes])
+    return colunas
+
+
+def salvar_relatorios(relatorios, caminho, tabela="veiculos"):
+    """
+    Grava a tabela juntada de vários relatórios (ver tabela_relatorios) em
+    Parquet (.parquet, precisa de pyarrow) ou CSV (qualquer outra extensão).
+    Retorna o número de linhas gravadas.
+    """
+    colunas = tabela_relatorios(relatorios, tabela)
+    total = len(colunas["execucao"]) if colunas else 0
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    if caminho.endswith(".parquet"):
+        if pyarrow is None:
+            raise ImportError("Para gravar relatórios em Parquet instale o pyarrow (pip install pyarrow).")
+        pyarrow.parquet.write_table(pyarrow.table(colunas), caminho)
+        return total
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(list(colunas))
+        escritor.writerows(zip(*(valores.tolist() for valores in colunas.values())))
+    return total
@@ -1,12 +1,14 @@
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 
+PENALIDADE_BLOQUEIO = 1000000  # Custo de um trecho bloqueado
+
 def simular_bloqueio_rotas(matriz_distancias, rotas_bloqueadas):
     """
     Recebe matriz de distâncias e uma lista de pares (i,j) de rotas bloqueadas.
     Para rotas bloqueadas, coloca um custo muito alto para simular bloqueio.
     """
-    penalidade = 1000000  # Valor muito alto para simular o bloqueio
+    penalidade = PENALIDADE_BLOQUEIO  # Valor muito alto para simular o bloqueio
     n = len(matriz_distancias)
     nova_matriz = [row[:] for row in matriz_distancias]  # Cria uma cópia da matriz original
 
@@ -16,6 +18,15 @@ def simular_bloqueio_rotas(matriz_distancias, rotas_bloqueadas):
             nova_matriz[j][i] = penalidade  # Matriz simétrica
     return nova_matriz
 
+def simular_bloqueio_ruas(matriz_osm, arestas_bloqueadas):
+    """
+    Bloqueio aplicado na rede de ruas, e não só entre pedidos: recebe uma
+    grafos.bloqueios.MatrizComBloqueios e as arestas OSM (u, v) fechadas.
+    Retorna uma nova MatrizComBloqueios em que só as linhas afetadas foram
+    recalculadas; a matriz recebida não é alterada.
+    """
+    return matriz_osm.com_bloqueios(arestas_bloqueadas)
+
 def simular_aumento_demanda(pedidos, aumento_por_zona):
     """
     Retorna uma nova lista de volumes de pedidos, ajustando os volumes
@@ -34,7 +45,12 @@ def simular_aumento_demanda(pedidos, aumento_por_zona):
 
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 
-def criar_modelo_vrp(matriz, demandas, capacidades, num_veiculos, zonas_pedidos, veiculos):
+def criar_modelo_vrp(matriz, demandas, capacidades, num_veiculos, zonas_pedidos, veiculos,
+                     penalidade_nao_atendimento=None, tempo_limite=10):
+    """
+    Com penalidade_nao_atendimento, cada pedido pode ficar fora das rotas a esse
+    custo (em vez de o modelo ficar inviável quando a demanda passa da capacidade).
+    """
     num_pedidos = len(demandas)
     depot = 0  # Ponto de partida fictício
 
@@ -50,21 +66,12 @@ def criar_modelo_vrp(matriz, demandas, capacidades, num_veiculos, zonas_pedidos,
     # Cria o modelo de roteamento
     routing = pywrapcp.RoutingModel(manager)
 
-    # Função de distância
-    def distance_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        return nova_matriz[from_node][to_node]
-
-    transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+    # Distâncias (matriz avaliada em C++, sem callback Python)
+    transit_callback_index = routing.RegisterTransitMatrix(nova_matriz)
     routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
     # Adiciona a restrição de capacidade
-    def demand_callback(from_index):
-        from_node = manager.IndexToNode(from_index)
-        return nova_demanda[from_node]
-
-    demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+    demand_callback_index = routing.RegisterUnaryTransitVector(nova_demanda)
     routing.AddDimensionWithVehicleCapacity(
         demand_callback_index,
         0,  # sem capacidade extra
@@ -81,11 +88,15 @@ def criar_modelo_vrp(matriz, demandas, capacidades, num_veiculos, zonas_pedidos,
                 index = manager.NodeToIndex(pedido_index)
                 routing.VehicleVar(index).RemoveValue(veiculo_id)
 
+    if penalidade_nao_atendimento is not None:
+        for pedido_index in range(1, num_pedidos + 1):
+            routing.AddDisjunction([manager.NodeToIndex(pedido_index)], penalidade_nao_atendimento)
+
     # Configura parâmetros do solver
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
     search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
     search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-    search_parameters.time_limit.seconds = 10
+    search_parameters.time_limit.seconds = tempo_limite
 
     # Resolve o problema
     solution = routing.SolveWithParameters(search_parameters)
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+
+import networkx as nx
+import numpy as np
+
+from grafos.bloqueios import MatrizComBloqueios, arestas_da_via
+from grafos.matriz_distancias import matriz_distancias
+
+
+def criar_cidade(lado, seed=0):
+    """Grade lado x lado de ruas de mão dupla; cada coluna é uma "Avenida j", cada linha uma "Rua i"."""
+    rnd = random.Random(seed)
+    G = nx.MultiDiGraph()
+    for i in range(lado):
+        for j in range(lado):
+            no = i * lado + j
+            if j + 1 < lado:
+                peso = rnd.randint(50, 150)
+                G.add_edge(no, no + 1, length=peso, name=f"Rua {i}")
+                G.add_edge(no + 1, no, length=peso, name=f"Rua {i}")
+            if i + 1 < lado:
+                peso = rnd.randint(50, 150)
+                G.add_edge(no, no + lado, length=peso, name=f"Avenida {j}")
+                G.add_edge(no + lado, no, length=peso, name=f"Avenida {j}")
+    return G
+
+
+def medir(lado, n_paradas, n_quadras):
+    rnd = random.Random(1)
+    G = criar_cidade(lado)
+    nodos = rnd.sample(list(G.nodes), n_paradas)
+
+    inicio = time.perf_counter()
+    base = MatrizComBloqueios(G, nodos)
+    t_preparo = time.perf_counter() - inicio
+
+    # Fecha n_quadras seguidas de uma avenida (obra, evento)
+    j = rnd.randrange(lado)
+    i = rnd.randrange(lado - n_quadras)
+    trecho = set(range((i * lado) + j, ((i + n_quadras) * lado) + j + 1, lado))
+    fechadas = [(u, v) for u, v in arestas_da_via(G, f"Avenida {j}") if u in trecho and v in trecho]
+
+    inicio = time.perf_counter()
+    bloqueada = base.com_bloqueios(fechadas)
+    t_incremental = time.perf_counter() - inicio
+
+    sem_trecho = G.copy()
+    sem_trecho.remove_edges_from(fechadas)
+    inicio = time.perf_counter()
+    esperado = matriz_distancias(sem_trecho, nodos)
+    t_completo = time.perf_counter() - inicio
+
+    assert np.array_equal(bloqueada.matriz(), esperado)
+    print(
+        f"{G.number_of_nodes():>7} nós, {n_paradas:>4} paradas, {n_quadras:>2} quadras fechadas | "
+        f"preparo {t_preparo:6.2f}s | linhas refeitas {len(bloqueada.linhas_alteradas):>4} | "
+        f"incremental {t_incremental * 1000:8.1f} ms | matriz inteira {t_completo * 1000:8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for lado, n_paradas, n_quadras in [(100, 200, 1), (200, 300, 1), (200, 300, 5), (200, 300, 40)]:
+        medir(lado, n_paradas, n_quadras)
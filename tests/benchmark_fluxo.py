@@ -0,0 +1,176 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+import tracemalloc
+from types import SimpleNamespace
+from fluxo.ford_fulkerson import ExtendedDinic, ExtendedMaxFlow
+from fluxo.network_builder import (
+    build_flow_network,
+    build_zone_flow_network,
+    cancel_order,
+    get_order_allocations,
+    set_vehicle_availability,
+)
+
+
+def criar_instancia(n_pedidos, n_veiculos, n_zonas=20, zonas_por_veiculo=3):
+    """Bipartido pedidos x veículos com arestas pelas zonas permitidas de cada veículo."""
+    zonas_pedidos = [random.randrange(n_zonas) for _ in range(n_pedidos)]
+    zonas_veiculos = [set(random.sample(range(n_zonas), zonas_por_veiculo)) for _ in range(n_veiculos)]
+    volumes = [random.randint(1, 30) for _ in range(n_pedidos)]
+    capacidades = [random.randint(500, 3000) for _ in range(n_veiculos)]
+    arestas = [
+        (i, j) for i in range(n_pedidos) for j in range(n_veiculos)
+        if zonas_pedidos[i] in zonas_veiculos[j]
+    ]
+    return volumes, capacidades, arestas
+
+
+def construir(classe, volumes, capacidades, arestas):
+    n, m = len(volumes), len(capacidades)
+    flow = classe(n + m)
+    if hasattr(flow, "add_edges"):
+        flow.add_edges([i for i, _ in arestas], [n + j for _, j in arestas], [volumes[i] for i, _ in arestas])
+    else:
+        for i, j in arestas:
+            flow.add_edge(i, n + j, volumes[i])
+    flow.add_multi_sources(range(n), volumes)
+    flow.add_multi_sinks([n + j for j in range(m)], capacidades)
+    return flow
+
+
+def medir(classe, volumes, capacidades, arestas):
+    inicio = time.perf_counter()
+    flow = construir(classe, volumes, capacidades, arestas)
+    t_construcao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    valor = flow.multi_max_flow()
+    t_fluxo = time.perf_counter() - inicio
+
+    # Memória ocupada pela rede construída (medida à parte para não distorcer os tempos)
+    tracemalloc.start()
+    flow = construir(classe, volumes, capacidades, arestas)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return valor, t_construcao, t_fluxo, memoria / 2**20
+
+
+def caminho_longo(classe, n):
+    """Cadeia de n nós: o DFS recursivo estoura o limite de recursão padrão."""
+    flow = classe(n)
+    for v in range(n - 1):
+        flow.add_edge(v, v + 1, 1)
+    flow.add_multi_sources([0], [1])
+    flow.add_multi_sinks([n - 1], [1])
+    try:
+        return flow.multi_max_flow()
+    except RecursionError:
+        return "RecursionError"
+
+
+def benchmark(n_pedidos=10000, n_veiculos=100):
+    volumes, capacidades, arestas = criar_instancia(n_pedidos, n_veiculos)
+    print(f"{n_pedidos} pedidos x {n_veiculos} veículos, {len(arestas)} arestas pedido-veículo\n")
+
+    motores = (("MaxFlow (objetos/recursivo)", ExtendedMaxFlow),
+               ("Dinic (arrays/iterativo)", ExtendedDinic))
+    resultados = {}
+    for nome, classe in motores:
+        valor, t_construcao, t_fluxo, memoria = medir(classe, volumes, capacidades, arestas)
+        resultados[nome] = (valor, t_construcao + t_fluxo, memoria)
+        print(
+            f"{nome:<28} construção {t_construcao:7.3f} s  fluxo {t_fluxo:7.3f} s  "
+            f"rede {memoria:6.1f} MiB  valor {valor:g}"
+        )
+
+    (v_antigo, t_antigo, m_antigo), (v_novo, t_novo, m_novo) = resultados.values()
+    assert v_antigo == v_novo, "Os dois motores devem achar o mesmo fluxo máximo"
+    print(f"\nSpeedup total: {t_antigo / t_novo:.1f}x, memória: {m_antigo / m_novo:.1f}x menor")
+
+    print("\nCaminho com 5000 nós:")
+    for nome, classe in motores:
+        print(f"{nome:<28} {caminho_longo(classe, 5000)}")
+
+
+def benchmark_zonas(n_pedidos=100000, n_veiculos=100, n_zonas=20, zonas_por_veiculo=3):
+    zonas = [f"Zona {z}" for z in range(n_zonas)]
+    pedidos = [
+        SimpleNamespace(cliente=SimpleNamespace(zona=random.choice(zonas)),
+                        volume=random.randint(1, 30), prioridade=random.randint(1, 5))
+        for _ in range(n_pedidos)
+    ]
+    veiculos = [
+        SimpleNamespace(capacidade=random.randint(5000, 30000),
+                        zonas_permitidas=random.sample(zonas, zonas_por_veiculo))
+        for _ in range(n_veiculos)
+    ]
+    print(f"\nRede por pedido x rede por zona: {n_pedidos} pedidos, {n_veiculos} veículos, {n_zonas} zonas")
+
+    inicio = time.perf_counter()
+    flow = build_flow_network(pedidos, veiculos)
+    valor_pedidos = flow.multi_max_flow()
+    t_pedidos = time.perf_counter() - inicio
+    print(f"Por pedido: {len(flow.to) // 2:>8} arcos  {t_pedidos:7.3f} s")
+
+    inicio = time.perf_counter()
+    flow = build_zone_flow_network(pedidos, veiculos)
+    valor_zonas = flow.multi_max_flow()
+    get_order_allocations(flow, pedidos)
+    t_zonas = time.perf_counter() - inicio
+    print(f"Por zona:   {len(flow.to) // 2:>8} arcos  {t_zonas:7.3f} s (incluindo a distribuição por pedido)")
+
+    assert valor_pedidos == valor_zonas
+    print(f"Speedup: {t_pedidos / t_zonas:.1f}x")
+
+
+def benchmark_incremental(n_pedidos=10000, n_veiculos=100, n_zonas=20, n_mudancas=20):
+    zonas = [f"Zona {z}" for z in range(n_zonas)]
+    pedidos = [
+        SimpleNamespace(cliente=SimpleNamespace(zona=random.choice(zonas)),
+                        volume=random.randint(1, 30), prioridade=1)
+        for _ in range(n_pedidos)
+    ]
+    veiculos = [
+        SimpleNamespace(capacidade=random.randint(500, 3000), zonas_permitidas=random.sample(zonas, 3))
+        for _ in range(n_veiculos)
+    ]
+    flow = build_flow_network(pedidos, veiculos)
+    flow.multi_max_flow()
+    print(f"\nReplanejamento: {n_mudancas} mudanças (pedido cancelado ou veículo indisponível), rede por pedido")
+
+    cancelados, indisponiveis = set(), set()
+    t_incremental = t_reconstrucao = 0.0
+    for k in range(n_mudancas):
+        inicio = time.perf_counter()
+        if k % 2:
+            j = random.choice([j for j in range(n_veiculos) if j not in indisponiveis])
+            indisponiveis.add(j)
+            set_vehicle_availability(flow, j, False, veiculos[j].capacidade)
+        else:
+            i = random.choice([i for i in range(n_pedidos) if i not in cancelados])
+            cancelados.add(i)
+            cancel_order(flow, pedidos, i)
+        t_incremental += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        novo = build_flow_network(
+            [p for i, p in enumerate(pedidos) if i not in cancelados],
+            [v for j, v in enumerate(veiculos) if j not in indisponiveis],
+        )
+        novo.multi_max_flow()
+        t_reconstrucao += time.perf_counter() - inicio
+        assert abs(novo.total_flow - flow.total_flow) < 1e-6
+
+    print(f"Incremental:   {1000 * t_incremental / n_mudancas:8.2f} ms por mudança")
+    print(f"Reconstrução:  {1000 * t_reconstrucao / n_mudancas:8.2f} ms por mudança")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    benchmark()
+    benchmark_zonas()
+    benchmark_incremental()
@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+import networkx as nx
+from grafos.matriz_distancias import matriz_distancias
+from grafos.indice_rotas import IndiceRotas
+
+
+def criar_grade(lado):
+    """Grade dirigida lado x lado com comprimentos aleatórios, parecida com uma malha urbana."""
+    G = nx.MultiDiGraph()
+    for x in range(lado):
+        for y in range(lado):
+            no = x * lado + y
+            if x + 1 < lado:
+                G.add_edge(no, no + lado, length=random.uniform(50, 200))
+                G.add_edge(no + lado, no, length=random.uniform(50, 200))
+            if y + 1 < lado:
+                G.add_edge(no, no + 1, length=random.uniform(50, 200))
+                G.add_edge(no + 1, no, length=random.uniform(50, 200))
+    return G
+
+
+def matriz_networkx(G, nodos):
+    n = len(nodos)
+    matriz = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                matriz[i][j] = int(nx.shortest_path_length(G, nodos[i], nodos[j], weight="length"))
+    return matriz
+
+
+def benchmark(lado=100, n_clientes=500, n_pedidos=20):
+    print(f"Grade {lado}x{lado} ({lado * lado} nós), {n_clientes} clientes conhecidos, {n_pedidos} pedidos\n")
+    G = criar_grade(lado)
+    clientes = random.sample(list(G.nodes), n_clientes)
+    pedidos = random.sample(clientes, n_pedidos)
+
+    inicio = time.perf_counter()
+    referencia = matriz_networkx(G, pedidos)
+    t_nx = time.perf_counter() - inicio
+    print(f"networkx (par a par):        {t_nx:.4f} s")
+
+    inicio = time.perf_counter()
+    motor = matriz_distancias(G, pedidos)
+    t_motor = time.perf_counter() - inicio
+    print(f"csgraph (multi-origem):      {t_motor:.4f} s")
+
+    inicio = time.perf_counter()
+    indice = IndiceRotas.construir(G, clientes)
+    t_construcao = time.perf_counter() - inicio
+    print(f"Construção do índice:        {t_construcao:.4f} s (uma vez)")
+
+    inicio = time.perf_counter()
+    consulta = indice.matriz(pedidos)
+    t_consulta = time.perf_counter() - inicio
+    print(f"Índice (muitos-para-muitos): {t_consulta * 1e6:.1f} µs")
+
+    repeticoes = 10000
+    pares = [(random.choice(clientes), random.choice(clientes)) for _ in range(repeticoes)]
+    inicio = time.perf_counter()
+    for u, v in pares:
+        indice.distancia(u, v)
+    t_ponto = (time.perf_counter() - inicio) / repeticoes
+    print(f"Índice (ponto a ponto):      {t_ponto * 1e6:.2f} µs por consulta")
+
+    assert motor.tolist() == referencia
+    assert consulta.tolist() == referencia
+    print("\nResultados idênticos nas três abordagens.")
+
+
+if __name__ == "__main__":
+    benchmark()
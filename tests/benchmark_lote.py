@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+import tracemalloc
+
+from fluxo.network_builder import build_zone_flow_network, get_vehicle_hints
+from main_api import ClienteModel, PedidoModel, VeiculoModel
+from models.cliente import Cliente
+from models.enums import StatusPedido, TipoVeiculo
+from models.lote import OrderBatch, VehicleBatch
+from models.pedido import Pedido
+from models.veiculo import Veiculo
+
+
+def criar_requisicao(n_pedidos, n_clientes, n_veiculos):
+    zonas = [f"Zona {z}" for z in range(1, 9)]
+    clientes = [
+        ClienteModel(id=i, nome=f"Cliente {i}", zona=random.choice(zonas),
+                     latitude=random.uniform(-9.7, -9.5), longitude=random.uniform(-35.8, -35.6))
+        for i in range(n_clientes)
+    ]
+    pedidos = [
+        PedidoModel(id=i, cliente_id=random.randrange(n_clientes), volume=random.randint(1, 20),
+                    prioridade=random.randint(1, 5))
+        for i in range(n_pedidos)
+    ]
+    veiculos = [
+        VeiculoModel(id=j, tipo="VAN", capacidade=random.randint(100, 400), disponivel=True,
+                     zonas_permitidas=random.sample(zonas, 3))
+        for j in range(n_veiculos)
+    ]
+    return clientes, pedidos, veiculos
+
+
+def com_objetos(clientes, pedidos, veiculos):
+    """Como era em optimize_routes: um Cliente por pedido, Pedido e Veiculo do domínio."""
+    por_id = {c.id: c for c in clientes}
+    objetos = []
+    for p in pedidos:
+        c = por_id[p.cliente_id]
+        cliente = Cliente(c.id, c.nome, c.zona, c.latitude, c.longitude, c.endereco)
+        objetos.append(Pedido(p.id, cliente, p.volume, p.prioridade, StatusPedido[p.status.name]))
+    frota = [Veiculo(v.id, TipoVeiculo[v.tipo.name], v.capacidade, v.disponivel, v.zonas_permitidas)
+             for v in veiculos]
+    rede = build_zone_flow_network(objetos, frota)
+    rede.multi_max_flow()
+    get_vehicle_hints(rede, objetos, frota)
+    return objetos
+
+
+def com_lotes(clientes, pedidos, veiculos):
+    lote = OrderBatch.de_modelos(pedidos, clientes)
+    frota = VehicleBatch.de_modelos(veiculos)
+    rede = build_zone_flow_network(lote, frota)
+    rede.multi_max_flow()
+    get_vehicle_hints(rede, lote, frota)
+    return lote
+
+
+def medir(funcao, requisicao, repeticoes=3):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(*requisicao)
+    tempo = (time.perf_counter() - inicio) / repeticoes
+
+    # Memória medida à parte, para não distorcer o tempo
+    tracemalloc.start()
+    resultado = funcao(*requisicao)
+    retido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return tempo, retido
+
+
+def benchmark(n_pedidos=50_000, n_clientes=20_000, n_veiculos=100):
+    print(f"{n_pedidos} pedidos de {n_clientes} clientes, {n_veiculos} veículos "
+          "(conversão + rede de fluxo por zona + dicas para o VRP)\n")
+    requisicao = criar_requisicao(n_pedidos, n_clientes, n_veiculos)
+    resultados = {}
+    for nome, funcao in (("objetos do domínio", com_objetos), ("lotes em colunas", com_lotes)):
+        tempo, retido = medir(funcao, requisicao)
+        resultados[nome] = (tempo, retido)
+        print(f"{nome:<20} {tempo * 1000:8.1f} ms  memória retida {retido / 1e6:6.1f} MB")
+
+    (t_obj, m_obj), (t_lote, m_lote) = resultados.values()
+    print(f"\n{t_obj / t_lote:.1f}x mais rápido, {m_obj / m_lote:.1f}x menos memória")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    benchmark()
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from simulador import monte_carlo
+from simulador.monte_carlo import simular_monte_carlo
+from simulador.simulador import simular_aumento_demanda
+
+
+def criar_instancia(n_pedidos, n_zonas, n_veiculos, seed=0):
+    rnd = random.Random(seed)
+    zonas = [f"Zona {i + 1}" for i in range(n_zonas)]
+    pedidos = [SimpleNamespace(cliente=SimpleNamespace(zona=rnd.choice(zonas)), volume=rnd.randint(1, 20))
+               for _ in range(n_pedidos)]
+    capacidade = sum(p.volume for p in pedidos) * 11 // (10 * n_veiculos)  # ~10% de folga
+    veiculos = [SimpleNamespace(capacidade=capacidade,
+                                zonas_permitidas=None if j % 3 == 0 else rnd.sample(zonas, 2))
+                for j in range(n_veiculos)]
+    return zonas, pedidos, veiculos
+
+
+def medir(n_pedidos, n_zonas, n_veiculos, n_amostras):
+    zonas, pedidos, veiculos = criar_instancia(n_pedidos, n_zonas, n_veiculos)
+    incerteza = {z: (1.0, 0.2) for z in zonas}
+
+    # Referência: um laço Python por amostra (simular_aumento_demanda) + fluxo máximo por amostra
+    rng = np.random.default_rng(0)
+    ordenadas = sorted(zonas)
+    indice = {z: i for i, z in enumerate(ordenadas)}
+    inicio = time.perf_counter()
+    for _ in range(n_amostras):
+        fatores = dict(zip(zonas, np.maximum(rng.normal(1.0, 0.2, len(zonas)), 0).tolist()))
+        demandas = simular_aumento_demanda(pedidos, fatores)
+        volume_zona = np.zeros(len(zonas))
+        for p, d in zip(pedidos, demandas):
+            volume_zona[indice[p.cliente.zona]] += d
+        monte_carlo._nao_atendido_pelo_fluxo(volume_zona, ordenadas, veiculos)
+    t_laco = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultado = simular_monte_carlo(pedidos, veiculos, incerteza, n_amostras=n_amostras, semente=0)
+    t_vetorizado = time.perf_counter() - inicio
+
+    print(
+        f"{n_pedidos:>6} pedidos, {n_zonas:>2} zonas, {n_amostras:>6} amostras | "
+        f"laço {t_laco:7.2f}s | vetorizado {t_vetorizado:6.2f}s ({t_laco / t_vetorizado:5.1f}x) | "
+        f"P(déficit) {resultado.probabilidade_deficit:.2%}"
+    )
+
+
+if __name__ == "__main__":
+    for n_pedidos, n_zonas, n_veiculos, n_amostras in [(500, 6, 12, 2000), (2000, 10, 30, 5000)]:
+        medir(n_pedidos, n_zonas, n_veiculos, n_amostras)
@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import json
+import random
+import time
+import tracemalloc
+
+try:
+    import orjson
+except ImportError:  # opcional, como em main_api: sem ele o caminho rápido usa o módulo json
+    orjson = None
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from main_api import (
+    ClienteModel,
+    OptimizationResponse,
+    RouteSegment,
+    VehicleRoute,
+    PedidoModel,
+    VeiculoModel,
+    montar_rotas_resposta,
+)
+from models.lote import OrderBatch, VehicleBatch
+
+
+def criar_instancia(n_paradas, n_veiculos):
+    clientes = {
+        i: ClienteModel(id=i, nome=f"Cliente {i}", zona=f"Zona {1 + i % 5}",
+                        latitude=random.uniform(-9.7, -9.5), longitude=random.uniform(-35.8, -35.6),
+                        endereco=f"Rua {i}")
+        for i in range(n_paradas + 1)
+    }
+    pedidos = [PedidoModel(id=i, cliente_id=c.id, volume=random.randint(1, 20), prioridade=1)
+               for i, c in clientes.items()]
+    veiculos = [VeiculoModel(id=j, tipo="VAN", capacidade=10_000, disponivel=True) for j in range(n_veiculos)]
+    paradas = list(range(1, n_paradas + 1))
+    por_veiculo = -(-n_paradas // n_veiculos)
+    solucao = [
+        {"vehicle_id": j, "route_indices": [0] + paradas[j * por_veiculo:(j + 1) * por_veiculo] + [0],
+         "total_distance": random.randint(1000, 50000)}
+        for j in range(n_veiculos)
+    ]
+    # Os lotes em colunas já existem nessa etapa (são montados antes do fluxo e do VRP)
+    lote = OrderBatch.de_modelos(pedidos, list(clientes.values()))
+    return solucao, veiculos, pedidos, clientes, VehicleBatch.de_modelos(veiculos), lote
+
+
+def caminho_atual(solucao, veiculos, pedidos, clientes, frota, lote):
+    """Como antes: um RouteSegment por parada, dump no worker, revalidação e encode via response_model."""
+    rotas = []
+    for info in solucao:
+        veiculo = veiculos[info["vehicle_id"]]
+        segmentos = []
+        total = 0.0
+        for idx in info["route_indices"]:
+            pedido = pedidos[idx]
+            c = clientes[pedido.cliente_id]
+            segmentos.append(RouteSegment(
+                pedido_id=pedido.id, cliente_id=c.id, cliente_nome=c.nome, latitude=c.latitude,
+                longitude=c.longitude, volume=pedido.volume if idx != 0 else 0.0, endereco=c.endereco,
+            ))
+            if idx != 0:
+                total += pedido.volume
+        rotas.append(VehicleRoute(vehicle_id=veiculo.id, vehicle_type=veiculo.tipo.name, route=segmentos,
+                                  total_volume=total, total_distance=info["total_distance"]))
+    resposta = OptimizationResponse(message="ok", routes=rotas, allocations={0: 1.0})
+    dados = resposta.model_dump(mode="json")  # volta do pool de processos
+    no_endpoint = OptimizationResponse(**dados)
+    validada = TypeAdapter(OptimizationResponse).validate_python(no_endpoint)  # response_model
+    return JSONResponse(jsonable_encoder(validada)).body
+
+
+def caminho_rapido(solucao, veiculos, pedidos, clientes, frota, lote):
+    rotas = montar_rotas_resposta(solucao, frota, lote)
+    corpo = {"message": "ok", "routes": rotas, "allocations": {0: 1.0}}
+    if orjson is None:
+        return json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+    return orjson.dumps(corpo, option=orjson.OPT_NON_STR_KEYS)
+
+
+def medir(funcao, instancia, repeticoes=5):
+    funcao(*instancia)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        corpo = funcao(*instancia)
+    tempo = (time.perf_counter() - inicio) / repeticoes
+
+    # Memória medida à parte, para não distorcer o tempo
+    tracemalloc.start()
+    funcao(*instancia)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico, corpo
+
+
+def benchmark(n_paradas=5000, n_veiculos=50):
+    print(f"Resposta com {n_paradas} paradas em {n_veiculos} rotas\n")
+    instancia = criar_instancia(n_paradas, n_veiculos)
+    resultados = {}
+    rapido = "dicts + orjson" if orjson is not None else "dicts + json"
+    for nome, funcao in (("Pydantic + response_model", caminho_atual), (rapido, caminho_rapido)):
+        tempo, pico, corpo = medir(funcao, instancia)
+        resultados[nome] = (tempo, pico, corpo)
+        print(f"{nome:<26} {tempo * 1000:8.1f} ms  pico de memória {pico / 1e6:7.1f} MB  {len(corpo) / 1e6:.2f} MB de JSON")
+
+    (t_atual, m_atual, c_atual), (t_rapido, m_rapido, c_rapido) = resultados.values()
+    assert OptimizationResponse.model_validate_json(c_atual) == OptimizationResponse.model_validate_json(c_rapido)
+    print(f"\n{t_atual / t_rapido:.1f}x mais rápido, {m_atual / m_rapido:.1f}x menos memória; mesmo JSON")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    benchmark()
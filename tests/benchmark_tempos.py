@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+
+import networkx as nx
+
+from grafos.matriz_distancias import matriz_distancias, matriz_distancias_e_tempos, tempo_da_aresta
+
+
+def criar_cidade(lado, seed=0):
+    rnd = random.Random(seed)
+    G = nx.MultiDiGraph()
+    for i in range(lado):
+        for j in range(lado):
+            no = i * lado + j
+            for vizinho in ([no + 1] if j + 1 < lado else []) + ([no + lado] if i + 1 < lado else []):
+                dados = {"length": rnd.uniform(50, 150), "maxspeed": rnd.choice(["30", "40", "60", None])}
+                G.add_edge(no, vizinho, **dados)
+                G.add_edge(vizinho, no, **dados)
+    return G
+
+
+def medir(lado, n_paradas):
+    G = criar_cidade(lado)
+    nodos = random.Random(1).sample(list(G.nodes), n_paradas)
+    matriz_distancias_e_tempos(G, nodos[:2])  # monta as CSR (cache por grafo) fora da medição
+
+    inicio = time.perf_counter()
+    matriz_distancias(G, nodos)
+    t_distancia = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    matriz_distancias_e_tempos(G, nodos)
+    t_juntas = time.perf_counter() - inicio
+
+    # Alternativa: um segundo Dijkstra com o tempo como peso
+    for _, _, dados in G.edges(data=True):
+        dados["tempo"] = tempo_da_aresta(dados)
+    matriz_distancias(G, nodos[:2], weight="tempo")
+    inicio = time.perf_counter()
+    matriz_distancias(G, nodos, weight="tempo")
+    t_segunda = time.perf_counter() - inicio
+
+    print(
+        f"{G.number_of_nodes():>7} nós, {n_paradas:>4} paradas | só distância {t_distancia:6.2f}s | "
+        f"distância + tempo juntos {t_juntas:6.2f}s | dois cálculos {t_distancia + t_segunda:6.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    for lado, n_paradas in [(100, 200), (200, 300)]:
+        medir(lado, n_paradas)
@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+import random
+import time
+from ortools.constraint_solver import routing_enums_pb2
+from ortools.constraint_solver import pywrapcp
+
+
+def criar_instancia(n_pedidos, n_veiculos):
+    pontos = [(random.uniform(0, 10000), random.uniform(0, 10000)) for _ in range(n_pedidos + 1)]
+    matriz = [[int(abs(a[0] - b[0]) + abs(a[1] - b[1])) for b in pontos] for a in pontos]
+    demandas = [0] + [random.randint(1, 20) for _ in range(n_pedidos)]
+    capacidade = -(-sum(demandas) * 12 // (10 * n_veiculos))  # ~20% de folga
+    return matriz, demandas, [capacidade] * n_veiculos
+
+
+def resolver(matriz, demandas, capacidades, usar_callbacks, tempo_limite):
+    manager = pywrapcp.RoutingIndexManager(len(matriz), len(capacidades), 0)
+    routing = pywrapcp.RoutingModel(manager)
+
+    if usar_callbacks:
+        def distance_callback(from_index, to_index):
+            return matriz[manager.IndexToNode(from_index)][manager.IndexToNode(to_index)]
+
+        def demand_callback(from_index):
+            return demandas[manager.IndexToNode(from_index)]
+
+        transit = routing.RegisterTransitCallback(distance_callback)
+        demanda = routing.RegisterUnaryTransitCallback(demand_callback)
+    else:
+        transit = routing.RegisterTransitMatrix(matriz)
+        demanda = routing.RegisterUnaryTransitVector(demandas)
+
+    routing.SetArcCostEvaluatorOfAllVehicles(transit)
+    routing.AddDimensionWithVehicleCapacity(demanda, 0, capacidades, True, "Capacity")
+
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.time_limit.seconds = tempo_limite
+    search_parameters.first_solution_strategy = (
+        routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    )
+    search_parameters.local_search_metaheuristic = (
+        routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    )
+
+    inicio = time.perf_counter()
+    solution = routing.SolveWithParameters(search_parameters)
+    tempo = time.perf_counter() - inicio
+    solver = routing.solver()
+    return {
+        "tempo": tempo,
+        "custo": solution.ObjectiveValue() if solution else None,
+        "branches": solver.Branches(),
+        "failures": solver.Failures(),
+    }
+
+
+def benchmark(n_pedidos=200, n_veiculos=15, tempo_limite=10):
+    print(f"{n_pedidos} pedidos, {n_veiculos} veículos, limite de {tempo_limite} s por execução\n")
+    matriz, demandas, capacidades = criar_instancia(n_pedidos, n_veiculos)
+
+    resultados = {}
+    for nome, usar_callbacks in (("callbacks Python", True), ("matriz/vetor C++", False)):
+        r = resolver(matriz, demandas, capacidades, usar_callbacks, tempo_limite)
+        resultados[nome] = r
+        print(
+            f"{nome:<18} tempo {r['tempo']:6.2f} s  branches {r['branches']:>10}  "
+            f"failures {r['failures']:>10}  custo {r['custo']}"
+        )
+
+    base = resultados["callbacks Python"]
+    novo = resultados["matriz/vetor C++"]
+    if base["branches"]:
+        print(f"\nIterações de busca no mesmo tempo: {novo['branches'] / base['branches']:.1f}x")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    benchmark()
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import data_storage
+import main_api
+from armazenamento_sqlite import ArmazemSQLite
+from cache_respostas import CacheRespostas
+from models.cliente import Cliente
+from models.enums import StatusPedido, TipoVeiculo
+from models.pedido import Pedido
+from models.veiculo import Veiculo
+
+
+def _preparar_json(diretorio):
+    diretorio.mkdir()
+    clientes = [{"id": i, "nome": f"C{i}", "endereco": None, "zona": f"Zona {1 + i % 2}",
+                 "latitude": -9.6, "longitude": -35.7} for i in range(1, 7)]
+    pedidos = [{"id": 100 + i, "cliente": clientes[i % 6], "volume": i, "prioridade": 1 + i % 3,
+                "status": "ENTREGUE" if i % 4 == 0 else "PENDENTE"} for i in range(12)]
+    # Cliente 50 só existe embutido em pedidos.json
+    pedidos.append({"id": 200, "cliente": {"id": 50, "nome": "Solto", "zona": "Zona 3"},
+                    "volume": 1, "prioridade": 1, "status": "PENDENTE"})
+    veiculos = [{"id": 1, "tipo": "MOTO", "capacidade": 20, "disponivel": True},
+                {"id": 2, "tipo": "VAN", "capacidade": 80, "disponivel": False}]
+    (diretorio / "clientes.json").write_text(json.dumps(clientes))
+    (diretorio / "pedidos.json").write_text(json.dumps(pedidos))
+    (diretorio / "veiculos.json").write_text(json.dumps(veiculos))
+    return clientes, pedidos, veiculos
+
+
+def test_migracao_unica_e_filtros(tmp_path):
+    _preparar_json(tmp_path / "db_json")
+    armazem = ArmazemSQLite(str(tmp_path / "banco.sqlite3"))
+
+    assert armazem.migrar_json(str(tmp_path / "db_json")) == {"clientes": 7, "pedidos": 13, "veiculos": 2}
+    assert armazem.migrar_json(str(tmp_path / "db_json")) is None
+
+    zona2 = armazem.listar_pedidos(zona="Zona 2", status="PENDENTE")
+    assert zona2 and all(p["cliente_id"] % 2 == 1 and p["status"] == "PENDENTE" for p in zona2)
+    assert armazem.contar_pedidos(zona="Zona 2", status="PENDENTE") == len(zona2)
+    assert [p["id"] for p in armazem.listar_pedidos(limite=3, deslocamento=2)] == [102, 103, 104]
+    assert armazem.listar_veiculos(disponivel=False) == [
+        {"id": 2, "tipo": "VAN", "capacidade": 80, "disponivel": False, "zonas_permitidas": None}
+    ]
+
+
+def test_upsert_em_lote_por_id(tmp_path):
+    armazem = ArmazemSQLite(str(tmp_path / "banco.sqlite3"))
+    armazem.upsert_pedidos([{"id": i, "cliente_id": 1, "volume": 1, "prioridade": 1} for i in range(5)])
+    armazem.upsert_pedidos([{"id": 3, "cliente_id": 2, "volume": 9, "prioridade": 5, "status": "ENTREGUE"}])
+
+    assert armazem.contar_pedidos() == 5
+    assert armazem.listar_pedidos(cliente_id=2) == [
+        {"id": 3, "cliente_id": 2, "volume": 9, "prioridade": 5, "status": "ENTREGUE"}
+    ]
+    armazem.upsert_pedidos([], substituir=True)
+    assert armazem.contar_pedidos() == 0
+
+
+def test_substituir_clientes_mantem_os_que_tem_pedidos(tmp_path, monkeypatch):
+    (tmp_path / "db_json").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_storage, "BACKEND_ARMAZENAMENTO", "sqlite")
+    ana, bia, caio = Cliente(1, "Ana", "Zona 1"), Cliente(2, "Bia", "Zona 2"), Cliente(3, "Caio", "Zona 3")
+
+    data_storage.salvar_clientes([ana, bia, caio])
+    data_storage.salvar_pedidos([Pedido(10, bia, 5, 2)])
+    data_storage.salvar_clientes([ana])
+
+    assert [c.id for c in data_storage.carregar_clientes()] == [1, 2]
+    [pedido] = data_storage.carregar_pedidos()
+    assert pedido.cliente.nome == "Bia"
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_salvar_e_carregar_pelo_data_storage(tmp_path, monkeypatch, backend):
+    (tmp_path / "db_json").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_storage, "BACKEND_ARMAZENAMENTO", backend)
+    cliente = Cliente(1, "Ana", "Zona 4", -9.6, -35.7)
+    pedido = Pedido(10, cliente, 5, 2, StatusPedido.EM_TRANSPORTE)
+    veiculo = Veiculo(3, TipoVeiculo.CARRO, 40, zonas_permitidas=["Zona 4"])
+
+    data_storage.salvar_clientes([cliente])
+    data_storage.salvar_pedidos([pedido])
+    data_storage.salvar_veiculos([veiculo])
+
+    [pedido_lido] = data_storage.carregar_pedidos()
+    assert pedido_lido.cliente.zona == "Zona 4" and pedido_lido.status == StatusPedido.EM_TRANSPORTE
+    [veiculo_lido] = data_storage.carregar_veiculos()
+    assert veiculo_lido.tipo == TipoVeiculo.CARRO and veiculo_lido.zonas_permitidas == ["Zona 4"]
+    assert data_storage.listar_pedidos(zona="Zona 4", status="EM_TRANSPORTE")[1] == 1
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_endpoints_paginados_com_filtros(tmp_path, monkeypatch, backend):
+    _preparar_json(tmp_path / "db_json")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_storage, "BACKEND_ARMAZENAMENTO", backend)
+    cliente = TestClient(main_api.app)
+
+    resposta = cliente.get("/pedidos", params={"zona": "Zona 1", "status": "PENDENTE", "limit": 2, "offset": 1})
+    assert resposta.status_code == 200
+    assert [p["id"] for p in resposta.json()] == [103, 105]
+    assert resposta.headers["X-Total-Count"] == "6"
+
+    resposta = cliente.get("/clientes", params={"zona": "Zona 2"})
+    assert [c["id"] for c in resposta.json()] == [1, 3, 5]
+    resposta = cliente.get("/veiculos", params={"tipo": "VAN"})
+    assert [v["id"] for v in resposta.json()] == [2] and resposta.headers["X-Total-Count"] == "1"
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_listagens_em_cache_com_etag(tmp_path, monkeypatch, backend):
+    _preparar_json(tmp_path / "db_json")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_storage, "BACKEND_ARMAZENAMENTO", backend)
+    monkeypatch.setattr(main_api, "cache_listagens", CacheRespostas())
+    cliente = TestClient(main_api.app)
+
+    primeira = cliente.get("/veiculos")
+    etag = primeira.headers["ETag"]
+    assert cliente.get("/veiculos").content == primeira.content
+    assert main_api.cache_listagens.estatisticas() == {"entradas": 1, "acertos": 1, "falhas": 1}
+
+    nao_modificado = cliente.get("/veiculos", headers={"If-None-Match": etag})
+    assert nao_modificado.status_code == 304 and nao_modificado.content == b""
+
+    data_storage.salvar_veiculos([Veiculo(9, TipoVeiculo.MOTO, 10)])
+    atualizado = cliente.get("/veiculos", headers={"If-None-Match": etag})
+    assert atualizado.status_code == 200 and atualizado.headers["ETag"] != etag
+    assert [v["id"] for v in atualizado.json()] == [9]
@@ -0,0 +1,77 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from grafos.bloqueios import MatrizComBloqueios, arestas_da_via
+from grafos.matriz_distancias import matriz_distancias, SEM_CAMINHO
+from simulador.simulador import simular_bloqueio_ruas
+
+
+def criar_grade(lado, seed):
+    rnd = random.Random(seed)
+    G = nx.MultiDiGraph()
+    for i in range(lado):
+        for j in range(lado):
+            no = i * lado + j
+            if j + 1 < lado:
+                peso = rnd.randint(50, 150)
+                G.add_edge(no, no + 1, length=peso, name=f"Rua {i}")
+                G.add_edge(no + 1, no, length=peso, name=f"Rua {i}")
+            if i + 1 < lado:
+                peso = rnd.randint(50, 150)
+                G.add_edge(no, no + lado, length=peso, name=f"Avenida {j}")
+                G.add_edge(no + lado, no, length=peso, name=[f"Avenida {j}", "Corredor"])
+    return G
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_bloqueios_iguais_a_recalculo_completo(seed):
+    G = criar_grade(15, seed)
+    rnd = random.Random(seed)
+    nodos = [rnd.randrange(15 * 15) for _ in range(30)] + [0, 0]  # inclui nós repetidos
+    base = MatrizComBloqueios(G, nodos)
+    original = base.matriz()
+    assert np.array_equal(original, matriz_distancias(G, nodos))
+
+    atual, removido = base, G.copy()
+    for via in ("Avenida 7", "Rua 3", "Avenida 2"):
+        arestas = arestas_da_via(G, via)[::2]
+        atual = atual.com_bloqueios(arestas)
+        removido.remove_edges_from(arestas)
+        assert np.array_equal(atual.matriz(), matriz_distancias(removido, nodos))
+
+    # A matriz base não muda (copy-on-write)
+    assert np.array_equal(base.matriz(), original)
+    assert base.linhas_alteradas == []
+
+
+def test_so_linhas_afetadas_sao_recalculadas():
+    G = criar_grade(10, 3)
+    nodos = [0, 1, 2, 99]
+    base = MatrizComBloqueios(G, nodos)
+    # Isola o canto do nó 99: só a linha dele muda, as outras vêm da base
+    bloqueada = simular_bloqueio_ruas(base, [(99, 98), (99, 89)])
+    alteradas = bloqueada.linhas_alteradas
+    assert alteradas == [3]
+    assert bloqueada.valor(3, 0) == SEM_CAMINHO and base.valor(3, 0) < SEM_CAMINHO
+    for i in range(len(nodos)):
+        if i not in alteradas:
+            assert bloqueada.linha(i) is not base.linha(i)
+            assert np.array_equal(bloqueada.linha(i), base.linha(i))
+
+
+def test_arestas_inexistentes_e_repetidas_sao_ignoradas():
+    G = criar_grade(5, 4)
+    base = MatrizComBloqueios(G, [0, 24])
+    assert base.com_bloqueios([(0, 24), (-1, 3)]).linhas_alteradas == []
+    uma_vez = base.com_bloqueios([(0, 1)])
+    assert uma_vez.com_bloqueios([(0, 1)]).bloqueadas == uma_vez.bloqueadas
+
+
+def test_arestas_da_via_aceita_lista_de_nomes():
+    G = criar_grade(3, 5)
+    assert (3, 0) in arestas_da_via(G, "Corredor")
+    assert (0, 3) not in arestas_da_via(G, "Corredor")
+    assert (0, 3) in arestas_da_via(G, "Avenida 0")
@@ -0,0 +1,89 @@
+import time
+
+import networkx as nx
+from fastapi.testclient import TestClient
+
+import main_api
+from gerenciador_jobs import GerenciadorJobs
+from grafos.cache_distancias import CacheDistancias, matriz_com_cache
+from grafos.matriz_distancias import matriz_distancias
+
+
+def criar_grafo():
+    G = nx.MultiDiGraph()
+    for u, v, comprimento in [(1, 2, 10.5), (2, 3, 20.2), (3, 1, 7.9), (2, 4, 3.3), (4, 3, 1.1)]:
+        G.add_edge(u, v, length=comprimento)
+    return G
+
+
+def test_matriz_com_cache_so_calcula_pares_faltando(tmp_path):
+    G = criar_grafo()
+    cache = CacheDistancias(str(tmp_path / "dist.sqlite3"), capacidade_memoria=100)
+
+    primeira = matriz_com_cache(cache, G, [1, 2, 3], "v1")
+    assert primeira.tolist() == matriz_distancias(G, [1, 2, 3]).tolist()
+    assert cache.misses == 6 and cache.hits_memoria == 0
+
+    segunda = matriz_com_cache(cache, G, [3, 1, 2, 4], "v1")
+    assert segunda.tolist() == matriz_distancias(G, [3, 1, 2, 4]).tolist()
+    assert cache.hits_memoria == 6
+
+
+def test_lru_limitado_e_nivel_em_disco(tmp_path):
+    caminho = str(tmp_path / "dist.sqlite3")
+    G = criar_grafo()
+    cache = CacheDistancias(caminho, capacidade_memoria=4)
+    matriz_com_cache(cache, G, [1, 2, 3, 4], "v1")
+    assert cache.estatisticas()["pares_em_memoria"] == 4
+
+    # Nova instância (ex.: reinício do processo) encontra tudo no disco
+    reaberto = CacheDistancias(caminho, capacidade_memoria=4)
+    matriz_com_cache(reaberto, G, [1, 2, 3, 4], "v1")
+    assert reaberto.hits_disco == 12 and reaberto.misses == 0
+
+
+def test_nova_versao_do_grafo_invalida_cache(tmp_path):
+    cache = CacheDistancias(str(tmp_path / "dist.sqlite3"))
+    G = criar_grafo()
+    matriz_com_cache(cache, G, [1, 2], "v1")
+
+    # Novo snapshot com a rua 1 -> 2 mais longa
+    novo = criar_grafo()
+    novo.remove_edge(1, 2)
+    novo.add_edge(1, 2, length=99.0)
+    matriz = matriz_com_cache(cache, novo, [1, 2], "v2")
+    assert matriz[0, 1] == 99
+    assert cache.estatisticas()["versao_grafo"] == "v2"
+    assert cache.obter([(1, 2)], "v2") == {(1, 2): 99}
+
+
+_caches_do_worker = {}
+
+
+def _matriz_no_worker(caminho, nodos):
+    # Roda em um processo do pool, com um cache por processo, como obter_cache_distancias
+    if caminho not in _caches_do_worker:
+        _caches_do_worker[caminho] = CacheDistancias(caminho)
+    return matriz_com_cache(_caches_do_worker[caminho], criar_grafo(), nodos, "v1").tolist()
+
+
+def test_estatisticas_somam_os_processos_do_pool(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "dist.sqlite3")
+    gerenciador = GerenciadorJobs(max_concorrentes=1)
+    try:
+        for nodos in ([1, 2, 3], [1, 2, 3, 4]):
+            job_id = gerenciador.submeter(_matriz_no_worker, caminho, nodos)
+            limite = time.monotonic() + 60
+            while gerenciador.consultar(job_id)["status"] != "CONCLUIDO":
+                assert time.monotonic() < limite and gerenciador.consultar(job_id)["status"] != "ERRO"
+                time.sleep(0.05)
+    finally:
+        gerenciador.encerrar()
+
+    monkeypatch.setattr(main_api, "obter_cache_distancias", lambda: CacheDistancias(caminho))
+    estatisticas = TestClient(main_api.app).get("/admin/cache-distancias").json()
+
+    # 6 pares novos no primeiro job; no segundo, os mesmos 6 da memória do worker e 6 novos com o nó 4
+    assert estatisticas["processos"] == 1 and estatisticas["versao_grafo"] == "v1"
+    assert estatisticas["misses"] == 12 and estatisticas["hits_memoria"] == 6
+    assert estatisticas["pares_em_memoria"] == 12
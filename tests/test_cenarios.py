@@ -0,0 +1,37 @@
+import random
+from types import SimpleNamespace
+
+from simulador.cenarios import Cenario, simular_cenarios, tabela_cenarios
+from simulador.simulador import PENALIDADE_BLOQUEIO
+
+
+def _instancia(n, semente):
+    rnd = random.Random(semente)
+    pontos = [(rnd.uniform(0, 100), rnd.uniform(0, 100)) for _ in range(n)]
+    matriz = [[int(abs(a[0] - b[0]) + abs(a[1] - b[1])) for b in pontos] for a in pontos]
+    pedidos = [SimpleNamespace(cliente=SimpleNamespace(zona=f"Zona {1 + i % 2}"), volume=5) for i in range(n)]
+    return matriz, pedidos
+
+
+def test_lote_de_cenarios_em_paralelo():
+    matriz, pedidos = _instancia(12, 5)
+    veiculos = [SimpleNamespace(capacidade=40, zonas_permitidas=None),
+                SimpleNamespace(capacidade=40, zonas_permitidas=["Zona 1"])]
+    bloqueios = [(i, j) for i in range(12) for j in range(i + 1, 12) if (i + j) % 3 == 0]
+    cenarios = [
+        Cenario("base"),
+        Cenario("bloqueios", rotas_bloqueadas=bloqueios + [(0, 99)]),  # pares fora da matriz são ignorados
+        Cenario("pico Zona 2", aumento_por_zona={"Zona 2": 3.0}),
+    ]
+
+    base, bloqueado, pico = simular_cenarios(matriz, pedidos, veiculos, cenarios, tempo_limite=1, max_processos=2)
+
+    assert [r["cenario"] for r in (base, bloqueado, pico)] == ["base", "bloqueios", "pico Zona 2"]
+    assert base["volume_nao_atendido"] == 0 and base["veiculos_usados"] == 2
+    assert bloqueado["volume_nao_atendido"] == 0 and bloqueado["custo"] < PENALIDADE_BLOQUEIO
+    assert pico["demanda_total"] == 30 + 90
+    assert pico["volume_nao_atendido"] >= 120 - 80 and pico["pedidos_nao_atendidos"] > 0
+    assert matriz[0][3] != PENALIDADE_BLOQUEIO  # a matriz base não é alterada
+
+    tabela = tabela_cenarios([base, bloqueado, pico])
+    assert tabela.splitlines()[2].startswith("base") and len(tabela.splitlines()) == 5
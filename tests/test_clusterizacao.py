@@ -0,0 +1,91 @@
+import random
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+import main_api
+from vrp.clusterizacao import clusterizar_por_varredura, melhorar_entre_rotas, resolver_por_clusters
+
+
+def _instancia(n, semente):
+    rnd = random.Random(semente)
+    latitudes = [-23.55] + [-23.55 + rnd.uniform(-0.05, 0.05) for _ in range(1, n)]
+    longitudes = [-46.63] + [-46.63 + rnd.uniform(-0.05, 0.05) for _ in range(1, n)]
+    pontos = [(la * 1000, lo * 1000) for la, lo in zip(latitudes, longitudes)]
+    matriz = [[int(abs(a[0] - b[0]) + abs(a[1] - b[1])) for b in pontos] for a in pontos]
+    demandas = [0] + [rnd.randint(1, 10) for _ in range(1, n)]
+    return latitudes, longitudes, matriz, demandas
+
+
+def test_clusters_cobrem_todos_os_pedidos_dentro_da_capacidade():
+    latitudes, longitudes, _, demandas = _instancia(61, 1)
+    capacidades = [60] * 8
+    clusters, nao_alocados = clusterizar_por_varredura(
+        latitudes, longitudes, demandas, capacidades, max_pedidos_por_cluster=20
+    )
+
+    assert nao_alocados == []
+    assert len(clusters) == 3
+    pedidos = sorted(i for c, _ in clusters for i in c)
+    assert pedidos == list(range(1, 61))
+    veiculos = sorted(j for _, v in clusters for j in v)
+    assert veiculos == list(range(8))
+    for c, v in clusters:
+        assert sum(demandas[i] for i in c) <= sum(capacidades[j] for j in v)
+
+
+def test_melhoria_entre_rotas_nao_piora_nem_estoura_capacidade():
+    _, _, matriz, demandas = _instancia(11, 2)
+    capacidades = [40, 40]
+    rotas = [
+        {"vehicle_id": 0, "route_indices": [0, 1, 3, 5, 7, 9, 0], "total_distance": 0},
+        {"vehicle_id": 1, "route_indices": [0, 2, 4, 6, 8, 10, 0], "total_distance": 0},
+    ]
+    custo_antes = sum(
+        sum(matriz[a][b] for a, b in zip(r["route_indices"], r["route_indices"][1:])) for r in rotas
+    )
+
+    melhoradas = melhorar_entre_rotas(rotas, matriz, demandas, capacidades, tempo_limite=1)
+
+    assert sum(r["total_distance"] for r in melhoradas) <= custo_antes
+    visitados = sorted(no for r in melhoradas for no in r["route_indices"] if no != 0)
+    assert visitados == list(range(1, 11))
+    for r in melhoradas:
+        assert sum(demandas[no] for no in r["route_indices"][1:-1]) <= capacidades[r["vehicle_id"]]
+
+
+def test_resolver_por_clusters_atende_todos_os_pedidos():
+    latitudes, longitudes, matriz, demandas = _instancia(41, 3)
+    capacidades = [70] * 6
+
+    rotas, nao_atendidos = resolver_por_clusters(
+        matriz, demandas, capacidades, latitudes, longitudes,
+        tempo_limite=4, max_pedidos_por_cluster=20,
+    )
+
+    assert nao_atendidos == []
+    visitados = sorted(no for r in rotas for no in r["route_indices"] if no != 0)
+    assert visitados == list(range(1, 41))
+    for r in rotas:
+        assert sum(demandas[no] for no in r["route_indices"][1:-1]) <= capacidades[r["vehicle_id"]]
+
+
+def _requisicao(**extras):
+    return main_api.OptimizationRequest(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}, {"id": 2, "nome": "Bia", "zona": "Zona 2"}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 1, "prioridade": 1},
+                 {"id": 11, "cliente_id": 2, "volume": 1, "prioridade": 1}],
+        veiculos=[{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True, "zonas_permitidas": ["Zona 2"]}],
+        clusterizar=True,
+        **extras,
+    )
+
+
+def test_requisicao_clusterizada_valida_tamanho_e_zonas():
+    with pytest.raises(ValidationError):
+        _requisicao(max_pedidos_por_cluster=0)
+
+    with pytest.raises(HTTPException) as erro:
+        main_api.calcular_otimizacao(_requisicao())
+    assert erro.value.status_code == 400
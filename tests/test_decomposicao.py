@@ -0,0 +1,77 @@
+import random
+
+import vrp.decomposicao
+from gerenciador_jobs import GerenciadorJobs
+from vrp.decomposicao import componentes_por_zona, resolver_por_componentes
+
+
+def test_componentes_pelo_grafo_veiculo_zona():
+    zonas_pedidos = ["Zona 1", "Zona 1", "Zona 2", "Zona 3", "Zona 4", "Zona 5"]
+    zonas_veiculos = [["Zona 1", "Zona 2"], ["Zona 3"], ["Zona 2"], ["Zona 3", "Zona 9"]]
+    componentes, sem_veiculo = componentes_por_zona(zonas_pedidos, zonas_veiculos, deposito=0)
+
+    assert sorted(componentes) == [([1, 2], [0, 2]), ([3], [1, 3])]
+    assert sem_veiculo == [4, 5]
+
+
+def test_veiculo_sem_restricao_une_todas_as_zonas():
+    componentes, sem_veiculo = componentes_por_zona(
+        ["Zona 1", "Zona 2", "Zona 3"], [["Zona 2"], None], deposito=0
+    )
+    assert componentes == [([1, 2], [0, 1])]
+    assert sem_veiculo == []
+
+
+def test_resolver_por_componentes_respeita_zonas_e_capacidade():
+    rnd = random.Random(4)
+    n = 13
+    pontos = [(rnd.uniform(0, 100), rnd.uniform(0, 100)) for _ in range(n)]
+    matriz = [[int(abs(a[0] - b[0]) + abs(a[1] - b[1])) for b in pontos] for a in pontos]
+    zonas_pedidos = ["Zona 1"] + [f"Zona {1 + i % 3}" for i in range(1, n)]
+    demandas = [0] + [rnd.randint(5, 15) for _ in range(1, n)]
+    zonas_veiculos = [["Zona 1"], ["Zona 1"], ["Zona 2", "Zona 3"], ["Zona 3"]]
+    capacidades = [60, 60, 80, 80]
+
+    rotas, nao_atendidos = resolver_por_componentes(
+        matriz, demandas, capacidades, zonas_pedidos, zonas_veiculos, deposito=0, tempo_limite=1
+    )
+
+    assert nao_atendidos == []
+    visitados = []
+    for rota in rotas:
+        paradas = [no for no in rota["route_indices"] if no != 0]
+        assert sum(demandas[no] for no in paradas) <= capacidades[rota["vehicle_id"]]
+        for no in paradas:
+            assert zonas_pedidos[no] in zonas_veiculos[rota["vehicle_id"]]
+        visitados.extend(paradas)
+    assert sorted(visitados) == list(range(1, n))
+
+
+def test_processos_por_job(monkeypatch):
+    monkeypatch.setattr("gerenciador_jobs.os.cpu_count", lambda: 16)
+
+    assert GerenciadorJobs(max_concorrentes=4).processos_por_job == 4
+    assert GerenciadorJobs(max_concorrentes=16).processos_por_job == 2  # nunca sempre em sequência
+    assert GerenciadorJobs(max_concorrentes=16, processos_por_job="1").processos_por_job == 1
+    monkeypatch.setattr("gerenciador_jobs.os.cpu_count", lambda: 1)
+    assert GerenciadorJobs(max_concorrentes=1).processos_por_job == 1
+
+
+def test_tempo_limite_dividido_entre_as_rodadas(monkeypatch):
+    tempos = []
+
+    def subproblema_falso(matriz, demandas, capacidades, permitidos, tempo_limite, penalidade=None):
+        tempos.append(tempo_limite)
+        return [{"vehicle_id": 0, "route_indices": list(range(len(matriz))) + [0], "total_distance": 0}]
+
+    monkeypatch.setattr(vrp.decomposicao, "_resolver_subproblema", subproblema_falso)
+    matriz = [[abs(a - b) for b in range(4)] for a in range(4)]
+
+    rotas, nao_atendidos = resolver_por_componentes(
+        matriz, [0, 1, 1, 1], [5, 5, 5], ["Zona 1", "Zona 1", "Zona 2", "Zona 3"],
+        [["Zona 1"], ["Zona 2"], ["Zona 3"]], tempo_limite=30, max_processos=1,
+    )
+
+    # Três grupos em sequência: o tempo total fica nos 30 s pedidos, não em 3 x 30 s
+    assert tempos == [10, 10, 10]
+    assert nao_atendidos == [] and len(rotas) == 3
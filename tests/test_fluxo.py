@@ -0,0 +1,144 @@
+import random
+from types import SimpleNamespace
+
+from fluxo.ford_fulkerson import ExtendedDinic, ExtendedMaxFlow
+from fluxo.network_builder import (
+    build_flow_network,
+    build_zone_flow_network,
+    cancel_order,
+    get_allocations,
+    get_network_visualization_data,
+    get_order_allocations,
+    set_vehicle_availability,
+)
+
+
+def _bipartido(classe, volumes, capacidades, arestas):
+    n, m = len(volumes), len(capacidades)
+    flow = classe(n + m)
+    for i, j in arestas:
+        flow.add_edge(i, n + j, volumes[i])
+    flow.add_multi_sources(range(n), volumes)
+    flow.add_multi_sinks([n + j for j in range(m)], capacidades)
+    return flow
+
+
+def test_dinic_igual_ao_max_flow_original():
+    rnd = random.Random(7)
+    for _ in range(20):
+        n, m = rnd.randint(5, 60), rnd.randint(2, 8)
+        volumes = [rnd.randint(1, 20) for _ in range(n)]
+        capacidades = [rnd.randint(10, 80) for _ in range(m)]
+        arestas = [(i, j) for i in range(n) for j in range(m) if rnd.random() < 0.4]
+
+        esperado = _bipartido(ExtendedMaxFlow, volumes, capacidades, arestas).multi_max_flow()
+        assert _bipartido(ExtendedDinic, volumes, capacidades, arestas).multi_max_flow() == esperado
+
+
+def test_dinic_sem_limite_de_recursao_em_caminho_longo():
+    n = 20000
+    flow = ExtendedDinic(n)
+    for v in range(n - 1):
+        flow.add_edge(v, v + 1, 5)
+    flow.add_multi_sources([0], [7])
+    flow.add_multi_sinks([n - 1], [9])
+    assert flow.multi_max_flow() == 5
+
+
+def test_alocacoes_e_visualizacao():
+    cliente = lambda zona: SimpleNamespace(zona=zona)
+    pedidos = [SimpleNamespace(cliente=cliente(z), volume=v)
+               for z, v in [("Zona 1", 10), ("Zona 1", 5), ("Zona 2", 8)]]
+    veiculos = [SimpleNamespace(capacidade=12, zonas_permitidas=["Zona 1"], tipo="VAN"),
+                SimpleNamespace(capacidade=20, zonas_permitidas=["Zona 2"], tipo="VAN")]
+
+    flow = build_flow_network(pedidos, veiculos)
+    assert flow.multi_max_flow() == 20
+    assert get_allocations(flow, 3, 2) == {0: 12, 1: 8}
+
+    dados = get_network_visualization_data(flow, pedidos, veiculos)
+    assert dados["metadata"]["total_flow"] == 20
+    assert sum(a["flow"] for a in dados["edges"]) == 20
+    assert len(dados["edges"]) == 3
+
+
+def test_rede_por_zona_tem_o_mesmo_fluxo_e_distribui_para_os_pedidos():
+    rnd = random.Random(11)
+    zonas = [f"Zona {z}" for z in range(1, 6)]
+    for _ in range(10):
+        pedidos = [
+            SimpleNamespace(cliente=SimpleNamespace(zona=rnd.choice(zonas)),
+                            volume=rnd.randint(1, 20), prioridade=rnd.randint(1, 5))
+            for _ in range(rnd.randint(10, 80))
+        ]
+        veiculos = [
+            SimpleNamespace(capacidade=rnd.randint(20, 120),
+                            zonas_permitidas=rnd.sample(zonas, 2) if rnd.random() < 0.8 else None)
+            for _ in range(rnd.randint(2, 6))
+        ]
+
+        por_pedido = build_flow_network(pedidos, veiculos)
+        por_zona = build_zone_flow_network(pedidos, veiculos)
+        assert por_zona.multi_max_flow() == por_pedido.multi_max_flow()
+        assert por_zona.size < por_pedido.size
+
+        alocacoes = get_allocations(por_zona, len(pedidos), len(veiculos))
+        distribuicao = get_order_allocations(por_zona, pedidos)
+        for i, por_veiculo in distribuicao.items():
+            assert sum(por_veiculo.values()) <= pedidos[i].volume
+            for j in por_veiculo:
+                permitidas = veiculos[j].zonas_permitidas
+                assert not permitidas or pedidos[i].cliente.zona in permitidas
+        for j, volume in alocacoes.items():
+            assert sum(d.get(j, 0) for d in distribuicao.values()) == volume
+
+
+def test_mudancas_incrementais_igualam_reconstrucao():
+    rnd = random.Random(13)
+    zonas = [f"Zona {z}" for z in range(1, 5)]
+    for _ in range(10):
+        pedidos = [
+            SimpleNamespace(cliente=SimpleNamespace(zona=rnd.choice(zonas)),
+                            volume=rnd.randint(1, 20), prioridade=1)
+            for _ in range(rnd.randint(10, 50))
+        ]
+        veiculos = [
+            SimpleNamespace(capacidade=rnd.randint(20, 100), zonas_permitidas=rnd.sample(zonas, 2))
+            for _ in range(rnd.randint(2, 6))
+        ]
+        redes = [build_flow_network(pedidos, veiculos), build_zone_flow_network(pedidos, veiculos)]
+        for rede in redes:
+            rede.multi_max_flow()
+
+        cancelados = rnd.sample(range(len(pedidos)), 3)
+        indisponivel = rnd.randrange(len(veiculos))
+        for rede in redes:
+            for i in cancelados:
+                cancel_order(rede, pedidos, i)
+            set_vehicle_availability(rede, indisponivel, False, veiculos[indisponivel].capacidade)
+
+        restantes = [p for i, p in enumerate(pedidos) if i not in cancelados]
+        disponiveis = [v for j, v in enumerate(veiculos) if j != indisponivel]
+        esperado = build_flow_network(restantes, disponiveis).multi_max_flow()
+        for rede in redes:
+            assert rede.total_flow == esperado
+            assert get_allocations(rede, len(pedidos), len(veiculos)).get(indisponivel, 0) == 0
+
+        # Veículo volta: o fluxo é reaumentado a partir do estado atual
+        for rede in redes:
+            set_vehicle_availability(rede, indisponivel, True, veiculos[indisponivel].capacidade)
+        esperado = build_flow_network(restantes, veiculos).multi_max_flow()
+        assert [rede.total_flow for rede in redes] == [esperado, esperado]
+
+
+def test_inserir_e_remover_arco():
+    flow = ExtendedDinic(2)
+    flow.add_multi_sources([0], [10])
+    flow.add_multi_sinks([1], [10])
+    assert flow.multi_max_flow() == 0
+    e = flow.add_edge(0, 1, 6)
+    assert flow.multi_max_flow() == 6
+    flow.add_edge(0, 1, 6)
+    assert flow.multi_max_flow() == 4
+    assert flow.remove_edge(e) == 6
+    assert flow.flow(e) == 0
@@ -0,0 +1,34 @@
+import os
+
+import networkx as nx
+import numpy as np
+
+import grafos.indice_rotas as indice_rotas
+from grafos.indice_rotas import IndiceRotas, caminho_indice, obter_indice, sincronizar_indice
+
+
+def _grafo():
+    G = nx.MultiDiGraph()
+    for u, v, comprimento in [(1, 2, 10), (2, 3, 20), (3, 1, 8), (2, 4, 3), (4, 3, 1)]:
+        G.add_edge(u, v, length=comprimento)
+    return G
+
+
+def test_worker_recarrega_indice_reconstruido_na_mesma_versao(tmp_path, monkeypatch):
+    monkeypatch.setattr(indice_rotas, "_indice", None)
+    monkeypatch.setattr(indice_rotas, "_origem_indice", None)
+    caminho = caminho_indice("v1", str(tmp_path))
+    IndiceRotas.construir(_grafo(), [1, 2], versao_grafo="v1").salvar(caminho)
+
+    primeiro = sincronizar_indice("v1", str(tmp_path))
+    assert primeiro.contem([1, 2]) and not primeiro.contem([3])
+    assert sincronizar_indice("v1", str(tmp_path)) is primeiro  # Arquivo igual: não relê
+
+    # Outro processo reconstrói o índice com um cliente novo, para o mesmo grafo
+    IndiceRotas.construir(_grafo(), [1, 2, 3], versao_grafo="v1").salvar(caminho)
+    os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 1_000_000))
+
+    atualizado = sincronizar_indice("v1", str(tmp_path))
+    assert atualizado is obter_indice("v1") and atualizado.contem([1, 2, 3])
+    assert np.array_equal(atualizado.matriz([1, 3]), [[0, 14], [8, 0]])  # 1 -> 2 -> 4 -> 3
+    assert not os.path.exists(caminho + ".tmp")
@@ -0,0 +1,174 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+import main_api
+from grafos.matriz_distancias import (
+    SEM_CAMINHO, VELOCIDADE_PADRAO_KMH, matriz_distancias, matriz_distancias_e_tempos, tempo_da_aresta,
+)
+from vrp.modelo import criar_modelo_vrp
+
+
+def test_tempo_da_aresta():
+    assert tempo_da_aresta({"length": 100, "travel_time": 7.5}) == 7.5
+    assert tempo_da_aresta({"length": 1000, "maxspeed": "60"}) == pytest.approx(60)
+    assert tempo_da_aresta({"length": 1609.344, "maxspeed": "60 mph"}) == pytest.approx(60)
+    assert tempo_da_aresta({"length": 1000, "maxspeed": ["30", "60"]}) == pytest.approx(120)
+    assert tempo_da_aresta({"length": 1000, "maxspeed": "signals"}) == pytest.approx(3600 / VELOCIDADE_PADRAO_KMH)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_tempos_seguem_o_caminho_de_menor_distancia(seed):
+    rnd = random.Random(seed)
+    G = nx.MultiDiGraph()
+    G.add_nodes_from(range(60))
+    for _ in range(250):
+        dados = {"length": rnd.uniform(10, 500)}
+        if rnd.random() < 0.4:
+            dados["maxspeed"] = rnd.choice(["40", "60", "25 mph"])
+        G.add_edge(rnd.randrange(60), rnd.randrange(60), **dados)
+    nodos = [rnd.randrange(60) for _ in range(15)] + [61]
+    G.add_node(61)  # isolado
+
+    distancias, tempos = matriz_distancias_e_tempos(G, nodos)
+
+    assert np.array_equal(distancias, matriz_distancias(G, nodos))
+    for i, u in enumerate(nodos):
+        for j, v in enumerate(nodos):
+            if u == v:
+                assert tempos[i, j] == 0
+            elif distancias[i, j] == SEM_CAMINHO:
+                assert tempos[i, j] == SEM_CAMINHO
+            else:
+                caminho = nx.shortest_path(G, u, v, weight="length")
+                esperado = sum(
+                    tempo_da_aresta(min(G[a][b].values(), key=lambda d: d["length"]))
+                    for a, b in zip(caminho, caminho[1:])
+                )
+                assert tempos[i, j] == round(esperado)
+
+
+def _linha(n):
+    posicoes = [10 * i for i in range(n)]
+    return [[abs(a - b) for b in posicoes] for a in posicoes]
+
+
+def test_vrp_respeita_janelas_e_servico():
+    matriz = _linha(5)
+    janelas = [None, (100, 120), None, (0, 35), None]
+    rotas, _ = criar_modelo_vrp(matriz, [0, 1, 1, 1, 1], [10], 1, tempo_limite=1,
+                                matriz_tempos=matriz, janelas=janelas, tempos_servico=[0, 5, 5, 5, 5])
+
+    rota = rotas[0]
+    chegada = dict(zip(rota["route_indices"][1:-1], rota["arrival_times"][1:-1]))
+    assert 100 <= chegada[1] <= 120 and chegada[3] <= 35
+    assert len(rota["arrival_times"]) == len(rota["route_indices"])
+
+
+def test_vrp_respeita_jornada_maxima():
+    matriz = _linha(5)
+    servico = [0, 5, 5, 5, 5]
+    rotas, _ = criar_modelo_vrp(matriz, [0, 1, 1, 1, 1], [10, 10], 2, tempo_limite=1,
+                                matriz_tempos=matriz, tempos_servico=servico, jornada_maxima=[50, 90])
+    for rota in rotas:
+        assert rota["arrival_times"][-1] - rota["arrival_times"][0] <= [50, 90][rota["vehicle_id"]]
+
+    # Ida e volta até o nó 4 já passa de 50 para os dois veículos
+    sem_solucao, _ = criar_modelo_vrp(matriz, [0, 1, 1, 1, 1], [10, 10], 2, tempo_limite=1,
+                                      matriz_tempos=matriz, tempos_servico=servico, jornada_maxima=[50, 50])
+    assert sem_solucao is None
+
+
+def _requisicao(**extras):
+    dados = {
+        "clientes": [
+            {"id": 1, "nome": "Ana", "zona": "Zona 1", "janela_inicio": 480, "janela_fim": 600, "tempo_servico": 5},
+            {"id": 2, "nome": "Bia", "zona": "Zona 2"},
+        ],
+        "pedidos": [
+            {"id": 10, "cliente_id": 1, "volume": 1, "prioridade": 1},
+            {"id": 11, "cliente_id": 1, "volume": 1, "prioridade": 1, "janela_fim": 540, "tempo_servico": 0},
+            {"id": 12, "cliente_id": 2, "volume": 1, "prioridade": 1},
+        ],
+        "veiculos": [{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True, "jornada_maxima": 480}],
+    }
+    for chave, valor in extras.items():
+        dados[chave] = valor
+    return main_api.OptimizationRequest(**dados)
+
+
+def test_restricoes_de_tempo_da_requisicao():
+    request = _requisicao()
+    restricoes = main_api.restricoes_de_tempo(request, request.veiculos)
+
+    assert restricoes["janelas"] == [(480 * 60, 600 * 60), (0, 540 * 60), None]
+    assert restricoes["tempos_servico"] == [300, 0, None]
+    assert restricoes["jornada_maxima"] == [480 * 60]
+
+    sem_tempo = _requisicao(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}, {"id": 2, "nome": "Bia", "zona": "Zona 2"}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 1, "prioridade": 1}],
+        veiculos=[{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True}],
+    )
+    assert main_api.restricoes_de_tempo(sem_tempo, sem_tempo.veiculos) is None
+
+
+def test_janela_invertida_e_rejeitada():
+    with pytest.raises(ValidationError):
+        main_api.ClienteModel(id=1, nome="Ana", zona="Zona 1", janela_inicio=600, janela_fim=480)
+
+
+def test_janela_impossivel_deixa_so_o_pedido_de_fora(monkeypatch):
+    matriz = np.array(_linha(3))
+    monkeypatch.setattr(main_api, "gerar_matrizes_distancia_tempo_osm", lambda lote: (matriz, matriz * 60, None, None))
+    monkeypatch.setattr(main_api, "salvar_plano", lambda rotas: "plano")
+    monkeypatch.setattr(main_api, "criar_modelo_vrp",
+                        lambda *args, **kwargs: criar_modelo_vrp(*args, **{**kwargs, "tempo_limite": 1}))
+    request = _requisicao(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}, {"id": 2, "nome": "Bia", "zona": "Zona 1"},
+                  {"id": 3, "nome": "Caio", "zona": "Zona 1", "janela_inicio": 0, "janela_fim": 5}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 0, "prioridade": 1},
+                 {"id": 11, "cliente_id": 2, "volume": 1, "prioridade": 1},
+                 {"id": 12, "cliente_id": 3, "volume": 1, "prioridade": 1}],
+    )
+
+    resultado = main_api.calcular_otimizacao(request)
+
+    assert resultado["pedidos_nao_atendidos"] == [12]  # 20 min até o Caio, janela fecha em 5
+    assert [s["pedido_id"] for s in resultado["routes"][0]["route"]] == [10, 11, 10]
+    assert "1 pedido(s) não atendido(s)" in resultado["message"]
+
+
+@pytest.mark.parametrize("modo", ["clusterizar", "decompor_por_zona"])
+def test_restricoes_de_tempo_rejeitadas_nos_modos_sem_tempo(modo):
+    with pytest.raises(main_api.HTTPException) as erro:
+        main_api.calcular_otimizacao(_requisicao(**{modo: True}))
+    assert erro.value.status_code == 400
+
+
+def test_pedido_tirado_pelas_dicas_volta_com_os_veiculos_da_zona(monkeypatch):
+    matriz = np.array(_linha(3))
+    monkeypatch.setattr(main_api, "gerar_matrizes_distancia_tempo_osm", lambda lote: (matriz, matriz * 60, None, None))
+    monkeypatch.setattr(main_api, "salvar_plano", lambda rotas: "plano")
+    monkeypatch.setattr(main_api, "criar_modelo_vrp",
+                        lambda *args, **kwargs: criar_modelo_vrp(*args, **{**kwargs, "tempo_limite": 1}))
+    # Dicas apertadas demais: tudo no veículo 1, cuja jornada não alcança o Caio
+    monkeypatch.setattr(main_api, "get_vehicle_hints", lambda rede, lote, frota: [[0]] * len(lote))
+    request = _requisicao(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}, {"id": 2, "nome": "Bia", "zona": "Zona 1"},
+                  {"id": 3, "nome": "Caio", "zona": "Zona 1"}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 0, "prioridade": 1},
+                 {"id": 11, "cliente_id": 2, "volume": 1, "prioridade": 1},
+                 {"id": 12, "cliente_id": 3, "volume": 1, "prioridade": 1}],
+        veiculos=[{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True, "jornada_maxima": 30},
+                  {"id": 2, "tipo": "VAN", "capacidade": 10, "disponivel": True}],
+    )
+
+    resultado = main_api.calcular_otimizacao(request)
+
+    assert resultado["pedidos_nao_atendidos"] == []
+    paradas = {r["vehicle_id"]: [s["pedido_id"] for s in r["route"]] for r in resultado["routes"]}
+    assert 12 in paradas[2]
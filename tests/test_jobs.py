@@ -0,0 +1,99 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main_api
+from gerenciador_jobs import ErroJob, GerenciadorJobs
+
+REQUISICAO = {
+    "clientes": [{"id": 1, "nome": "Ana", "zona": "Zona 1"}],
+    "pedidos": [{"id": 10, "cliente_id": 1, "volume": 1, "prioridade": 1}],
+    "veiculos": [{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True}],
+}
+
+
+# Os workers rodam em processos "spawn": precisam ser funções de módulo
+def _worker_lento(dados, versao):
+    inicio = time.time()
+    time.sleep(0.5)
+    return {"message": "ok", "pedidos": [p["id"] for p in dados["pedidos"]], "inicio": inicio, "fim": time.time()}
+
+
+def _worker_com_erro(dados, versao):
+    raise ErroJob(400, "Nenhum veículo disponível para realizar as entregas.")
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    gerenciador = GerenciadorJobs(max_concorrentes=1)
+    monkeypatch.setattr(main_api, "gerenciador_jobs", gerenciador)
+    monkeypatch.setattr(main_api, "otimizar_em_worker", _worker_lento)
+    yield TestClient(main_api.app)
+    gerenciador.encerrar()
+
+
+def _aguardar(cliente, job_id, prazo=60):
+    limite = time.monotonic() + prazo
+    while time.monotonic() < limite:
+        job = cliente.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("CONCLUIDO", "ERRO"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"job {job_id} não terminou em {prazo}s")
+
+
+def test_job_aceito_e_consultado_ate_concluir(cliente):
+    resposta = cliente.post("/jobs/optimize", json=REQUISICAO)
+
+    assert resposta.status_code == 202
+    job_id = resposta.json()["job_id"]
+    assert resposta.json()["status"] == "PENDENTE"
+    assert cliente.get(f"/jobs/{job_id}").json()["status"] in ("PENDENTE", "EXECUTANDO", "CONCLUIDO")
+
+    job = _aguardar(cliente, job_id)
+    assert job["status"] == "CONCLUIDO" and job["concluido_em"] is not None
+    assert job["resultado"]["pedidos"] == [10] and job["erro"] is None
+
+
+def test_job_com_erro(cliente, monkeypatch):
+    monkeypatch.setattr(main_api, "otimizar_em_worker", _worker_com_erro)
+    job_id = cliente.post("/jobs/optimize", json=REQUISICAO).json()["job_id"]
+
+    job = _aguardar(cliente, job_id)
+
+    assert job["status"] == "ERRO" and job["status_code"] == 400
+    assert job["erro"] == "Nenhum veículo disponível para realizar as entregas."
+
+
+def test_job_inexistente(cliente):
+    assert cliente.get("/jobs/nao-existe").status_code == 404
+    assert cliente.get("/jobs/nao-existe/eventos").status_code == 404
+
+
+def test_eventos_sse_ate_concluir(cliente):
+    job_id = cliente.post("/jobs/optimize", json=REQUISICAO).json()["job_id"]
+
+    with cliente.stream("GET", f"/jobs/{job_id}/eventos") as resposta:
+        assert resposta.headers["content-type"].startswith("text/event-stream")
+        blocos = [b for b in resposta.read().decode("utf-8").split("\n\n") if b]
+
+    eventos = []
+    for bloco in blocos:
+        evento, dados = bloco.split("\n")
+        eventos.append(evento.removeprefix("event: "))
+        assert json.loads(dados.removeprefix("data: "))["status"].lower() == eventos[-1]
+    # Cada mudança de status aparece uma vez, na ordem, e o fluxo termina no fim do job
+    assert eventos[-1] == "concluido"
+    assert eventos == [e for e in ("pendente", "executando", "concluido") if e in eventos]
+
+
+def test_limite_de_solves_concorrentes(cliente):
+    ids = [cliente.post("/jobs/optimize", json=REQUISICAO).json()["job_id"] for _ in range(3)]
+
+    jobs = [_aguardar(cliente, job_id) for job_id in ids]
+
+    # Com max_concorrentes=1 os solves rodam um de cada vez, sem se sobrepor
+    intervalos = sorted((j["resultado"]["inicio"], j["resultado"]["fim"]) for j in jobs)
+    assert all(fim <= inicio for (_, fim), (inicio, _) in zip(intervalos, intervalos[1:]))
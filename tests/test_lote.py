@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from fluxo.network_builder import build_zone_flow_network, get_order_allocations, get_vehicle_hints
+from main_api import ClienteModel, PedidoModel, VeiculoModel
+from models.cliente import Cliente
+from models.lote import OrderBatch, VehicleBatch, capacidades_e_elegibilidade, zonas_e_volumes
+from models.pedido import Pedido
+from models.veiculo import Veiculo
+from models.enums import TipoVeiculo
+
+
+def _requisicao():
+    clientes = [ClienteModel(id=10, nome="Ana", zona="Zona 3", latitude=-9.6, longitude=-35.7),
+                ClienteModel(id=20, nome="Bia", zona="Zona 1"),
+                ClienteModel(id=30, nome="Caio", zona="Zona 9", latitude=-9.5, longitude=-35.6)]
+    pedidos = [PedidoModel(id=1, cliente_id=20, volume=4, prioridade=1),
+               PedidoModel(id=2, cliente_id=10, volume=6, prioridade=3),
+               PedidoModel(id=3, cliente_id=20, volume=5, prioridade=2)]
+    veiculos = [VeiculoModel(id=7, tipo="MOTO", capacidade=8, disponivel=True, zonas_permitidas=["Zona 1"]),
+                VeiculoModel(id=8, tipo="VAN", capacidade=20, disponivel=True)]
+    return clientes, pedidos, veiculos
+
+
+def test_lote_de_modelos_em_colunas():
+    clientes, pedidos, veiculos = _requisicao()
+    lote = OrderBatch.de_modelos(pedidos, clientes)
+    frota = VehicleBatch.de_modelos(veiculos)
+
+    assert lote.ids.tolist() == [1, 2, 3]
+    assert lote.cliente_ids.tolist() == [20, 10, 20]
+    assert lote.zonas == ["Zona 1", "Zona 3"]  # só as zonas com pedidos
+    assert lote.zonas_dos_pedidos() == ["Zona 1", "Zona 3", "Zona 1"]
+    assert np.isnan(lote.latitude[0]) and lote.latitude[1] == -9.6
+    assert frota.tipos == ["MOTO", "VAN"]
+    assert frota.atende(lote.zonas).tolist() == [[True, False], [True, True]]
+
+    with pytest.raises(ValueError, match="Cliente com ID 99"):
+        OrderBatch.de_modelos([PedidoModel(id=4, cliente_id=99, volume=1, prioridade=1)], clientes)
+
+
+def test_rede_por_zona_igual_com_lote_ou_objetos():
+    clientes, pedidos, veiculos = _requisicao()
+    por_id = {c.id: c for c in clientes}
+    objetos = [Pedido(p.id, Cliente(p.cliente_id, por_id[p.cliente_id].nome, por_id[p.cliente_id].zona),
+                      p.volume, p.prioridade) for p in pedidos]
+    frota_objetos = [Veiculo(v.id, TipoVeiculo[v.tipo.name], v.capacidade, zonas_permitidas=v.zonas_permitidas)
+                     for v in veiculos]
+    lote = OrderBatch.de_modelos(pedidos, clientes)
+    frota = VehicleBatch.de_modelos(veiculos)
+
+    com_objetos = build_zone_flow_network(objetos, frota_objetos)
+    com_lote = build_zone_flow_network(lote, frota)
+
+    assert com_lote.multi_max_flow() == com_objetos.multi_max_flow() == 15
+    assert get_vehicle_hints(com_lote, lote, frota) == get_vehicle_hints(com_objetos, objetos, frota_objetos)
+    assert get_order_allocations(com_lote, lote) == get_order_allocations(com_objetos, objetos)
+    assert OrderBatch.de_pedidos(objetos).cliente_ids.tolist() == [20, 10, 20]
+
+    zona, zonas, volumes = zonas_e_volumes(lote)
+    zona_obj, zonas_obj, volumes_obj = zonas_e_volumes(objetos)
+    assert zona.tolist() == zona_obj.tolist() == [0, 1, 0] and zonas == zonas_obj
+    assert volumes.tolist() == volumes_obj.tolist() == [4, 6, 5]
+    capacidades, atende = capacidades_e_elegibilidade(frota, zonas)
+    capacidades_obj, atende_obj = capacidades_e_elegibilidade(frota_objetos, zonas)
+    assert capacidades.tolist() == capacidades_obj.tolist() == [8, 20]
+    assert atende.tolist() == atende_obj.tolist() == [[True, False], [True, True]]
@@ -0,0 +1,76 @@
+import random
+
+import networkx as nx
+import pytest
+
+from grafos.matriz_distancias import matriz_distancias, SEM_CAMINHO
+from grafos.indice_rotas import IndiceRotas
+
+
+def matriz_por_pares(G, nodos, weight):
+    # Implementação antiga (um shortest_path_length por par), usada como referência
+    n = len(nodos)
+    matriz = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                try:
+                    matriz[i][j] = int(nx.shortest_path_length(G, nodos[i], nodos[j], weight=weight))
+                except nx.NetworkXNoPath:
+                    matriz[i][j] = SEM_CAMINHO
+    return matriz
+
+
+def criar_multidigrafo(n_nos, n_arestas, seed):
+    rnd = random.Random(seed)
+    G = nx.MultiDiGraph()
+    G.add_nodes_from(range(1000, 1000 + n_nos))
+    for _ in range(n_arestas):
+        u = rnd.randrange(1000, 1000 + n_nos)
+        v = rnd.randrange(1000, 1000 + n_nos)
+        G.add_edge(u, v, length=rnd.uniform(5, 500))
+    return G
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matriz_igual_a_shortest_path_length(seed):
+    G = criar_multidigrafo(80, 300, seed)
+    rnd = random.Random(seed)
+    nodos = [rnd.choice(list(G.nodes)) for _ in range(25)]  # inclui nós repetidos
+    esperado = matriz_por_pares(G, nodos, "length")
+    assert matriz_distancias(G, nodos, weight="length").tolist() == esperado
+
+
+def test_grafo_nao_direcionado_com_pesos_inteiros():
+    G = nx.Graph()
+    G.add_edge('deposito', 'cliente1', weight=10)
+    G.add_edge('deposito', 'cliente2', weight=20)
+    G.add_edge('cliente1', 'cliente3', weight=15)
+    G.add_edge('cliente2', 'cliente3', weight=30)
+    nodos = ['deposito', 'cliente1', 'cliente2', 'cliente3']
+    assert matriz_distancias(G, nodos, weight='weight').tolist() == matriz_por_pares(G, nodos, 'weight')
+
+
+def test_sem_caminho_levanta_erro_quando_solicitado():
+    G = nx.DiGraph()
+    G.add_edge(1, 2, length=3)
+    G.add_node(3)
+    assert matriz_distancias(G, [1, 3]).tolist() == [[0, SEM_CAMINHO], [SEM_CAMINHO, 0]]
+    with pytest.raises(nx.NetworkXNoPath):
+        matriz_distancias(G, [1, 3], sem_caminho=None)
+
+
+def test_indice_rotas_salvo_em_disco_responde_igual_ao_motor(tmp_path):
+    G = criar_multidigrafo(60, 250, 7)
+    nos = list(G.nodes)[:30]
+    indice = IndiceRotas.construir(G, nos, versao_grafo="v1", tamanho_bloco=8)
+    caminho = str(tmp_path / "indice.npz")
+    indice.salvar(caminho)
+
+    carregado = IndiceRotas.carregar(caminho)
+    consulta = [nos[5], nos[2], nos[5], nos[20]]
+    assert carregado.versao_grafo == "v1"
+    assert carregado.contem(consulta)
+    assert not carregado.contem([list(G.nodes)[-1]])
+    assert carregado.matriz(consulta).tolist() == matriz_distancias(G, consulta).tolist()
+    assert carregado.distancia(nos[2], nos[20]) == matriz_distancias(G, [nos[2], nos[20]])[0, 1]
@@ -0,0 +1,124 @@
+import random
+import time
+from types import SimpleNamespace
+
+from ortools.graph.python import min_cost_flow as ortools_mcf
+
+import main_api
+from fluxo.min_cost_flow import MinCostFlow, min_cost_allocations
+from fluxo.network_builder import build_flow_network
+
+
+def _pedido(zona, volume, prioridade):
+    return SimpleNamespace(cliente=SimpleNamespace(zona=zona), volume=volume, prioridade=prioridade)
+
+
+def _veiculo(tipo, capacidade, zonas=None):
+    return SimpleNamespace(tipo=tipo, capacidade=capacidade, zonas_permitidas=zonas)
+
+
+def test_custo_minimo_igual_ao_ortools():
+    rnd = random.Random(3)
+    for _ in range(30):
+        n = rnd.randint(4, 12)
+        arcos = [(rnd.randrange(n), rnd.randrange(n), rnd.randint(1, 15), rnd.randint(0, 9))
+                 for _ in range(rnd.randint(8, 40))]
+        arcos = [a for a in arcos if a[0] != a[1]]
+
+        rede = MinCostFlow(n)
+        referencia = ortools_mcf.SimpleMinCostFlow()
+        for fr, to, cap, custo in arcos:
+            rede.add_edge(fr, to, cap, custo)
+            referencia.add_arc_with_capacity_and_unit_cost(fr, to, cap, custo)
+
+        referencia.set_node_supply(0, 10**6)
+        referencia.set_node_supply(n - 1, -10**6)
+        assert referencia.solve_max_flow_with_min_cost() == referencia.OPTIMAL
+        fluxo, custo = rede.min_cost_flow(0, n - 1)
+        assert fluxo == referencia.maximum_flow()
+        assert custo == referencia.optimal_cost()
+
+
+def test_prioridade_vai_para_o_veiculo_mais_barato_e_falta_cai_na_menor():
+    pedidos = [_pedido("Zona 1", 10, 5), _pedido("Zona 1", 10, 1), _pedido("Zona 1", 10, 3)]
+    veiculos = [_veiculo("CAMINHAO", 10), _veiculo("MOTO", 10)]
+
+    resultado = min_cost_allocations(pedidos, veiculos)
+
+    assert resultado["fluxo"] == 20
+    assert resultado["pedidos"] == {0: {1: 10}, 2: {0: 10}}
+    assert resultado["veiculos"] == {0: 10, 1: 10}
+
+
+def test_mesmo_volume_que_o_fluxo_maximo_e_respeita_zonas():
+    rnd = random.Random(5)
+    zonas = [f"Zona {z}" for z in range(1, 6)]
+    tipos = ["MOTO", "CARRO", "VAN", "CAMINHAO"]
+    for _ in range(10):
+        pedidos = [_pedido(rnd.choice(zonas), rnd.randint(1, 20), rnd.randint(1, 5))
+                   for _ in range(rnd.randint(10, 60))]
+        veiculos = [_veiculo(rnd.choice(tipos), rnd.randint(20, 100), rnd.sample(zonas, 2))
+                    for _ in range(rnd.randint(2, 6))]
+
+        resultado = min_cost_allocations(pedidos, veiculos)
+
+        assert resultado["fluxo"] == build_flow_network(pedidos, veiculos).multi_max_flow()
+        for i, por_veiculo in resultado["pedidos"].items():
+            assert sum(por_veiculo.values()) <= pedidos[i].volume
+            for j in por_veiculo:
+                assert pedidos[i].cliente.zona in veiculos[j].zonas_permitidas
+        for j, volume in resultado["veiculos"].items():
+            assert volume <= veiculos[j].capacidade
+
+
+def test_volumes_fracionarios():
+    pedidos = [_pedido("Zona 1", 2.5, 5), _pedido("Zona 1", 1.25, 1)]
+    veiculos = [_veiculo("MOTO", 3), _veiculo("CAMINHAO", 0.5)]
+
+    resultado = min_cost_allocations(pedidos, veiculos)
+
+    assert resultado["fluxo"] == 3.5
+    assert resultado["pedidos"] == {0: {0: 2.5}, 1: {0: 0.5, 1: 0.5}}
+
+
+def test_rapido_no_tamanho_de_uma_requisicao():
+    # Mesmo tamanho do benchmark_fluxo: roda antes do VRP em toda requisição
+    rnd = random.Random(7)
+    zonas = [f"Zona {z}" for z in range(20)]
+    pedidos = [_pedido(rnd.choice(zonas), rnd.randint(1, 30), rnd.randint(1, 5)) for _ in range(10000)]
+    veiculos = [_veiculo(rnd.choice(["MOTO", "CARRO", "VAN", "CAMINHAO"]), rnd.randint(500, 3000),
+                         rnd.sample(zonas, 3)) for _ in range(100)]
+
+    inicio = time.perf_counter()
+    resultado = min_cost_allocations(pedidos, veiculos)
+    decorrido = time.perf_counter() - inicio
+
+    assert resultado["fluxo"] == build_flow_network(pedidos, veiculos).multi_max_flow()
+    assert decorrido < 1.0
+
+
+def test_api_com_alocacao_de_custo_minimo(monkeypatch):
+    chamadas = []
+
+    def vrp_falso(matriz, demandas, capacidades, num_veiculos, deposito=0, veiculos_permitidos=None, **kwargs):
+        chamadas.append(veiculos_permitidos)
+        return [{"vehicle_id": 0, "route_indices": [0, 1, 0], "total_distance": 2}], None
+
+    monkeypatch.setattr(main_api, "criar_modelo_vrp", vrp_falso)
+    monkeypatch.setattr(main_api, "gerar_matriz_distancias_osm", lambda lote: ([[0, 1], [1, 0]], None, None))
+    monkeypatch.setattr(main_api, "salvar_plano", lambda rotas: "plano")
+    request = main_api.OptimizationRequest(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 3, "prioridade": 1},
+                 {"id": 11, "cliente_id": 1, "volume": 4, "prioridade": 5}],
+        veiculos=[{"id": 7, "tipo": "MOTO", "capacidade": 4, "disponivel": True},
+                  {"id": 8, "tipo": "CAMINHAO", "capacidade": 10, "disponivel": True}],
+        alocacao_custo_minimo=True,
+    )
+
+    resultado = main_api.calcular_otimizacao(request)
+
+    # A prioridade 5 fica com a moto (mais barata); o resto vai para o caminhão
+    assert resultado["allocations"] == {7: 4, 8: 3}
+    assert resultado["max_flow"] == 7
+    assert chamadas == [[[1], [0]]]
@@ -0,0 +1,60 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from simulador import monte_carlo
+from simulador.monte_carlo import amostrar_demandas, simular_monte_carlo, tabela_percentis
+
+ZONAS = ["Zona 1", "Zona 2", "Zona 3", "Zona 4"]
+
+
+def _instancia(n, semente):
+    rnd = random.Random(semente)
+    pedidos = [SimpleNamespace(cliente=SimpleNamespace(zona=rnd.choice(ZONAS)), volume=rnd.randint(1, 10))
+               for _ in range(n)]
+    veiculos = [SimpleNamespace(capacidade=60, zonas_permitidas=None),
+                SimpleNamespace(capacidade=80, zonas_permitidas=["Zona 1", "Zona 2"]),
+                SimpleNamespace(capacidade=50, zonas_permitidas=["Zona 3"]),
+                SimpleNamespace(capacidade=40, zonas_permitidas=["Zona 4"])]
+    return pedidos, veiculos
+
+
+def test_amostras_sem_incerteza_reproduzem_os_volumes():
+    volumes = np.array([3, 5, 7])
+    demandas = amostrar_demandas(volumes, np.array([0, 1, 0]), ["A", "B"], {"A": (2.0, 0.0)}, 4)
+    assert demandas.shape == (4, 3)
+    assert (demandas == [6, 5, 14]).all()
+
+
+def test_cortes_iguais_ao_fluxo_maximo(monkeypatch):
+    pedidos, veiculos = _instancia(60, 1)
+    incerteza = {z: (1.0, 0.3) for z in ZONAS}
+    por_cortes = simular_monte_carlo(pedidos, veiculos, incerteza, n_amostras=300, desvio_pedido=0.2, semente=7)
+    monkeypatch.setattr(monte_carlo, "LIMITE_ZONAS_CORTE", 0)  # força o fluxo máximo em todas as amostras
+    por_fluxo = simular_monte_carlo(pedidos, veiculos, incerteza, n_amostras=300, desvio_pedido=0.2, semente=7)
+
+    assert np.array_equal(por_cortes.demandas, por_fluxo.demandas)
+    assert 0 < por_cortes.probabilidade_deficit < 1
+    assert np.allclose(por_cortes.nao_atendido_fluxo, por_fluxo.nao_atendido_fluxo)
+
+
+def test_percentis_e_etapa_vrp():
+    pedidos, veiculos = _instancia(12, 2)
+    rnd = random.Random(2)
+    pontos = [(rnd.uniform(0, 100), rnd.uniform(0, 100)) for _ in pedidos]
+    matriz = [[int(abs(a[0] - b[0]) + abs(a[1] - b[1])) for b in pontos] for a in pontos]
+    incerteza = {"Zona 4": (6.0, 1.0)}  # só a Zona 4 passa da capacidade
+
+    resultado = simular_monte_carlo(pedidos, veiculos, incerteza, n_amostras=200, matriz_distancias=matriz,
+                                    n_vrp=3, tempo_limite=1, semente=3, max_processos=1)
+
+    percentis = resultado.percentis()
+    assert list(percentis) == sorted({p.cliente.zona for p in pedidos}) + ["Total"]
+    assert all(v == 0 for zona, p in percentis.items() if zona not in ("Zona 4", "Total") for v in p.values())
+    assert percentis["Zona 4"][99] > 0
+    assert len(resultado.amostras_vrp) == 3 and resultado.nao_atendido_vrp.shape == (3, len(resultado.zonas))
+    # O VRP nunca atende mais do que o fluxo (relaxação sem rotas) permite
+    por_vrp = resultado.nao_atendido_vrp.sum(axis=1)
+    assert (por_vrp >= resultado.nao_atendido_fluxo[resultado.amostras_vrp].sum(axis=1) - 1e-9).all()
+    assert tabela_percentis(resultado, etapa="vrp").splitlines()[0].startswith("Zona")
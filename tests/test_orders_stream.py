@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import data_storage
+import main_api
+from armazenamento_sqlite import ArmazemSQLite
+
+
+def _preparar_db(tmp_path, monkeypatch):
+    (tmp_path / "db_json").mkdir()
+    clientes = [{"id": 1, "nome": "Ana", "endereco": "Rua A", "zona": "Zona 1"},
+                {"id": 2, "nome": "Bia", "endereco": "Rua B", "zona": "Zona 2"}]
+    (tmp_path / "db_json" / "clientes.json").write_text(json.dumps(clientes))
+    pedidos = [{"id": 7, "cliente": clientes[0], "volume": 3, "prioridade": 1, "status": "PENDENTE"}]
+    (tmp_path / "db_json" / "pedidos.json").write_text(json.dumps(pedidos))
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_importa_ndjson_em_lotes_com_erros_por_linha(tmp_path, monkeypatch, backend):
+    _preparar_db(tmp_path, monkeypatch)
+    monkeypatch.setattr(data_storage, "BACKEND_ARMAZENAMENTO", backend)
+    monkeypatch.setattr(main_api, "TAMANHO_LOTE_STREAM", 2)
+    linhas = [
+        {"id": 7, "cliente_id": 2, "volume": 9, "prioridade": 4},
+        {"id": 8, "cliente_id": 1, "volume": 5, "prioridade": 2, "status": "ENTREGUE"},
+        {"id": 9, "cliente_id": 1, "volume": -1, "prioridade": 2},
+        {"id": 10, "cliente_id": 99, "volume": 1, "prioridade": 1},
+    ]
+    corpo = "\n".join(json.dumps(l) for l in linhas[:2]) + "\n{quebrado\n\n" + \
+        "\n".join(json.dumps(l) for l in linhas[2:]) + "\n" + json.dumps(
+            {"id": 11, "cliente_id": 2, "volume": 2, "prioridade": 5})
+
+    def em_pedacos():
+        dados = corpo.encode()
+        for i in range(0, len(dados), 7):
+            yield dados[i:i + 7]
+
+    resposta = TestClient(main_api.app).post(
+        "/orders/stream", content=em_pedacos(), headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert resposta.status_code == 200
+    resultado = resposta.json()
+    assert resultado["recebidos"] == 6
+    assert resultado["gravados"] == 3
+    assert [e["linha"] for e in resultado["erros"]] == [3, 5, 6]
+    assert "Cliente com ID 99" in resultado["erros"][2]["erro"]
+
+    if backend == "json":
+        pedidos = {p["id"]: p for p in json.loads((tmp_path / "db_json" / "pedidos.json").read_text())}
+        pedidos = {i: {**p, "cliente_id": p["cliente"]["id"]} for i, p in pedidos.items()}
+    else:
+        pedidos = {p["id"]: p for p in data_storage.listar_pedidos()[0]}
+    assert sorted(pedidos) == [7, 8, 11]
+    assert pedidos[7]["cliente_id"] == 2 and pedidos[7]["volume"] == 9
+    assert pedidos[8]["status"] == "ENTREGUE"
+
+
+def test_gravador_sqlite_nao_regrava_clientes_existentes(tmp_path):
+    armazem = ArmazemSQLite(str(tmp_path / "banco.sqlite3"))
+    ana = {"id": 1, "nome": "Ana", "endereco": "Rua A", "zona": "Zona 1"}
+    armazem.upsert_clientes([ana])
+    versao = armazem.versoes("clientes")
+    gravador = data_storage.GravadorPedidosSQLite(armazem)
+
+    gravador.gravar([{"id": 1, "cliente": ana, "volume": 1, "prioridade": 1}])
+    # Cliente editado durante a importação: os lotes seguintes não o sobrescrevem
+    armazem.upsert_clientes([{**ana, "endereco": "Rua Nova"}])
+    versao_editada = armazem.versoes("clientes")
+    gravador.gravar([{"id": 2, "cliente": ana, "volume": 2, "prioridade": 1}])
+    assert armazem.versoes("clientes") == versao_editada != versao
+    assert armazem.listar_clientes()[0]["endereco"] == "Rua Nova"
+
+    # Um cliente novo entra uma vez, mesmo aparecendo em vários lotes
+    caio = {"id": 3, "nome": "Caio", "endereco": None, "zona": "Zona 3"}
+    gravador.gravar([{"id": 3, "cliente": caio, "volume": 1, "prioridade": 1}])
+    versao_nova = armazem.versoes("clientes")
+    gravador.gravar([{"id": 4, "cliente": caio, "volume": 1, "prioridade": 1}])
+    assert armazem.versoes("clientes") == versao_nova != versao_editada
+    assert [c["id"] for c in armazem.listar_clientes()] == [1, 3]
+    assert armazem.contar_pedidos() == 4
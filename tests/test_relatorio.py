@@ -0,0 +1,94 @@
+import csv
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from simulador import relatorio as modulo_relatorio
+from simulador.relatorio import gerar_relatorio, montar_relatorio, salvar_relatorios, tabela_relatorios
+
+
+def gerar_relatorio_antigo(pedidos, veiculos, alocacoes, demandas_simuladas):
+    # Implementação anterior (prints e laços), usada como referência da saída no console
+    print("\n=== Relatório de Alocação de Pedidos ===\n")
+    if not alocacoes:
+        for v_id, veiculo in enumerate(veiculos):
+            print(f"Veículo {v_id} ({veiculo.tipo}):")
+            print("  - Nenhum pedido alocado\n")
+    else:
+        for v_id, pedidos_ids in enumerate(alocacoes):
+            print(f"Veículo {v_id} ({veiculos[v_id].tipo}):")
+            if pedidos_ids:
+                for p_id in pedidos_ids:
+                    pedido = pedidos[p_id]
+                    demanda = demandas_simuladas[p_id]
+                    print(f"  - Pedido {pedido.id} (Zona {pedido.cliente.zona}, Demanda {demanda}, Prioridade {pedido.prioridade})")
+            else:
+                print("  - Nenhum pedido alocado")
+            print()
+    total_demandas = sum(demandas_simuladas)
+    total_capacidades = sum([v.capacidade for v in veiculos])
+    total_demandas_alocadas = 0
+    if alocacoes:
+        for pedidos_ids in alocacoes:
+            for p_id in pedidos_ids:
+                total_demandas_alocadas += demandas_simuladas[p_id]
+    print(f"Demanda total simulada: {total_demandas}")
+    print(f"Capacidade total dos veículos: {total_capacidades}")
+    print(f"Demanda alocada total: {total_demandas_alocadas}")
+    print(f"Capacidade ociosa total: {total_capacidades - total_demandas_alocadas}")
+    print("=== Fim do Relatório ===\n")
+
+
+def _instancia(semente):
+    rnd = random.Random(semente)
+    pedidos = [SimpleNamespace(id=100 + i, cliente=SimpleNamespace(zona=f"Zona {rnd.randint(1, 3)}"),
+                               prioridade=rnd.randint(1, 5)) for i in range(10)]
+    veiculos = [SimpleNamespace(tipo="CARRO", capacidade=30), SimpleNamespace(tipo="MOTO", capacidade=10),
+                SimpleNamespace(tipo="VAN", capacidade=50)]
+    demandas = [rnd.randint(1, 12) for _ in pedidos]
+    return pedidos, veiculos, demandas
+
+
+@pytest.mark.parametrize("alocacoes", [[[0, 3, 5], [], [1, 2, 9]], [[4], [7, 8]], None, []])
+def test_saida_no_console_igual_a_anterior(capsys, alocacoes):
+    pedidos, veiculos, demandas = _instancia(1)
+    gerar_relatorio_antigo(pedidos, veiculos, alocacoes, demandas)
+    esperado = capsys.readouterr().out
+    gerar_relatorio(pedidos, veiculos, alocacoes, demandas)
+    assert capsys.readouterr().out == esperado
+
+
+def test_agregados_por_veiculo_e_zona():
+    pedidos, veiculos, demandas = _instancia(2)
+    relatorio = montar_relatorio(pedidos, veiculos, [[0, 3, 5], [], [1, 2, 9]], demandas)
+
+    assert relatorio.carga.tolist() == [demandas[0] + demandas[3] + demandas[5], 0, demandas[1] + demandas[2] + demandas[9]]
+    assert relatorio.capacidade_ociosa.tolist() == [30 - relatorio.carga[0], 10, 50 - relatorio.carga[2]]
+    assert relatorio.pedidos_por_veiculo.tolist() == [3, 0, 3]
+    fora = [i for i in range(10) if i not in (0, 1, 2, 3, 5, 9)]
+    for zona, volume in zip(relatorio.zonas, relatorio.nao_atendido_por_zona.tolist()):
+        assert volume == sum(demandas[i] for i in fora if pedidos[i].cliente.zona == zona)
+    assert relatorio.totais["demanda_alocada"] == sum(relatorio.carga)
+
+
+def test_salva_lote_de_relatorios_em_csv(tmp_path):
+    pedidos, veiculos, demandas = _instancia(3)
+    relatorios = [montar_relatorio(pedidos, veiculos, [[i], [], [i + 1]], demandas) for i in range(4)]
+
+    colunas = tabela_relatorios(relatorios, "zonas")
+    assert colunas["execucao"].tolist() == [e for e in range(4) for _ in relatorios[0].zonas]
+
+    caminho = tmp_path / "saida" / "veiculos.csv"
+    assert salvar_relatorios(relatorios, str(caminho)) == 12
+    with open(caminho, encoding="utf-8") as f:
+        linhas = list(csv.DictReader(f))
+    assert len(linhas) == 12 and linhas[4]["execucao"] == "1" and linhas[4]["tipo"] == "MOTO"
+    assert int(linhas[3]["carga"]) == demandas[1]
+
+
+def test_parquet_sem_pyarrow_avisa(tmp_path, monkeypatch):
+    monkeypatch.setattr(modulo_relatorio, "pyarrow", None)
+    pedidos, veiculos, demandas = _instancia(4)
+    with pytest.raises(ImportError, match="pyarrow"):
+        salvar_relatorios([montar_relatorio(pedidos, veiculos, None, demandas)], str(tmp_path / "r.parquet"))
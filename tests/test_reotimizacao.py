@@ -0,0 +1,132 @@
+import os
+import random
+
+import main_api
+import vrp.planos
+from vrp.modelo import completar_rotas, criar_modelo_vrp
+from vrp.planos import carregar_plano, salvar_plano
+
+
+def _instancia(n, semente):
+    rnd = random.Random(semente)
+    pontos = [(rnd.uniform(0, 100), rnd.uniform(0, 100)) for _ in range(n)]
+    matriz = [[int(abs(a[0] - b[0]) + abs(a[1] - b[1])) for b in pontos] for a in pontos]
+    demandas = [0] + [rnd.randint(1, 10) for _ in range(1, n)]
+    return matriz, demandas
+
+
+def test_completar_rotas_insere_novos_e_respeita_capacidade():
+    matriz, demandas = _instancia(12, 1)
+    capacidades = [60, 60]
+    anteriores = [[1, 2, 3, 99], [4, 5, 1, 6]]  # 99 não existe mais e 1 está repetido
+
+    rotas = completar_rotas(anteriores, matriz, demandas, capacidades)
+
+    assert [no for no in rotas[0] if no in (1, 2, 3)] == [1, 2, 3]
+    assert [no for no in rotas[1] if no in (4, 5, 6)] == [4, 5, 6]
+    assert sorted(no for rota in rotas for no in rota) == list(range(1, 12))
+    for v, rota in enumerate(rotas):
+        assert sum(demandas[no] for no in rota) <= capacidades[v]
+
+
+def test_completar_rotas_corta_rota_acima_da_capacidade():
+    matriz, demandas = _instancia(5, 4)
+    demandas = [0, 10, 10, 10, 10]
+
+    rotas = completar_rotas([[1, 2, 3, 4], []], matriz, demandas, [25, 25])
+
+    assert rotas[0] == [1, 2]
+    assert sorted(rotas[1]) == [3, 4]
+
+
+def test_completar_rotas_respeita_veiculos_permitidos():
+    matriz, demandas = _instancia(6, 2)
+    permitidos = [None, [1], [1], None, [0], None]
+
+    rotas = completar_rotas([[1, 2, 3], [4, 5]], matriz, demandas, [100, 100],
+                            veiculos_permitidos=permitidos)
+
+    assert 1 in rotas[1] and 2 in rotas[1] and 4 in rotas[0]
+
+
+def test_criar_modelo_vrp_a_partir_do_plano_anterior():
+    matriz, demandas = _instancia(21, 3)
+    capacidades = [60, 60, 60]
+    rotas, _ = criar_modelo_vrp(matriz, demandas, capacidades, 3, tempo_limite=1)
+    anteriores = [[no for no in r["route_indices"] if no not in (0, 7)] for r in rotas]
+
+    rotas_novas, _ = criar_modelo_vrp(
+        matriz, demandas, capacidades, 3, tempo_limite=1, rotas_iniciais=anteriores
+    )
+
+    visitados = sorted(no for r in rotas_novas for no in r["route_indices"] if no != 0)
+    assert visitados == list(range(1, 21))
+    for r in rotas_novas:
+        assert sum(demandas[no] for no in r["route_indices"][1:-1]) <= capacidades[r["vehicle_id"]]
+
+
+def test_planos_salvos_em_disco(tmp_path):
+    plano_id = salvar_plano({3: [10, 11], 5: []}, diretorio=tmp_path)
+    assert carregar_plano(plano_id, diretorio=tmp_path) == {3: [10, 11], 5: []}
+    assert carregar_plano("inexistente", diretorio=tmp_path) is None
+    assert carregar_plano("../fora", diretorio=tmp_path) is None
+
+
+def test_poda_mantem_os_planos_mais_recentes(tmp_path, monkeypatch):
+    monkeypatch.setattr(vrp.planos, "MAX_PLANOS", 5)
+    monkeypatch.setattr(vrp.planos, "FOLGA_PLANOS", 2)
+    ids = []
+    for i in range(7):
+        ids.append(salvar_plano({1: [i]}, diretorio=tmp_path))
+        os.utime(tmp_path / f"{ids[-1]}.json", (i, i))
+
+    assert len(os.listdir(tmp_path)) == 7  # Ainda dentro da folga
+    ids.append(salvar_plano({1: [7]}, diretorio=tmp_path))
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{p}.json" for p in ids[-5:])
+
+
+def test_nova_tentativa_sem_dicas_respeita_zonas_e_prazo(tmp_path, monkeypatch):
+    chamadas = []
+
+    def vrp_falso(*args, veiculos_permitidos=None, tempo_limite=30, **kwargs):
+        chamadas.append((veiculos_permitidos, tempo_limite))
+        return None, None  # nenhuma das tentativas encontra solução
+
+    monkeypatch.setattr(main_api, "criar_modelo_vrp", vrp_falso)
+    monkeypatch.setattr(main_api, "gerar_matriz_distancias_osm", lambda lote: ([[0, 1], [1, 0]], None, None))
+    monkeypatch.setattr(main_api, "salvar_plano", lambda rotas: "plano")
+    request = main_api.OptimizationRequest(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}, {"id": 2, "nome": "Bia", "zona": "Zona 2"}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 1, "prioridade": 1},
+                 {"id": 11, "cliente_id": 2, "volume": 1, "prioridade": 1}],
+        veiculos=[{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True, "zonas_permitidas": ["Zona 1"]},
+                  {"id": 2, "tipo": "VAN", "capacidade": 10, "disponivel": True, "zonas_permitidas": ["Zona 2"]},
+                  {"id": 3, "tipo": "CARRO", "capacidade": 10, "disponivel": True}],
+    )
+
+    main_api.calcular_otimizacao(request)
+
+    [_, (permitidos, tempo_limite)] = chamadas
+    assert [sorted(p) for p in permitidos] == [[0, 2], [1, 2]]
+    assert 1 <= tempo_limite <= 30
+
+
+def test_zona_sem_veiculo_nao_derruba_os_demais_pedidos(monkeypatch):
+    monkeypatch.setattr(main_api, "criar_modelo_vrp",
+                        lambda *args, **kwargs: criar_modelo_vrp(*args, **{**kwargs, "tempo_limite": 1}))
+    monkeypatch.setattr(main_api, "gerar_matriz_distancias_osm",
+                        lambda lote: ([[0, 5, 7], [5, 0, 3], [7, 3, 0]], None, None))
+    monkeypatch.setattr(main_api, "salvar_plano", lambda rotas: "plano")
+    request = main_api.OptimizationRequest(
+        clientes=[{"id": 1, "nome": "Ana", "zona": "Zona 1"}, {"id": 2, "nome": "Bia", "zona": "Zona 1"},
+                  {"id": 3, "nome": "Caio", "zona": "Zona 9"}],
+        pedidos=[{"id": 10, "cliente_id": 1, "volume": 0, "prioridade": 1},
+                 {"id": 11, "cliente_id": 2, "volume": 1, "prioridade": 1},
+                 {"id": 12, "cliente_id": 3, "volume": 1, "prioridade": 1}],
+        veiculos=[{"id": 1, "tipo": "VAN", "capacidade": 10, "disponivel": True, "zonas_permitidas": ["Zona 1"]}],
+    )
+
+    resultado = main_api.calcular_otimizacao(request)
+
+    assert [s["pedido_id"] for s in resultado["routes"][0]["route"]] == [10, 11, 10]
+    assert resultado["pedidos_nao_atendidos"] == [12]
@@ -0,0 +1,38 @@
+import pytest
+
+import main_api
+from main_api import ClienteModel, OptimizationResponse, PedidoModel, VeiculoModel, montar_rotas_resposta
+from models.lote import OrderBatch, VehicleBatch
+
+
+def test_rotas_montadas_direto_equivalem_ao_modelo():
+    orjson = pytest.importorskip("orjson")
+    clientes = [ClienteModel(id=i, nome=f"C{i}", zona="Zona 1", latitude=-9.6, longitude=-35.7)
+                for i in range(5)]
+    pedidos = [PedidoModel(id=10 + i, cliente_id=i, volume=2 + i, prioridade=1) for i in range(5)]
+    veiculos = [VeiculoModel(id=7, tipo="MOTO", capacidade=50, disponivel=True),
+                VeiculoModel(id=8, tipo="VAN", capacidade=50, disponivel=True)]
+    solucao = [
+        {"vehicle_id": 0, "route_indices": [0, 3, 1, 0], "total_distance": 120},
+        {"vehicle_id": 1, "route_indices": [0, 0], "total_distance": 0},  # rota vazia fica de fora
+    ]
+
+    rotas = montar_rotas_resposta(solucao, VehicleBatch.de_modelos(veiculos), OrderBatch.de_modelos(pedidos, clientes))
+    corpo = orjson.dumps({"message": "ok", "routes": rotas, "allocations": {7: 7.0}},
+                         option=orjson.OPT_NON_STR_KEYS)
+    resposta = OptimizationResponse.model_validate_json(corpo)
+
+    [rota] = resposta.routes
+    assert rota.vehicle_id == 7 and rota.vehicle_type == "MOTO"
+    assert [s.pedido_id for s in rota.route] == [10, 13, 11, 10]
+    assert [s.volume for s in rota.route] == [0.0, 5, 3, 0.0]
+    assert rota.total_volume == 8 and resposta.allocations == {7: 7.0}
+
+
+def test_resposta_rapida_usa_json_quando_orjson_nao_esta_instalado(monkeypatch):
+    monkeypatch.setattr(main_api, "orjson", None)
+    monkeypatch.setattr(main_api, "calcular_otimizacao", lambda request: {"message": "ok", "allocations": {3: 1.5}})
+
+    corpo = main_api.serializar_otimizacao(None)
+
+    assert OptimizationResponse.model_validate_json(corpo).allocations == {3: 1.5}
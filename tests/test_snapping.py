@@ -0,0 +1,47 @@
+import math
+import random
+
+import networkx as nx
+
+from grafos.snapping import SnapperNos
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * math.asin(math.sqrt(a))
+
+
+def criar_grafo_maceio(n, seed):
+    rnd = random.Random(seed)
+    G = nx.MultiDiGraph()
+    for i in range(n):
+        G.add_node(5000 + i, y=rnd.uniform(-9.70, -9.55), x=rnd.uniform(-35.80, -35.65))
+    return G
+
+
+def test_snap_em_lote_igual_a_busca_haversine():
+    G = criar_grafo_maceio(500, 1)
+    snapper = SnapperNos(G, "v1")
+    rnd = random.Random(2)
+    lats = [rnd.uniform(-9.70, -9.55) for _ in range(200)]
+    lons = [rnd.uniform(-35.80, -35.65) for _ in range(200)]
+
+    esperado = [
+        min(G.nodes, key=lambda n: haversine(lat, lon, G.nodes[n]["y"], G.nodes[n]["x"]))
+        for lat, lon in zip(lats, lons)
+    ]
+    assert snapper.nos_mais_proximos(lats, lons).tolist() == esperado
+
+
+def test_no_do_cliente_memorizado_ate_mudar_coordenada():
+    G = criar_grafo_maceio(50, 3)
+    snapper = SnapperNos(G, "v1")
+    no = next(iter(G.nodes))
+    lat, lon = G.nodes[no]["y"], G.nodes[no]["x"]
+
+    assert snapper.nos_dos_clientes([7], [lat], [lon]) == [no]
+    assert snapper._por_cliente[7] == (lat, lon, no)
+
+    outro = list(G.nodes)[-1]
+    assert snapper.nos_dos_clientes([7], [G.nodes[outro]["y"]], [G.nodes[outro]["x"]]) == [outro]
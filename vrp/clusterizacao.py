@@ -0,0 +1,161 @@
+# vrp/clusterizacao.py
+
+import math
+import os
+import time
+
+from vrp.decomposicao import resolver_grupos
+
+MAX_PEDIDOS_POR_CLUSTER = 150
+PENALIDADE_NAO_ATENDIMENTO = 10_000_000  # Um cluster pode não empacotar nos veículos do grupo
+
+
+def dividir_veiculos(capacidades, num_grupos):
+    """Distribui os veículos em grupos de capacidade total equilibrada (maior primeiro)."""
+    grupos = [[] for _ in range(num_grupos)]
+    totais = [0] * num_grupos
+    for j in sorted(range(len(capacidades)), key=lambda j: -capacidades[j]):
+        g = totais.index(min(totais))
+        grupos[g].append(j)
+        totais[g] += capacidades[j]
+    return grupos, totais
+
+
+def clusterizar_por_varredura(latitudes, longitudes, demandas, capacidades, deposito=0,
+                              max_pedidos_por_cluster=MAX_PEDIDOS_POR_CLUSTER):
+    """
+    Cluster-first: varredura angular em torno do depósito, respeitando a
+    capacidade do grupo de veículos de cada cluster.
+    A varredura começa logo após o maior vão angular, para não partir um
+    aglomerado de clientes ao meio.
+
+    Retorna (clusters, nao_alocados): cada cluster é (índices dos pedidos,
+    índices dos veículos); nao_alocados são pedidos que não cabem em nenhum grupo.
+    """
+    pedidos = [i for i in range(len(demandas)) if i != deposito]
+    if not pedidos or not capacidades:
+        return [], pedidos
+
+    num_grupos = max(1, math.ceil(len(pedidos) / max_pedidos_por_cluster))
+    num_grupos = min(num_grupos, len(capacidades))
+    # O OR-Tools soma a demanda do nó de depósito na carga de cada veículo
+    livres = [max(0, c - demandas[deposito]) for c in capacidades]
+    grupos_veiculos, capacidade_grupo = dividir_veiculos(livres, num_grupos)
+    alvo_pedidos = math.ceil(len(pedidos) / num_grupos)
+
+    lat0, lon0 = latitudes[deposito], longitudes[deposito]
+    escala = math.cos(math.radians(lat0))
+    angulos = {
+        i: math.atan2(latitudes[i] - lat0, (longitudes[i] - lon0) * escala) for i in pedidos
+    }
+    ordem = sorted(pedidos, key=lambda i: angulos[i])
+    vaos = [
+        (angulos[ordem[(k + 1) % len(ordem)]] - angulos[ordem[k]]) % (2 * math.pi)
+        for k in range(len(ordem))
+    ]
+    inicio = (vaos.index(max(vaos)) + 1) % len(ordem)
+    ordem = ordem[inicio:] + ordem[:inicio]
+
+    clusters = [[] for _ in range(num_grupos)]
+    carga = [0] * num_grupos
+    nao_alocados = []
+    g = 0
+    for i in ordem:
+        while g < num_grupos - 1 and (
+            carga[g] + demandas[i] > capacidade_grupo[g] or len(clusters[g]) >= alvo_pedidos
+        ):
+            g += 1
+        destino = g
+        if carga[destino] + demandas[i] > capacidade_grupo[destino]:
+            # Último recurso: primeiro cluster que ainda tenha folga
+            destino = next(
+                (c for c in range(num_grupos) if carga[c] + demandas[i] <= capacidade_grupo[c]),
+                None,
+            )
+        if destino is None:
+            nao_alocados.append(i)
+            continue
+        clusters[destino].append(i)
+        carga[destino] += demandas[i]
+
+    return [(c, v) for c, v in zip(clusters, grupos_veiculos) if c], nao_alocados
+
+
+def _custo_rota(rota, matriz):
+    return sum(matriz[a][b] for a, b in zip(rota, rota[1:]))
+
+
+def melhorar_entre_rotas(rotas, matriz, demandas, capacidades, tempo_limite=5):
+    """
+    Route-second, passo final: busca local de realocação entre rotas (que
+    vieram de clusters diferentes). Move um pedido para a melhor posição de
+    outra rota quando reduz a distância total e cabe na capacidade do veículo.
+    """
+    prazo = time.monotonic() + tempo_limite
+    rotas = [dict(r, route_indices=list(r["route_indices"])) for r in rotas]
+    # Mesma contagem do OR-Tools: inclui a demanda do nó de partida (depósito)
+    carga = [sum(demandas[no] for no in r["route_indices"][:-1]) for r in rotas]
+
+    melhorou = True
+    while melhorou and time.monotonic() < prazo:
+        melhorou = False
+        for a, rota_a in enumerate(rotas):
+            seq_a = rota_a["route_indices"]
+            pos = 1
+            while pos < len(seq_a) - 1 and time.monotonic() < prazo:
+                no = seq_a[pos]
+                anterior, proximo = seq_a[pos - 1], seq_a[pos + 1]
+                ganho_remocao = matriz[anterior][no] + matriz[no][proximo] - matriz[anterior][proximo]
+
+                melhor = None
+                for b, rota_b in enumerate(rotas):
+                    if b == a or carga[b] + demandas[no] > capacidades[rota_b["vehicle_id"]]:
+                        continue
+                    seq_b = rota_b["route_indices"]
+                    for k in range(1, len(seq_b)):
+                        u, v = seq_b[k - 1], seq_b[k]
+                        custo = matriz[u][no] + matriz[no][v] - matriz[u][v]
+                        if custo < ganho_remocao and (melhor is None or custo < melhor[0]):
+                            melhor = (custo, b, k)
+
+                if melhor is None:
+                    pos += 1
+                    continue
+                _, b, k = melhor
+                seq_a.pop(pos)
+                rotas[b]["route_indices"].insert(k, no)
+                carga[a] -= demandas[no]
+                carga[b] += demandas[no]
+                melhorou = True
+
+    for r in rotas:
+        r["total_distance"] = _custo_rota(r["route_indices"], matriz)
+    return rotas
+
+
+def resolver_por_clusters(matriz, demandas, capacidades, latitudes, longitudes, deposito=0,
+                          tempo_limite=30, max_pedidos_por_cluster=MAX_PEDIDOS_POR_CLUSTER,
+                          max_processos=None):
+    """
+    Modo para instâncias grandes (1.000+ pedidos): clusteriza, resolve cada
+    cluster como um VRP independente em paralelo e faz a melhoria entre clusters.
+    O tempo total fica próximo de tempo_limite.
+    Retorna (rotas, nao_atendidos) no formato de resolver_por_componentes.
+    """
+    clusters, nao_alocados = clusterizar_por_varredura(
+        latitudes, longitudes, demandas, capacidades, deposito, max_pedidos_por_cluster
+    )
+    if not clusters:
+        return [], nao_alocados
+
+    processos = max_processos or min(len(clusters), os.cpu_count() or 1)
+    tempo_melhoria = max(1, tempo_limite // 10)
+    rodadas = math.ceil(len(clusters) / processos)
+    tempo_cluster = max(1, (tempo_limite - tempo_melhoria) // rodadas)
+
+    rotas, sem_solucao = resolver_grupos(
+        matriz, demandas, capacidades, clusters, deposito, tempo_cluster, processos,
+        penalidade_nao_atendimento=PENALIDADE_NAO_ATENDIMENTO,
+    )
+    rotas = melhorar_entre_rotas(rotas, matriz, demandas, capacidades, tempo_melhoria)
+    return rotas, sorted(nao_alocados + sem_solucao)
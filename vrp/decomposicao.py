@@ -0,0 +1,163 @@
+# vrp/decomposicao.py
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from vrp.modelo import criar_modelo_vrp
+
+
+class _UniaoBusca:
+    def __init__(self):
+        self.pai = {}
+
+    def encontrar(self, x):
+        self.pai.setdefault(x, x)
+        while self.pai[x] != x:
+            self.pai[x] = self.pai[self.pai[x]]
+            x = self.pai[x]
+        return x
+
+    def unir(self, a, b):
+        self.pai[self.encontrar(a)] = self.encontrar(b)
+
+
+def componentes_por_zona(zonas_pedidos, zonas_veiculos, deposito=0):
+    """
+    Separa a instância em grupos independentes usando o grafo bipartido
+    veículo–zona: duas zonas ficam no mesmo grupo se algum veículo atende ambas.
+    Veículo sem zonas_permitidas atende todas as zonas (une tudo).
+
+    Retorna (componentes, sem_veiculo), onde cada componente é um par
+    (índices dos pedidos, índices dos veículos) e sem_veiculo lista os pedidos
+    de zonas que nenhum veículo atende. O depósito não entra nos grupos.
+    """
+    zonas = {z for i, z in enumerate(zonas_pedidos) if i != deposito}
+    uniao = _UniaoBusca()
+    for z in zonas:
+        uniao.encontrar(("zona", z))
+
+    for j, permitidas in enumerate(zonas_veiculos):
+        atendidas = zonas if not permitidas else zonas & set(permitidas)
+        for z in atendidas:
+            uniao.unir(("veiculo", j), ("zona", z))
+
+    grupos = {}
+    sem_veiculo = []
+    for i, z in enumerate(zonas_pedidos):
+        if i == deposito:
+            continue
+        raiz = uniao.encontrar(("zona", z))
+        grupos.setdefault(raiz, ([], []))[0].append(i)
+    for j in range(len(zonas_veiculos)):
+        raiz = uniao.encontrar(("veiculo", j))
+        if raiz in grupos:
+            grupos[raiz][1].append(j)
+
+    componentes = []
+    for pedidos, veiculos in grupos.values():
+        if veiculos:
+            componentes.append((pedidos, veiculos))
+        else:
+            sem_veiculo.extend(pedidos)
+    return componentes, sorted(sem_veiculo)
+
+
+def _resolver_subproblema(matriz, demandas, capacidades, veiculos_permitidos, tempo_limite,
+                          penalidade_nao_atendimento=None):
+    rotas, _ = criar_modelo_vrp(
+        matriz, demandas, capacidades, len(capacidades), deposito=0,
+        veiculos_permitidos=veiculos_permitidos, tempo_limite=tempo_limite,
+        penalidade_nao_atendimento=penalidade_nao_atendimento,
+    )
+    return rotas
+
+
+def montar_subproblema(matriz, demandas, capacidades, pedidos, veiculos, deposito=0, pode_atender=None):
+    """
+    Submatriz e dados do VRP de um grupo; o nó local 0 é o depósito global.
+    pode_atender(i, j): opcional, diz se o veículo global j pode atender o pedido i.
+    """
+    nos = [deposito] + list(pedidos)
+    submatriz = [[matriz[a][b] for b in nos] for a in nos]
+    subdemandas = [demandas[a] for a in nos]
+    subcapacidades = [capacidades[j] for j in veiculos]
+    permitidos = None
+    if pode_atender is not None:
+        permitidos = [None] + [
+            [local for local, j in enumerate(veiculos) if pode_atender(i, j)]
+            for i in pedidos
+        ]
+    return nos, submatriz, subdemandas, subcapacidades, permitidos
+
+
+def resolver_grupos(matriz, demandas, capacidades, grupos, deposito=0, tempo_limite=30,
+                    max_processos=None, pode_atender=None, penalidade_nao_atendimento=None):
+    """
+    Resolve cada grupo (pedidos, veículos) como um VRP separado, em paralelo
+    (ProcessPoolExecutor com até max_processos processos; com 1, em sequência), e junta as rotas no formato de criar_modelo_vrp, com
+    índices globais de nós e de veículos.
+    Retorna (rotas, nao_atendidos) com os pedidos que ficaram fora das rotas.
+    """
+    subproblemas = [
+        montar_subproblema(matriz, demandas, capacidades, pedidos, veiculos, deposito, pode_atender)
+        for pedidos, veiculos in grupos
+    ]
+
+    max_processos = max_processos or min(len(subproblemas), os.cpu_count() or 1)
+    if len(subproblemas) <= 1 or max_processos <= 1:
+        resultados = [
+            _resolver_subproblema(*sub[1:], tempo_limite, penalidade_nao_atendimento)
+            for sub in subproblemas
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_processos) as pool:
+            futuros = [
+                pool.submit(_resolver_subproblema, *sub[1:], tempo_limite, penalidade_nao_atendimento)
+                for sub in subproblemas
+            ]
+            resultados = [f.result() for f in futuros]
+
+    rotas = []
+    nao_atendidos = []
+    for (pedidos, veiculos), sub, rotas_locais in zip(grupos, subproblemas, resultados):
+        if rotas_locais is None:
+            nao_atendidos.extend(pedidos)
+            continue
+        nos = sub[0]
+        visitados = set()
+        for rota in rotas_locais:
+            rotas.append({
+                "vehicle_id": veiculos[rota["vehicle_id"]],
+                "route_indices": [nos[no] for no in rota["route_indices"]],
+                "total_distance": rota["total_distance"],
+            })
+            visitados.update(rotas[-1]["route_indices"])
+        nao_atendidos.extend(i for i in pedidos if i not in visitados)
+    rotas.sort(key=lambda r: r["vehicle_id"])
+    return rotas, nao_atendidos
+
+
+def resolver_por_componentes(matriz, demandas, capacidades, zonas_pedidos, zonas_veiculos,
+                             deposito=0, tempo_limite=30, max_processos=None):
+    """
+    Resolve cada grupo independente de zonas como um VRP separado, em paralelo.
+    O tempo total fica próximo de tempo_limite: os grupos rodam em rodadas de
+    max_processos, e cada rodada recebe sua parte do tempo.
+    Retorna (rotas, nao_atendidos): nao_atendidos tem os pedidos sem veículo
+    compatível ou de grupos sem solução viável.
+    """
+    componentes, sem_veiculo = componentes_por_zona(zonas_pedidos, zonas_veiculos, deposito)
+    if not componentes:
+        return [], sem_veiculo
+    processos = max_processos or min(len(componentes), os.cpu_count() or 1)
+    rodadas = math.ceil(len(componentes) / processos)
+    tempo_grupo = max(1, tempo_limite // rodadas)
+
+    def pode_atender(i, j):
+        return not zonas_veiculos[j] or zonas_pedidos[i] in zonas_veiculos[j]
+
+    rotas, sem_solucao = resolver_grupos(
+        matriz, demandas, capacidades, componentes, deposito, tempo_grupo, processos, pode_atender
+    )
+    return rotas, sorted(sem_veiculo + sem_solucao)
@@ -0,0 +1,227 @@
+# vrp/modelo.py
+
+import numpy as np
+from ortools.constraint_solver import routing_enums_pb2
+from ortools.constraint_solver import pywrapcp
+
+
+def completar_rotas(rotas, matriz_distancias, demandas, capacidades, deposito=0,
+                    veiculos_permitidos=None):
+    """
+    Ajusta as rotas de um plano anterior (nós por veículo, sem o depósito) à
+    instância atual: descarta nós inexistentes, repetidos ou de veículos não
+    permitidos, corta o excesso de carga e insere os nós que faltam na posição
+    de menor custo (inserção mais barata) que respeite a capacidade.
+    Nós que não cabem em nenhuma rota ficam de fora.
+    """
+    n = len(matriz_distancias)
+    num_veiculos = len(capacidades)
+    rotas = [list(r) for r in list(rotas)[:num_veiculos]]
+    rotas += [[] for _ in range(num_veiculos - len(rotas))]
+
+    def permitido(no, v):
+        return (
+            veiculos_permitidos is None
+            or veiculos_permitidos[no] is None
+            or v in veiculos_permitidos[no]
+        )
+
+    vistos = set()
+    carga = []
+    pendentes = []
+    for v, rota in enumerate(rotas):
+        # O OR-Tools soma a demanda do depósito na carga do veículo
+        total = demandas[deposito]
+        mantidos = []
+        for no in rota:
+            if not 0 <= no < n or no == deposito or no in vistos:
+                continue
+            vistos.add(no)
+            if permitido(no, v) and total + demandas[no] <= capacidades[v]:
+                mantidos.append(no)
+                total += demandas[no]
+            else:
+                pendentes.append(no)
+        rotas[v] = mantidos
+        carga.append(total)
+
+    pendentes += [no for no in range(n) if no != deposito and no not in vistos]
+    for no in sorted(pendentes, key=lambda no: -demandas[no]):
+        melhor = None
+        for v, rota in enumerate(rotas):
+            if carga[v] + demandas[no] > capacidades[v] or not permitido(no, v):
+                continue
+            seq = [deposito] + rota + [deposito]
+            for k in range(1, len(seq)):
+                a, b = seq[k - 1], seq[k]
+                custo = matriz_distancias[a][no] + matriz_distancias[no][b] - matriz_distancias[a][b]
+                if melhor is None or custo < melhor[0]:
+                    melhor = (custo, v, k - 1)
+        if melhor is not None:
+            _, v, k = melhor
+            rotas[v].insert(k, no)
+            carga[v] += demandas[no]
+    return rotas
+
+
+HORIZONTE_PADRAO = 24 * 3600  # Segundos; limite da dimensão de tempo quando nada o restringe
+
+
+def adicionar_dimensao_tempo(routing, manager, matriz_tempos, janelas=None, tempos_servico=None,
+                             jornada_maxima=None, deposito=0):
+    """
+    Dimensão "Tempo" (segundos): viagem pela matriz_tempos mais o tempo de
+    serviço do nó de saída, com espera permitida.
+    - janelas: por nó, (início, fim) da chegada ou None; a do depósito vale
+      para a saída e a volta dos veículos.
+    - tempos_servico: por nó, tempo parado no nó (None = 0).
+    - jornada_maxima: por veículo, duração máxima da rota (None = sem limite).
+    Retorna a dimensão.
+    """
+    n = len(matriz_tempos)
+    servico = np.array([s or 0 for s in tempos_servico] if tempos_servico is not None else [0] * n,
+                       dtype=np.int64)
+    transito = np.asarray(matriz_tempos, dtype=np.int64) + servico[:, None]
+    janelas = janelas if janelas is not None else [None] * n
+    limites = [fim for janela in janelas if janela is not None for fim in janela[1:]]
+    limites += [j for j in (jornada_maxima or []) if j is not None]
+    horizonte = max(limites + [HORIZONTE_PADRAO])
+
+    indice_tempo = routing.RegisterTransitMatrix(transito.tolist())
+    routing.AddDimension(indice_tempo, horizonte, horizonte, False, "Tempo")
+    dimensao = routing.GetDimensionOrDie("Tempo")
+
+    for node, janela in enumerate(janelas):
+        if janela is None or node == deposito:
+            continue
+        dimensao.CumulVar(manager.NodeToIndex(node)).SetRange(int(janela[0]), int(janela[1]))
+    for vehicle_id in range(routing.vehicles()):
+        inicio, fim = routing.Start(vehicle_id), routing.End(vehicle_id)
+        if janelas[deposito] is not None:
+            dimensao.CumulVar(inicio).SetRange(int(janelas[deposito][0]), int(janelas[deposito][1]))
+            dimensao.CumulVar(fim).SetRange(int(janelas[deposito][0]), int(janelas[deposito][1]))
+        if jornada_maxima is not None and jornada_maxima[vehicle_id] is not None:
+            dimensao.SetSpanUpperBoundForVehicle(int(jornada_maxima[vehicle_id]), vehicle_id)
+        # Horários mais cedo possíveis na solução encontrada
+        routing.AddVariableMinimizedByFinalizer(dimensao.CumulVar(inicio))
+        routing.AddVariableMinimizedByFinalizer(dimensao.CumulVar(fim))
+    return dimensao
+
+
+def criar_modelo_vrp(
+    matriz_distancias, demandas, capacidades, num_veiculos, deposito=0,
+    veiculos_permitidos=None, tempo_limite=30, penalidade_nao_atendimento=None,
+    rotas_iniciais=None, matriz_tempos=None, janelas=None, tempos_servico=None,
+    jornada_maxima=None,
+):
+    """
+    Resolve o CVRP com OR-Tools.
+    veiculos_permitidos: opcional, lista (por nó) com os índices dos veículos que
+    podem atender aquele nó; None em uma posição libera todos os veículos e uma
+    lista vazia deixa o nó fora das rotas (sem tornar o problema inviável).
+    penalidade_nao_atendimento: se informada, o solver pode deixar um nó de fora
+    pagando essa penalidade (em vez de não encontrar solução).
+    rotas_iniciais: opcional, nós por veículo de um plano anterior; a busca parte
+    dessas rotas (completadas por completar_rotas) em vez de PATH_CHEAPEST_ARC.
+    matriz_tempos: opcional, tempos de viagem (s) entre os nós; com ela entram
+    janelas, tempos_servico e jornada_maxima (ver adicionar_dimensao_tempo) e
+    cada rota traz arrival_times (chegada em cada nó, em segundos).
+    """
+    data = {
+        # Listas de int64: o OR-Tools copia para C++ e avalia os arcos sem voltar ao Python
+        "distance_matrix": np.asarray(matriz_distancias, dtype=np.int64).tolist(),
+        "demands": [int(d) for d in demandas],
+        "vehicle_capacities": capacidades,
+        "num_vehicles": num_veiculos,
+        "depot": deposito,
+    }
+    manager = pywrapcp.RoutingIndexManager(
+        len(data["distance_matrix"]), num_veiculos, data["depot"]
+    )
+    routing = pywrapcp.RoutingModel(manager)
+    transit_callback_index = routing.RegisterTransitMatrix(data["distance_matrix"])
+    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+    demand_callback_index = routing.RegisterUnaryTransitVector(data["demands"])
+    routing.AddDimensionWithVehicleCapacity(
+        demand_callback_index, 0, data["vehicle_capacities"], True, "Capacity"
+    )
+
+    dimensao_tempo = None
+    if matriz_tempos is not None:
+        dimensao_tempo = adicionar_dimensao_tempo(
+            routing, manager, matriz_tempos, janelas, tempos_servico, jornada_maxima, deposito
+        )
+
+    # Restrição: veículos que podem atender cada nó (ex.: zonas permitidas)
+    sem_veiculo = set()
+    if veiculos_permitidos is not None:
+        for node, permitidos in enumerate(veiculos_permitidos):
+            if node == deposito or permitidos is None:
+                continue
+            index = manager.NodeToIndex(node)
+            if not len(permitidos):
+                # Nenhum veículo pode atendê-lo: o nó só pode ficar inativo
+                routing.AddDisjunction([index], 0)
+                sem_veiculo.add(node)
+            for vehicle_id in range(num_veiculos):
+                if vehicle_id not in permitidos:
+                    routing.VehicleVar(index).RemoveValue(vehicle_id)
+
+    if penalidade_nao_atendimento is not None:
+        for node in range(len(data["distance_matrix"])):
+            if node != deposito and node not in sem_veiculo:
+                routing.AddDisjunction([manager.NodeToIndex(node)], penalidade_nao_atendimento)
+
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.time_limit.seconds = tempo_limite
+    search_parameters.first_solution_strategy = (
+        routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    )
+    search_parameters.local_search_metaheuristic = (
+        routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    )
+    solution = None
+    if rotas_iniciais is not None:
+        rotas = completar_rotas(
+            rotas_iniciais, data["distance_matrix"], data["demands"],
+            data["vehicle_capacities"], deposito, veiculos_permitidos,
+        )
+        routing.CloseModelWithParameters(search_parameters)
+        inicial = routing.ReadAssignmentFromRoutes(
+            [[manager.NodeToIndex(no) for no in rota] for rota in rotas], True
+        )
+        if inicial:
+            solution = routing.SolveFromAssignmentWithParameters(inicial, search_parameters)
+    if not solution:
+        solution = routing.SolveWithParameters(search_parameters)
+    if solution:
+        routes_data = []
+        for vehicle_id in range(num_veiculos):
+            index = routing.Start(vehicle_id)
+            route_indices_for_vehicle = []
+            arrival_times = []
+            total_distance_for_vehicle = 0
+            while not routing.IsEnd(index):
+                node_index = manager.IndexToNode(index)
+                route_indices_for_vehicle.append(node_index)
+                if dimensao_tempo is not None:
+                    arrival_times.append(solution.Min(dimensao_tempo.CumulVar(index)))
+                previous_index = index
+                index = solution.Value(routing.NextVar(index))
+                total_distance_for_vehicle += routing.GetArcCostForVehicle(
+                    previous_index, index, vehicle_id
+                )
+            final_node_index = manager.IndexToNode(index)
+            route_indices_for_vehicle.append(final_node_index)
+            route_info = {
+                "vehicle_id": vehicle_id,
+                "route_indices": route_indices_for_vehicle,
+                "total_distance": total_distance_for_vehicle,
+            }
+            if dimensao_tempo is not None:
+                arrival_times.append(solution.Min(dimensao_tempo.CumulVar(index)))
+                route_info["arrival_times"] = arrival_times
+            routes_data.append(route_info)
+        return routes_data, solution
+    else:
+        return None, None
@@ -0,0 +1,67 @@
+# vrp/planos.py
+
+import json
+import os
+import time
+import uuid
+
+DIRETORIO_PLANOS = "./cache/planos"
+MAX_PLANOS = 500
+FOLGA_PLANOS = 50  # A poda só roda quando passa deste excesso, não a cada plano salvo
+
+
+def _caminho_plano(plano_id, diretorio):
+    return os.path.join(diretorio, f"{plano_id}.json")
+
+
+def salvar_plano(rotas, diretorio=DIRETORIO_PLANOS):
+    """
+    Grava um plano de rotas ({id do veículo: [ids dos pedidos]}) e retorna seu id.
+    Os planos ficam em disco para serem lidos por qualquer processo do pool;
+    só os MAX_PLANOS mais recentes são mantidos.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    plano_id = uuid.uuid4().hex
+    caminho = _caminho_plano(plano_id, diretorio)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({str(v): pedidos for v, pedidos in rotas.items()}, f)
+    os.replace(caminho + ".tmp", caminho)
+
+    if len(os.listdir(diretorio)) > MAX_PLANOS + FOLGA_PLANOS:
+        _podar_planos(diretorio)
+    return plano_id
+
+
+def _podar_planos(diretorio):
+    """
+    Mantém os MAX_PLANOS planos mais recentes. Outros processos podem estar
+    salvando ou podando ao mesmo tempo: arquivos que somem no meio do caminho
+    são ignorados.
+    """
+    planos = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        try:
+            if nome.endswith(".json"):
+                planos.append((os.path.getmtime(caminho), caminho))
+            elif nome.endswith(".tmp") and os.path.getmtime(caminho) < time.time() - 3600:
+                os.remove(caminho)  # Sobra de uma gravação interrompida
+        except OSError:
+            continue
+    planos.sort()
+    for _, antigo in planos[: max(0, len(planos) - MAX_PLANOS)]:
+        try:
+            os.remove(antigo)
+        except OSError:
+            pass
+
+
+def carregar_plano(plano_id, diretorio=DIRETORIO_PLANOS):
+    """Retorna {id do veículo: [ids dos pedidos]} do plano, ou None se não existir."""
+    if not plano_id.isalnum():
+        return None
+    try:
+        with open(_caminho_plano(plano_id, diretorio), "r", encoding="utf-8") as f:
+            return {int(v): pedidos for v, pedidos in json.load(f).items()}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None